@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import re
+import threading
 from collections import namedtuple
-from collections.abc import Mapping, Sequence
-from dataclasses import asdict, dataclass, field
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from functools import reduce
 from typing import Any, Literal, NamedTuple, Union
 
+from cachetools import LRUCache
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
 from parsimonious.grammar import Grammar
@@ -37,6 +39,7 @@ from sentry.search.utils import (
     parse_size,
 )
 from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 from sentry.utils.validators import is_event_id, is_span_id
 
@@ -587,6 +590,8 @@ class SearchVisitor(NodeVisitor):
         self.config = config
         self.params = params if params is not None else {}
         self.get_field_type = get_field_type
+        # Whether the result depends on the current time, see `parse_search_query`
+        self.has_relative_dates = False
         if builder is None:
             # Avoid circular import
             from sentry.search.events.builder.discover import UnresolvedQuery
@@ -757,6 +762,7 @@ class SearchVisitor(NodeVisitor):
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
                 raise InvalidSearchQuery(str(exc))
+            self.has_relative_dates = True
 
             # TODO: Handle negations
             if from_val is not None:
@@ -966,6 +972,7 @@ class SearchVisitor(NodeVisitor):
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
                 raise InvalidSearchQuery(str(exc))
+            self.has_relative_dates = True
 
             if from_val is not None:
                 operator = ">="
@@ -1262,6 +1269,98 @@ QueryOp = Literal["AND", "OR"]
 QueryToken = Union[SearchFilter, QueryOp, ParenExpression]
 
 
+PARSED_QUERY_CACHE_SIZE = 10000
+# Longer queries are parsed but never cached, so that a handful of huge queries can't blow up the
+# memory used by the grammar trees and tokens in the caches.
+PARSED_QUERY_CACHE_MAX_QUERY_LENGTH = 2048
+
+# Params which don't change how a query is parsed, and would make the cache key of every request
+# different.
+PARSED_QUERY_CACHE_IGNORED_PARAMS = frozenset(("start", "end"))
+
+# Per-process caches of the grammar tree of a query, and of the tokens parsed from it with a
+# config and params. Parsing is deterministic except for relative dates, which are never cached.
+# Cached tokens are shared between callers, see `_copy_tokens`.
+_parse_tree_cache: LRUCache[str, Node] = LRUCache(maxsize=PARSED_QUERY_CACHE_SIZE)
+_parsed_query_cache: LRUCache[Hashable, list[QueryToken]] = LRUCache(
+    maxsize=PARSED_QUERY_CACHE_SIZE
+)
+_parsed_query_cache_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    A hashable version of a config or params value, comparing equal for equal values. Raises
+    TypeError for values which can't be compared safely.
+    """
+    if isinstance(value, Mapping):
+        return tuple(
+            sorted(((key, _freeze(val)) for key, val in value.items()), key=lambda i: repr(i[0]))
+        )
+    elif isinstance(value, (list, tuple)):
+        # Some params are handled differently as lists and tuples
+        return (type(value), tuple(_freeze(val) for val in value))
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(val) for val in value)
+    hash(value)
+    return value
+
+
+def _get_parsed_query_cache_key(
+    query: str, config: SearchConfig, params: Mapping[str, Any] | None
+) -> Hashable | None:
+    """The cache key of the tokens parsed from `query`, or None if they can't be cached"""
+    try:
+        return (
+            query,
+            tuple((f.name, _freeze(getattr(config, f.name))) for f in fields(config)),
+            _freeze(
+                {
+                    key: val
+                    for key, val in (params or {}).items()
+                    if key not in PARSED_QUERY_CACHE_IGNORED_PARAMS
+                }
+            ),
+        )
+    except TypeError:
+        return None
+
+
+def _copy_tokens(tokens: Sequence[QueryToken]) -> list[QueryToken]:
+    """Copy the mutable parts of cached tokens, so callers can't change them for each other"""
+    result: list[QueryToken] = []
+    for token in tokens:
+        if isinstance(token, ParenExpression):
+            token = ParenExpression(_copy_tokens(token.children))
+        elif isinstance(token, (SearchFilter, AggregateFilter)) and isinstance(
+            token.value.raw_value, list
+        ):
+            token = token._replace(value=SearchValue(list(token.value.raw_value)))
+        result.append(token)
+    return result
+
+
+def clear_parsed_query_cache() -> None:
+    with _parsed_query_cache_lock:
+        _parse_tree_cache.clear()
+        _parsed_query_cache.clear()
+
+
+def _parse_tree(query: str) -> Node:
+    try:
+        return event_search_grammar.parse(query)
+    except IncompleteParseError as e:
+        idx = e.column()
+        prefix = query[max(0, idx - 5) : idx]
+        suffix = query[idx : (idx + 5)]
+        raise InvalidSearchQuery(
+            "{} {}".format(
+                f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
+                "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
+            )
+        )
+
+
 def parse_search_query(
     query,
     config=None,
@@ -1276,26 +1375,53 @@ def parse_search_query(
     if config is None:
         config = default_config
 
-    try:
-        tree = event_search_grammar.parse(query)
-    except IncompleteParseError as e:
-        idx = e.column()
-        prefix = query[max(0, idx - 5) : idx]
-        suffix = query[idx : (idx + 5)]
-        raise InvalidSearchQuery(
-            "{} {}".format(
-                f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
-                "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
-            )
-        )
-
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
 
-    return SearchVisitor(
+    if len(query) > PARSED_QUERY_CACHE_MAX_QUERY_LENGTH:
+        metrics.incr("event_search.parsed_query_cache", tags={"result": "too_long"})
+        return SearchVisitor(
+            config,
+            params=params,
+            builder=builder,
+            get_field_type=get_field_type,
+            get_function_result_type=get_function_result_type,
+        ).visit(_parse_tree(query))
+
+    # The tokens depend on the state of a custom builder or field type functions, only the grammar
+    # tree can be reused for those.
+    cache_key = None
+    if builder is None and get_field_type is None and get_function_result_type is None:
+        cache_key = _get_parsed_query_cache_key(query, config, params)
+
+    if cache_key is not None:
+        with _parsed_query_cache_lock:
+            tokens = _parsed_query_cache.get(cache_key)
+        if tokens is not None:
+            metrics.incr("event_search.parsed_query_cache", tags={"result": "hit"})
+            return _copy_tokens(tokens)
+
+    with _parsed_query_cache_lock:
+        tree = _parse_tree_cache.get(query)
+    if tree is None:
+        metrics.incr("event_search.parsed_query_cache", tags={"result": "miss"})
+        tree = _parse_tree(query)
+        with _parsed_query_cache_lock:
+            _parse_tree_cache[query] = tree
+    else:
+        metrics.incr("event_search.parsed_query_cache", tags={"result": "tree_hit"})
+
+    visitor = SearchVisitor(
         config,
         params=params,
         builder=builder,
         get_field_type=get_field_type,
         get_function_result_type=get_function_result_type,
-    ).visit(tree)
+    )
+    tokens = visitor.visit(tree)
+
+    if cache_key is not None and not visitor.has_relative_dates:
+        with _parsed_query_cache_lock:
+            _parsed_query_cache[cache_key] = _copy_tokens(tokens)
+
+    return tokens
@@ -1,13 +1,34 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
 from django.db.models import Expression, F
+from django.db.models.signals import post_save
 
 from sentry.db import models
+from sentry.db.models.query import bulk_increment
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
 
+# A single buffered `incr` call, in the order of the arguments to `Buffer.process`
+BufferedIncr = tuple[
+    type[models.Model], dict[str, int], dict[str, Any], dict[str, Any] | None, bool | None
+]
+
+
+def _get_bulk_pk(model: type[models.Model], filters: dict[str, Any]) -> int | None:
+    """
+    Return the primary key the filters select on, if that's the only thing they select on.
+    """
+    if len(filters) != 1:
+        return None
+    ((key, value),) = filters.items()
+    if key not in ("pk", model._meta.pk.attname) or not isinstance(value, int):
+        return None
+    return value
+
 
 class Buffer(Service):
     """
@@ -27,6 +48,7 @@ class Buffer(Service):
         "get",
         "incr",
         "process",
+        "process_many",
         "process_pending",
         "process_batch",
         "validate",
@@ -185,3 +207,68 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Apply several buffered `incr` calls at once.
+
+        Calls which filter on the primary key alone are applied with one
+        `UPDATE ... FROM (VALUES ...)` per model and set of columns; anything else (as well as
+        rows which don't exist yet) goes through `process` one at a time. (`Buffer.process` is
+        called explicitly, since subclasses like `RedisBuffer` override it with a different
+        signature.)
+        """
+        from sentry.models.group import Group
+
+        batches: defaultdict[
+            tuple[type[models.Model], tuple[str, ...], tuple[str, ...]], dict[int, BufferedIncr]
+        ] = defaultdict(dict)
+
+        for incr in incrs:
+            model, columns, filters, extra, signal_only = incr
+            pk = _get_bulk_pk(model, filters)
+            batch_key = (model, tuple(sorted(columns)), tuple(sorted(extra or ())))
+            if (
+                signal_only
+                or pk is None
+                or pk in batches[batch_key]
+                or any(isinstance(v, (Expression, models.Model)) for v in (extra or {}).values())
+                or any(getattr(f, "auto_now", False) for f in model._meta.fields)
+            ):
+                Buffer.process(self, *incr)
+            else:
+                batches[batch_key][pk] = incr
+
+        for (model, _, _), batch in batches.items():
+            if not batch:
+                continue
+            if len(batch) == 1:
+                Buffer.process(self, *next(iter(batch.values())))
+                continue
+
+            updated = bulk_increment(
+                model,
+                {pk: (columns, extra or {}) for pk, (_, columns, _, extra, _) in batch.items()},
+            )
+            for instance in updated:
+                model, columns, filters, extra, _ = batch.pop(instance.pk)
+                if model is Group:
+                    # Same as `Group.update` in `process`, which keeps the cached group in sync
+                    post_save.send(
+                        sender=model,
+                        instance=instance,
+                        created=False,
+                        update_fields=[*columns, *(extra or ())],
+                    )
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=columns,
+                    filters=filters,
+                    extra=extra,
+                    created=False,
+                    sender=model,
+                )
+
+            # Whatever is left doesn't exist (anymore), which `process` knows how to handle
+            for incr in batch.values():
+                Buffer.process(self, *incr)
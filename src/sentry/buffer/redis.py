@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
+import os
 import pickle
+import threading
+import weakref
+from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass
+from dataclasses import field as dataclass_field
 from datetime import date, datetime, timezone
 from enum import Enum
 from time import time
 from typing import Any, TypeVar
 
 import rb
+from celery.signals import worker_process_shutdown
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer
+from sentry import options
+from sentry.buffer.base import Buffer, BufferedIncr
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -24,11 +33,14 @@ from sentry.utils.redis import (
     get_dynamic_cluster_from_options,
     is_instance_rb_cluster,
     is_instance_redis_cluster,
+    load_redis_script,
     validate_dynamic_cluster,
 )
 
 logger = logging.getLogger(__name__)
 
+drain_buffer_keys = load_redis_script("buffer/drain.lua")
+
 T = TypeVar("T", str, bytes)
 # Debounce our JSON validation a bit in order to not cause too much additional
 # load everywhere
@@ -221,6 +233,130 @@ class PendingBuffer:
         return rv
 
 
+@dataclass
+class CoalescedIncr:
+    model: type[models.Model]
+    filters: dict[str, Any]
+    columns: dict[str, int] = dataclass_field(default_factory=dict)
+    extra: dict[str, Any] = dataclass_field(default_factory=dict)
+    signal_only: bool | None = None
+    count: int = 0
+
+    def merge(
+        self,
+        columns: dict[str, int],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> None:
+        """
+        Fold another `incr` call into this one, mirroring what the separate calls would have done
+        to the Redis hash: counters are summed, `signal_only` sticks once set and extra values are
+        last write wins. The one exception are datetimes (e.g. `last_seen`), which keep the
+        latest value so that calls made out of order can't move them backwards.
+        """
+        for column, amount in columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+
+        if extra:
+            for column, value in extra.items():
+                current = self.extra.get(column)
+                if isinstance(value, datetime) and isinstance(current, datetime):
+                    value = max(current, value)
+                self.extra[column] = value
+
+        if signal_only is True:
+            self.signal_only = True
+
+        self.count += 1
+
+
+class IncrCoalescer:
+    """
+    Pre-aggregates `incr` calls in process, keyed by their buffer key, so that a burst of events
+    for the same group only results in a single write to Redis.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, CoalescedIncr] = {}
+        self._oldest: float | None = None
+
+        os.register_at_fork(
+            after_in_child=functools.partial(_reset_coalescer_after_fork, weakref.ref(self))
+        )
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+        self,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, Any],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> bool:
+        """
+        Add an `incr` call. Returns `True` if this was the first pending call, i.e. a new window
+        was started.
+        """
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = CoalescedIncr(model=model, filters=filters)
+            entry.merge(columns, extra, signal_only)
+
+            if self._oldest is None:
+                self._oldest = time()
+                return True
+            return False
+
+    def is_due(self, max_size: int, max_age: float) -> bool:
+        with self._lock:
+            if self._oldest is None:
+                return False
+            return len(self._pending) >= max_size or time() - self._oldest >= max_age
+
+    def drain(self) -> dict[str, CoalescedIncr]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._oldest = None
+            return pending
+
+    def restore(self, pending: dict[str, CoalescedIncr]) -> bool:
+        """
+        Put entries which failed to flush back, merging them with anything added in the
+        meantime. Returns `True` if a new window was started.
+        """
+        with self._lock:
+            for key, entry in pending.items():
+                current = self._pending.get(key)
+                if current is not None:
+                    # Calls added in the meantime are newer than the restored ones
+                    entry.merge(current.columns, current.extra, current.signal_only)
+                    entry.count += current.count - 1
+                self._pending[key] = entry
+
+            if pending and self._oldest is None:
+                self._oldest = time()
+                return True
+            return False
+
+    def _reset(self) -> None:
+        # A forked child starts out empty: the parent still owns, and flushes, its pending calls.
+        # The lock is replaced as well, as it may have been held by another thread of the parent.
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._oldest = None
+
+
+def _reset_coalescer_after_fork(ref: weakref.ref[IncrCoalescer]) -> None:
+    coalescer = ref()
+    if coalescer is not None:
+        coalescer._reset()
+
+
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
@@ -232,6 +368,9 @@ class RedisBuffer(Buffer):
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
 
+        self._coalescer = IncrCoalescer()
+        self._coalesce_atexit_registered = False
+
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
 
@@ -467,13 +606,54 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        If `buffer.incr.coalesce.max-size` is set, calls are first pre-aggregated in process (see
+        `IncrCoalescer`) and written out together once that many keys are pending, or once the
+        oldest pending call is older than `buffer.incr.coalesce.max-age`.
         """
         key = self._make_key(model, filters)
-        # We can't use conn.map() due to wanting to support multiple pending
-        # keys (one per Redis partition)
-        pipe = self.get_redis_connection(key)
-        pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
         _validate_json_roundtrip(filters, model)
+        if extra:
+            # Group tries to serialize 'score', so we'd need some kind of processing
+            # hook here
+            # e.g. "update score if last_seen or times_seen is changed"
+            _validate_json_roundtrip(extra, model)
+
+        metrics.incr(
+            "buffer.incr",
+            skip_internal=True,
+            tags={"module": model.__module__, "model": model.__name__},
+        )
+
+        max_size = options.get("buffer.incr.coalesce.max-size")
+        if max_size <= 1:
+            pipe = self.get_redis_connection(key)
+            self._add_incr_to_pipeline(pipe, key, model, columns, filters, extra, signal_only)
+            pipe.execute()
+            return
+
+        max_age = options.get("buffer.incr.coalesce.max-age")
+        started_window = self._coalescer.add(key, model, columns, filters, extra, signal_only)
+        if started_window:
+            self._schedule_coalesced_flush(max_age)
+
+        if self._coalescer.is_due(max_size, max_age):
+            self.flush_coalesced()
+
+    def _add_incr_to_pipeline(
+        self,
+        pipe: Pipeline,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, Any],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+    ) -> int:
+        """
+        Queue the commands of an `incr` call on `pipe`. Returns the number of commands queued.
+        """
+        pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
 
         if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
             pipe.hsetnx(key, "f", json.dumps(self._dump_values(filters)))
@@ -484,10 +664,6 @@ class RedisBuffer(Buffer):
             pipe.hincrby(key, "i+" + column, amount)
 
         if extra:
-            # Group tries to serialize 'score', so we'd need some kind of processing
-            # hook here
-            # e.g. "update score if last_seen or times_seen is changed"
-            _validate_json_roundtrip(extra, model)
             for column, value in extra.items():
                 if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
                     pipe.hset(key, "e+" + column, json.dumps(self._dump_value(value)))
@@ -499,13 +675,137 @@ class RedisBuffer(Buffer):
 
         pipe.expire(key, self.key_expire)
         pipe.zadd(self.pending_key, {key: time()})
-        pipe.execute()
 
-        metrics.incr(
-            "buffer.incr",
-            skip_internal=True,
-            tags={"module": model.__module__, "model": model.__name__},
+        return 4 + len(columns) + len(extra or ()) + (signal_only is True)
+
+    def _schedule_coalesced_flush(self, max_age: float) -> None:
+        # Make sure a quiet worker still writes out what it has within `max_age`, and that
+        # nothing is lost when the process exits. Celery's prefork children leave through
+        # `os._exit`, which skips `atexit`, but send `worker_process_shutdown` before.
+        if not self._coalesce_atexit_registered:
+            atexit.register(self.flush_coalesced)
+            worker_process_shutdown.connect(self._flush_coalesced_on_shutdown, weak=False)
+            self._coalesce_atexit_registered = True
+
+        timer = threading.Timer(max_age, self.flush_coalesced)
+        timer.daemon = True
+        timer.start()
+
+    def _flush_coalesced_on_shutdown(self, **kwargs: Any) -> None:
+        self.flush_coalesced()
+
+    def flush_coalesced(self) -> None:
+        """
+        Write all pre-aggregated `incr` calls to Redis, using one pipeline per Redis host.
+
+        Pipelines aren't transactions, so only the parts of an entry whose commands were rejected
+        are put back to be retried with the next flush. If a pipeline fails as a whole, there's no
+        telling which of its commands were applied, and its entries are dropped rather than
+        risking counting them twice.
+        """
+        pending = self._coalescer.drain()
+        if not pending:
+            return
+
+        keys_by_connection: defaultdict[Any, list[str]] = defaultdict(list)
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            keys_by_connection[None] = list(pending)
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            router = self.cluster.get_router()
+            for key in pending:
+                keys_by_connection[router.get_host_for_key(key)].append(key)
+        else:
+            raise AssertionError("unreachable")
+
+        flushed: list[str] = []
+        dropped: list[str] = []
+        failed: dict[str, CoalescedIncr] = {}
+        error: Exception | None = None
+        for connection, keys in keys_by_connection.items():
+            try:
+                if connection is None:
+                    pipe = self.cluster.pipeline(transaction=False)
+                else:
+                    pipe = self.cluster.get_local_client(connection).pipeline(transaction=False)
+
+                num_commands = []
+                for key in keys:
+                    entry = pending[key]
+                    num_commands.append(
+                        self._add_incr_to_pipeline(
+                            pipe,
+                            key,
+                            entry.model,
+                            entry.columns,
+                            entry.filters,
+                            entry.extra,
+                            entry.signal_only,
+                        )
+                    )
+            except Exception as e:
+                # Nothing was sent yet, so all of it can be retried
+                failed.update((key, pending[key]) for key in keys)
+                error = error or e
+                continue
+
+            try:
+                results = pipe.execute(raise_on_error=False)
+            except Exception as e:
+                logger.exception("buffer.incr.coalesced-flush-failed")
+                dropped.extend(keys)
+                error = error or e
+                continue
+
+            position = 0
+            for key, count in zip(keys, num_commands):
+                key_results = results[position : position + count]
+                position += count
+
+                failed_entry = self._get_failed_incr(pending[key], key_results)
+                if failed_entry is None:
+                    flushed.append(key)
+                else:
+                    failed[key] = failed_entry
+                    error = error or next(r for r in key_results if isinstance(r, Exception))
+
+        if failed and self._coalescer.restore(failed):
+            self._schedule_coalesced_flush(options.get("buffer.incr.coalesce.max-age"))
+
+        metrics.distribution("buffer.incr.coalesced-keys", len(flushed))
+        metrics.distribution(
+            "buffer.incr.coalesced-calls", sum(pending[key].count for key in flushed)
         )
+        if dropped:
+            metrics.incr(
+                "buffer.incr.coalesced-dropped-calls",
+                amount=sum(pending[key].count for key in dropped),
+            )
+
+        if error is not None:
+            raise error
+
+    def _get_failed_incr(self, entry: CoalescedIncr, results: list[Any]) -> CoalescedIncr | None:
+        """
+        The part of a flushed entry whose commands were rejected, given the results of the
+        commands `_add_incr_to_pipeline` queued for it. Everything else it queues is idempotent,
+        so the returned entry can be flushed again as a whole.
+        """
+        if not any(isinstance(result, Exception) for result in results):
+            return None
+
+        failed = CoalescedIncr(model=entry.model, filters=entry.filters, count=entry.count)
+        # Skip the HSETNX of the model and the filters
+        remaining = iter(results[2:])
+        for column, amount in entry.columns.items():
+            if isinstance(next(remaining), Exception):
+                failed.columns[column] = amount
+        for column, value in entry.extra.items():
+            if isinstance(next(remaining), Exception):
+                failed.extra[column] = value
+        if entry.signal_only is True and isinstance(next(remaining), Exception):
+            failed.signal_only = True
+
+        return failed
 
     def process_pending(self) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
@@ -612,6 +912,10 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if len(batch_keys) > 1 and options.get("buffer.process.bulk-flush"):
+                self._process_bulk(batch_keys)
+                return
+
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -625,13 +929,49 @@ class RedisBuffer(Buffer):
     ) -> Any:
         return super().process(model, columns, filters, extra, signal_only)
 
-    def _process_single_incr(self, key: str) -> None:
+    def _process_bulk(self, keys: list[str]) -> None:
+        """
+        Drain all the given keys from Redis at once and apply them to the database together,
+        see `Buffer.process_many`.
+        """
+        incrs: list[BufferedIncr] = []
+
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            # The keys are spread over hash slots, which a single script can't touch, so they're
+            # drained one by one as before
+            for key in keys:
+                incr = self._drain_single_key(key)
+                if incr is not None:
+                    incrs.append(incr)
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            # The script reads and deletes atomically, so unlike `_drain_single_key` this needs no
+            # lock to prevent the same values from being applied twice
+            router = self.cluster.get_router()
+            keys_by_host: defaultdict[int, list[str]] = defaultdict(list)
+            for key in keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+
+            for host_id, host_keys in keys_by_host.items():
+                client = self.cluster.get_local_client(host_id)
+                results = drain_buffer_keys([self.pending_key, *host_keys], [], client)
+                for key, result in zip(host_keys, results):
+                    incr = self._load_buffered_values(key, dict(zip(result[::2], result[1::2])))
+                    if incr is not None:
+                        incrs.append(incr)
+        else:
+            raise AssertionError("unreachable")
+
+        metrics.distribution("buffer.process-bulk.keys", len(keys))
+        metrics.distribution("buffer.process-bulk.incrs", len(incrs))
+        self.process_many(incrs)
+
+    def _drain_single_key(self, key: str) -> BufferedIncr | None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, key, ex=10)
         if not lock_key:
             metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
             logger.debug("buffer.revoked.locked", extra={"redis_key": key})
-            return
+            return None
 
         try:
             pipe = self.get_redis_connection(key, transaction=False)
@@ -639,40 +979,48 @@ class RedisBuffer(Buffer):
             pipe.zrem(self.pending_key, key)
             pipe.delete(key)
             values = pipe.execute()[0]
+        finally:
+            client.delete(lock_key)
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
+        return self._load_buffered_values(key, values)
 
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
+    def _load_buffered_values(self, key: str, values: dict[Any, Any]) -> BufferedIncr | None:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
 
-            model = import_string(force_str(values.pop("m")))
+        model = import_string(force_str(values.pop("m")))
 
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
-        finally:
-            client.delete(lock_key)
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
+    def _process_single_incr(self, key: str) -> None:
+        incr = self._drain_single_key(key)
+        if incr is not None:
+            self._process(*incr)
@@ -1777,6 +1777,10 @@ SENTRY_METRICS_DISALLOW_BAD_TAGS = IS_DEV
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.postgres_v2.PostgresIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS: dict[str, Any] = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# Size (in entries, for each lookup direction) and TTL of the per-process cache which sits in
+# front of the indexer cache. A size of 0 disables it.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 0
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL = 60 * 10
 SENTRY_METRICS_INDEXER_TRANSACTIONS_SAMPLE_RATE = 0.1  # relative to SENTRY_BACKEND_APM_SAMPLING
 
 SENTRY_METRICS_INDEXER_SPANNER_OPTIONS: dict[str, Any] = {}
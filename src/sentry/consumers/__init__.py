@@ -39,6 +39,12 @@ def convert_max_batch_time(ctx, param, value):
     return int(value / 1000.0)
 
 
+def convert_optional_max_batch_time(ctx, param, value):
+    if value is None:
+        return None
+    return convert_max_batch_time(ctx, param, value)
+
+
 def multiprocessing_options(
     default_max_batch_size: int | None = None, default_max_batch_time_ms: int | None = 1000
 ) -> list[click.Option]:
@@ -173,6 +179,29 @@ def ingest_transactions_options() -> list[click.Option]:
             help="Save event directly in consumer without celery",
         )
     )
+    options.extend(
+        [
+            click.Option(
+                ["--save-processes", "save_processes"],
+                default=0,
+                type=int,
+                help="With --no-celery-mode, save events in a separate step using this many processes.",
+            ),
+            click.Option(
+                ["--save-max-batch-size", "save_max_batch_size"],
+                type=int,
+                default=None,
+                help="Maximum number of events to batch for the save step. Defaults to --max-batch-size.",
+            ),
+            click.Option(
+                ["--save-max-batch-time-ms", "save_max_batch_time"],
+                type=int,
+                default=None,
+                callback=convert_optional_max_batch_time,
+                help="Maximum time (in milliseconds) to wait before flushing a batch to the save step. Defaults to --max-batch-time-ms.",
+            ),
+        ]
+    )
     return options
 
 
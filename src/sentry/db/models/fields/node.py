@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import pickle
 from base64 import b64encode
-from collections.abc import Callable, MutableMapping
+from collections.abc import Callable, MutableMapping, Sequence
 from typing import Any
 from uuid import uuid4
 
@@ -133,10 +133,36 @@ class NodeData(MutableMapping[str, Any]):
             See documentation of nodestore.
         """
 
+        to_write = self._get_subkeys_to_write(subkeys)
+        if to_write is None:
+            return
+
+        nodestore.backend.set_subkeys(self.id, to_write)
+
+    @staticmethod
+    def save_many(nodes: Sequence[tuple[NodeData, dict[str | None, Any] | None]]) -> None:
+        """
+        Write the data of multiple nodes back to nodestore in a single batch.
+
+        :param nodes: Pairs of node data and the subkeys to save with it, see
+            `save`.
+        """
+        to_write = {}
+        for node_data, subkeys in nodes:
+            node_subkeys = node_data._get_subkeys_to_write(subkeys)
+            if node_subkeys is not None:
+                to_write[node_data.id] = node_subkeys
+
+        if to_write:
+            nodestore.backend.set_many(to_write)
+
+    def _get_subkeys_to_write(
+        self, subkeys: dict[str | None, Any] | None
+    ) -> dict[str | None, Any] | None:
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -146,8 +172,7 @@ class NodeData(MutableMapping[str, Any]):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.backend.set_subkeys(self.id, subkeys)
+        return subkeys
 
 
 class NodeField(GzippedDictField):
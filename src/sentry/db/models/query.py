@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import itertools
 import operator
+from collections.abc import Mapping
 from functools import reduce
 from typing import TYPE_CHECKING, Any, Literal
 
-from django.db import IntegrityError, router, transaction
+from django.db import IntegrityError, connections, router, transaction
 from django.db.models import F, Model, Q
 from django.db.models.expressions import BaseExpression, CombinedExpression, Value
 from django.db.models.fields import Field
@@ -15,6 +16,7 @@ if TYPE_CHECKING:
     from sentry.db.models.base import BaseModel
 
 __all__ = (
+    "bulk_increment",
     "create_or_update",
     "update",
     "update_or_create",
@@ -223,6 +225,82 @@ def create_or_update(
     return affected, False
 
 
+def bulk_increment(
+    model: type[Model],
+    rows: Mapping[int, tuple[Mapping[str, int], Mapping[str, Any]]],
+    using: str | None = None,
+) -> list[Model]:
+    """
+    Increment (and set) columns on many rows in a single statement, in the form
+    { pk: ({ column_name: increment_amount }, { column_name: new_value }) }
+
+    All rows have to increment and set the same columns. Returns the updated instances; rows which
+    don't exist are silently skipped, so callers can tell them apart by their absence.
+
+    >>> bulk_increment(Group, {
+    >>>     1: ({'times_seen': 3}, {'last_seen': timezone.now()}),
+    >>>     2: ({'times_seen': 1}, {'last_seen': timezone.now()}),
+    >>> })
+    """
+    if not rows:
+        return []
+
+    if not using:
+        using = router.db_for_write(model)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+
+    first_columns, first_values = next(iter(rows.values()))
+    increment_fields = [_get_field(model, name) for name in first_columns]
+    set_fields = [_get_field(model, name) for name in first_values]
+    pk_field = model._meta.pk
+    value_fields = [pk_field, *increment_fields, *set_fields]
+
+    assignments = [
+        f"{qn(f.column)} = t.{qn(f.column)} + v.{qn(f.column)}" for f in increment_fields
+    ] + [f"{qn(f.column)} = v.{qn(f.column)}" for f in set_fields]
+    row_placeholder = "({})".format(
+        ", ".join(f"%s::{f.cast_db_type(connection)}" for f in value_fields)
+    )
+
+    params: list[Any] = []
+    for pk, (columns, values) in rows.items():
+        assert columns.keys() == first_columns.keys() and values.keys() == first_values.keys()
+        params.append(pk_field.get_db_prep_value(pk, connection))
+        params.extend(f.get_db_prep_save(columns[f.name], connection) for f in increment_fields)
+        params.extend(f.get_db_prep_save(values[f.name], connection) for f in set_fields)
+
+    concrete_fields = model._meta.concrete_fields
+    sql = (
+        "UPDATE {table} AS t SET {assignments} "
+        "FROM (VALUES {rows}) AS v ({columns}) "
+        "WHERE t.{pk} = v.{pk} "
+        "RETURNING {returning}"
+    ).format(
+        table=qn(model._meta.db_table),
+        assignments=", ".join(assignments),
+        rows=", ".join([row_placeholder] * len(rows)),
+        columns=", ".join(qn(f.column) for f in value_fields),
+        pk=qn(pk_field.column),
+        returning=", ".join(f"t.{qn(f.column)}" for f in concrete_fields),
+    )
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        results = cursor.fetchall()
+
+    field_names = [f.attname for f in concrete_fields]
+    instances = []
+    for result in results:
+        field_values = []
+        for f, value in zip(concrete_fields, result):
+            for converter in f.get_db_converters(connection):
+                value = converter(value, f, connection)
+            field_values.append(value)
+        instances.append(model.from_db(using, field_names, field_values))
+    return instances
+
+
 def in_iexact(column: str, values: Any) -> Q:
     """Operator to test if any of the given values are (case-insensitive)
     matching to values in the given column."""
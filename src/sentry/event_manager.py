@@ -41,6 +41,7 @@ from sentry.constants import (
     InsightModules,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.dynamic_sampling import LatestReleaseBias, LatestReleaseParams
 from sentry.eventstore.processing import event_processing_store
 from sentry.eventstream.base import GroupState
@@ -114,6 +115,8 @@ from sentry.signals import (
     first_transaction_received,
     issue_unresolved,
 )
+from sentry.spans.grouping.api import load_span_grouping_config
+from sentry.spans.grouping.result import SpanGroupingResults
 from sentry.tasks.process_buffer import buffer_incr
 from sentry.tasks.relay import schedule_invalidate_project_config
 from sentry.tsdb.base import TSDBModel
@@ -1062,6 +1065,7 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
     inserted_time = datetime.now(timezone.utc).timestamp()
+    nodes: list[tuple[NodeData, dict[str | None, Any]]] = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1088,7 +1092,9 @@ def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
                 usage_type=UsageUnit.BYTES,
             )
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        nodes.append((job["event"].data, subkeys))
+
+    NodeData.save_many(nodes)
 
 
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
@@ -1389,7 +1395,13 @@ def handle_existing_grouphash(
     # this function had races around group creation which made this race
     # more user visible. For more context, see 84c6f75a and d0e22787, as
     # well as GH-5085.
-    group = Group.objects.get(id=existing_grouphash.group_id)
+    #
+    # Grouphashes fetched by `get_or_create_grouphashes` come with their group already attached, so
+    # in the common case this doesn't need another query.
+    if GroupHash.group.is_cached(existing_grouphash) and existing_grouphash.group is not None:
+        group = existing_grouphash.group
+    else:
+        group = Group.objects.get(id=existing_grouphash.group_id)
 
     # As far as we know this has never happened, but in theory at least, the error event hashing
     # algorithm and other event hashing algorithms could come up with the same hash value in the
@@ -2486,12 +2498,24 @@ def _materialize_event_metrics(jobs: Sequence[Job]) -> None:
 
 @sentry_sdk.tracing.trace
 def _calculate_span_grouping(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
-    for job in jobs:
+    # Group the spans of all events at once, so spans which repeat across the
+    # events are only grouped once.
+    all_groupings: Sequence[SpanGroupingResults | None]
+    try:
+        config = load_span_grouping_config()
+        all_groupings = config.execute_strategy_many([job["event"].data for job in jobs])
+    except Exception:
+        # Fall back to grouping the events one by one below, so that a single
+        # broken event doesn't prevent the others from being grouped.
+        all_groupings = [None] * len(jobs)
+
+    for job, groupings in zip(jobs, all_groupings):
         # Make sure this snippet doesn't crash ingestion
         # as the feature is under development.
         try:
             event = job["event"]
-            groupings = event.get_span_groupings()
+            if groupings is None:
+                groupings = event.get_span_groupings()
             groupings.write_to_event(event.data)
 
             metrics.distribution("save_event.transaction.span_count", len(groupings.results))
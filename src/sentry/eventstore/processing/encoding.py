@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from sentry.features.rollout import in_random_rollout
+from sentry.utils import metrics
+from sentry.utils.codecs import BytesCodec, Codec, JSONCodec, MsgpackCodec, ZstdCodec
+
+# Marks payloads in the compact format. JSON documents can't start with a NUL byte, so this can't
+# be confused with a payload written by `JSONCodec`.
+COMPACT_FORMAT_HEADER = b"\x00\x01"
+
+# Share of compact writes for which the payload is also encoded as JSON, to report how many bytes
+# the compact format saves
+BYTES_SAVED_SAMPLE_RATE = 0.01
+
+
+class EventPayloadCodec(Codec[Any, bytes]):
+    """
+    Encode/decode event payloads to/from bytes for the processing store.
+
+    Payloads are written as zstd-compressed msgpack for the share of writes selected by the
+    `eventstore.processing.compact-encoding` option, and as JSON otherwise. Either format is read
+    regardless of the option, so it can be changed while payloads written in the other format are
+    still being processed.
+    """
+
+    def __init__(self) -> None:
+        self.json_codec = JSONCodec() | BytesCodec()
+        self.compact_codec = MsgpackCodec() | ZstdCodec()
+
+    def encode(self, value: Any) -> bytes:
+        if in_random_rollout("eventstore.processing.compact-encoding"):
+            try:
+                with metrics.timer("eventstore.processing.encode", tags={"format": "compact"}):
+                    encoded = COMPACT_FORMAT_HEADER + self.compact_codec.encode(value)
+            except (TypeError, ValueError, OverflowError):
+                # e.g. integers which don't fit into 64 bits, which JSON does support
+                metrics.incr("eventstore.processing.compact-encoding-failed")
+            else:
+                self._record_size("compact", encoded)
+                if random.random() < BYTES_SAVED_SAMPLE_RATE:
+                    metrics.distribution(
+                        "eventstore.processing.bytes-saved",
+                        len(self.json_codec.encode(value)) - len(encoded),
+                        unit="byte",
+                    )
+                return encoded
+
+        with metrics.timer("eventstore.processing.encode", tags={"format": "json"}):
+            encoded = self.json_codec.encode(value)
+        self._record_size("json", encoded)
+        return encoded
+
+    def decode(self, value: bytes) -> Any:
+        if value.startswith(COMPACT_FORMAT_HEADER):
+            with metrics.timer("eventstore.processing.decode", tags={"format": "compact"}):
+                return self.compact_codec.decode(value[len(COMPACT_FORMAT_HEADER) :])
+
+        with metrics.timer("eventstore.processing.decode", tags={"format": "json"}):
+            return self.json_codec.decode(value)
+
+    def _record_size(self, format: str, encoded: bytes) -> None:
+        metrics.distribution(
+            "eventstore.processing.encoded-size", len(encoded), tags={"format": format}, unit="byte"
+        )
@@ -1,9 +1,9 @@
-from sentry.utils.codecs import JSONCodec
 from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
 from sentry.utils.kvstore.redis import RedisKVStorage
 from sentry.utils.redis import redis_clusters
 
 from .base import EventProcessingStore
+from .encoding import EventPayloadCodec
 
 
 class RedisClusterEventProcessingStore(EventProcessingStore):
@@ -15,6 +15,7 @@ class RedisClusterEventProcessingStore(EventProcessingStore):
     def __init__(self, **options):
         super().__init__(
             KVStorageCodecWrapper(
-                RedisKVStorage(redis_clusters.get(options.pop("cluster", "default"))), JSONCodec()
+                RedisKVStorage(redis_clusters.get_binary(options.pop("cluster", "default"))),
+                EventPayloadCodec(),
             )
         )
@@ -1,7 +1,8 @@
+import functools
 from typing import Any
 
 from sentry.grouping.utils import get_rule_bool
-from sentry.stacktraces.functions import get_function_name_for_frame
+from sentry.stacktraces.functions import trim_function_name
 from sentry.stacktraces.platform import get_behavior_family_for_platform
 from sentry.utils import metrics
 from sentry.utils.glob import glob_match
@@ -70,23 +71,36 @@ MATCHERS = {
 }
 
 
-def _get_function_name(frame_data: dict, platform: str | None):
-    function_name = get_function_name_for_frame(frame_data, platform)
-
-    return function_name or "<unknown>"
-
+# Number of distinct frames for which match data is memoized per worker. Match frames only depend on a
+# handful of fields, so frames of the same stack trace seen across events share the same entry.
+MATCH_FRAME_CACHE_SIZE = 20_000
+
+
+def _create_match_frame(
+    category: Any,
+    platform: str | None,
+    has_raw_function: bool,
+    function: Any,
+    in_app: Any,
+    orig_in_app: Any,
+    module: Any,
+    package: Any,
+    path: Any,
+) -> dict:
+    if has_raw_function:
+        function_name = function
+    else:
+        function_name = function and trim_function_name(function, platform)
 
-def create_match_frame(frame_data: dict, platform: str | None) -> dict:
-    """Create flat dict of values relevant to matchers"""
     match_frame = dict(
-        category=get_path(frame_data, "data", "category"),
-        family=get_behavior_family_for_platform(frame_data.get("platform") or platform),
-        function=_get_function_name(frame_data, platform),
-        in_app=frame_data.get("in_app"),
-        orig_in_app=get_path(frame_data, "data", "orig_in_app"),
-        module=get_path(frame_data, "module"),
-        package=frame_data.get("package"),
-        path=frame_data.get("abs_path") or frame_data.get("filename"),
+        category=category,
+        family=get_behavior_family_for_platform(platform),
+        function=function_name or "<unknown>",
+        in_app=in_app,
+        orig_in_app=orig_in_app,
+        module=module,
+        package=package,
+        path=path,
     )
 
     for key in list(match_frame.keys()):
@@ -104,6 +118,36 @@ def create_match_frame(frame_data: dict, platform: str | None) -> dict:
     return match_frame
 
 
+# `typed=True` so that e.g. an `in_app` of `1` doesn't get served the cached result for `True`
+_create_match_frame_cached = functools.lru_cache(maxsize=MATCH_FRAME_CACHE_SIZE, typed=True)(
+    _create_match_frame
+)
+
+
+def create_match_frame(frame_data: dict, platform: str | None) -> dict:
+    """Create flat dict of values relevant to matchers"""
+    args = (
+        get_path(frame_data, "data", "category"),
+        frame_data.get("platform") or platform,
+        bool(frame_data.get("raw_function")),
+        frame_data.get("function"),
+        frame_data.get("in_app"),
+        get_path(frame_data, "data", "orig_in_app"),
+        get_path(frame_data, "module"),
+        frame_data.get("package"),
+        frame_data.get("abs_path") or frame_data.get("filename"),
+    )
+
+    try:
+        match_frame = _create_match_frame_cached(*args)
+    except TypeError:
+        # Unhashable garbage in one of the fields, which we can still match against
+        return _create_match_frame(*args)
+
+    # The cached dict is shared between events, so hand out a copy
+    return dict(match_frame)
+
+
 class EnhancementMatch:
     def matches_frame(self, frames, idx, exception_data, cache):
         raise NotImplementedError()
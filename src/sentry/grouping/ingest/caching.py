@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import orjson
+from cachetools import TTLCache
+
+from sentry import options
+from sentry.grouping.api import GroupingConfig
+from sentry.grouping.utils import parse_fingerprint_var
+from sentry.grouping.variants import BaseVariant
+from sentry.models.project import Project
+from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
+
+if TYPE_CHECKING:
+    from sentry.eventstore.models import Event
+    from sentry.grouping.strategies.base import StrategyConfiguration
+
+# Bump this whenever a change to the grouping code changes the output for a given input, so results
+# computed by the old code aren't served after a deploy
+GROUPING_CACHE_VERSION = 1
+
+GROUPING_CACHE_SIZE = 500
+GROUPING_CACHE_TTL = 600
+
+# The parts of the event data which go into the calculation of grouping variants, once stack
+# traces have been normalized and server-side fingerprinting has been applied
+GROUPING_INPUT_KEYS = (
+    "platform",
+    "checksum",
+    "fingerprint",
+    "_fingerprint_info",
+    "exception",
+    "threads",
+    "stacktrace",
+    "logentry",
+    "message",
+    "template",
+    "csp",
+    "hpkp",
+    "expectct",
+    "expectstaple",
+)
+
+
+class CachedGrouping(NamedTuple):
+    hashes: list[str]
+    variants: dict[str, BaseVariant]
+    # Set on the event by the chained exception strategy as a side effect of calculating variants
+    main_exception_id: int | None
+
+
+# Per-process cache. Variants are shared between all events which hit the same entry, so they must
+# be treated as read-only.
+_grouping_cache: TTLCache[str, CachedGrouping] = TTLCache(
+    maxsize=GROUPING_CACHE_SIZE, ttl=GROUPING_CACHE_TTL
+)
+
+
+def get_grouping_cache_key(
+    project: Project, event: Event, grouping_config: GroupingConfig
+) -> str | None:
+    """
+    Get the key under which the given event's grouping results are cached, or `None` if the results
+    can't be cached.
+
+    The key covers the grouping config and enhancements in addition to the event's grouping inputs,
+    so changing either of those in the project's settings implicitly invalidates existing entries.
+    """
+    fingerprint = event.data.get("fingerprint") or []
+
+    # Fingerprint variables like `{{ tags.foo }}` or `{{ transaction }}` pull in parts of the event
+    # we don't include in the key
+    if any(
+        parse_fingerprint_var(value) not in (None, "default")
+        for value in fingerprint
+        if isinstance(value, str)
+    ):
+        return None
+
+    try:
+        grouping_input = orjson.dumps(
+            {key: event.data.get(key) for key in GROUPING_INPUT_KEYS},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        return None
+
+    return "grouping-variants:{}:{}:{}".format(
+        GROUPING_CACHE_VERSION,
+        project.id,
+        md5_text(
+            grouping_config["id"], "|", grouping_config["enhancements"], "|", grouping_input
+        ).hexdigest(),
+    )
+
+
+def get_hashes_and_variants_with_cache(
+    project: Project,
+    event: Event,
+    grouping_config: GroupingConfig,
+    loaded_grouping_config: StrategyConfiguration,
+) -> tuple[list[str], dict[str, BaseVariant]]:
+    """
+    Calculate the event's hashes and variants, reusing the results of a previous event with
+    identical grouping inputs if there is one.
+
+    Crash loops send many byte-for-byte identical stack traces in a short period of time, and
+    calculating the component trees for those is the most expensive part of grouping.
+    """
+    if not options.get("grouping.variants_cache.enabled"):
+        return event.get_hashes_and_variants(loaded_grouping_config)
+
+    cache_key = get_grouping_cache_key(project, event, grouping_config)
+    if cache_key is None:
+        metrics.incr("grouping.variants_cache", tags={"result": "uncacheable"})
+        return event.get_hashes_and_variants(loaded_grouping_config)
+
+    cached = _grouping_cache.get(cache_key)
+    if cached is not None:
+        metrics.incr("grouping.variants_cache", tags={"result": "hit"})
+
+        # Replicate the side effects calculating the variants would have had on the event
+        event.data["hashes"] = list(cached.hashes)
+        if cached.main_exception_id is not None:
+            event.data["main_exception_id"] = cached.main_exception_id
+
+        return list(cached.hashes), cached.variants
+
+    metrics.incr("grouping.variants_cache", tags={"result": "miss"})
+
+    had_main_exception_id = "main_exception_id" in event.data
+    hashes, variants = event.get_hashes_and_variants(loaded_grouping_config)
+
+    _grouping_cache[cache_key] = CachedGrouping(
+        hashes=list(hashes),
+        variants=variants,
+        main_exception_id=(None if had_main_exception_id else event.data.get("main_exception_id")),
+    )
+
+    return hashes, variants
+
+
+def clear_grouping_cache() -> None:
+    _grouping_cache.clear()
@@ -20,6 +20,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.ingest.caching import get_hashes_and_variants_with_cache
 from sentry.grouping.ingest.config import is_in_transition
 from sentry.grouping.ingest.grouphash_metadata import (
     create_or_update_grouphash_metadata_if_needed,
@@ -45,6 +46,9 @@ def _calculate_event_grouping(
     """
     Calculate hashes for the event using the given grouping config, add them to the event data, and
     return them, along with the variants data upon which they're based.
+
+    Results for events with identical grouping inputs may be served from the per-process grouping
+    cache (see `get_hashes_and_variants_with_cache`).
     """
     metric_tags: MutableTags = {
         "grouping_config": grouping_config["id"],
@@ -73,7 +77,9 @@ def _calculate_event_grouping(
             )
 
         with metrics.timer("event_manager.event.get_hashes", tags=metric_tags):
-            hashes, variants = event.get_hashes_and_variants(loaded_grouping_config)
+            hashes, variants = get_hashes_and_variants_with_cache(
+                project, event, grouping_config, loaded_grouping_config
+            )
 
         return (hashes, variants)
 
@@ -221,14 +227,28 @@ def get_or_create_grouphashes(
     is_secondary = grouping_config != project.get_option("sentry:grouping_config")
     grouphashes: list[GroupHash] = []
 
+    # Fetch all of the event's existing grouphashes (along with their metadata and groups, both of
+    # which we're likely to need) in one query, so that we only have to go back to the database for
+    # hashes we've never seen before
+    existing_grouphashes = {
+        grouphash.hash: grouphash
+        for grouphash in GroupHash.objects.filter(project=project, hash__in=hashes).select_related(
+            "_metadata", "group"
+        )
+    }
+
     # The only utility of secondary hashes is to link new primary hashes to an existing group.
     # Secondary hashes which are also new are therefore of no value, so there's no need to store or
     # annotate them and we can bail now.
-    if is_secondary and not GroupHash.objects.filter(project=project, hash__in=hashes).exists():
+    if is_secondary and not existing_grouphashes:
         return grouphashes
 
     for hash_value in hashes:
-        grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
+        existing_grouphash = existing_grouphashes.get(hash_value)
+        if existing_grouphash is not None:
+            grouphash, created = existing_grouphash, False
+        else:
+            grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
 
         if options.get("grouping.grouphash_metadata.ingestion_writes_enabled") and features.has(
             "organizations:grouphash-metadata-creation", project.organization
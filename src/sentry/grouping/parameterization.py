@@ -1,8 +1,8 @@
 import dataclasses
+import functools
 import re
 from collections import defaultdict
-from collections.abc import Callable, Sequence
-from functools import lru_cache
+from collections.abc import Callable, Mapping, Sequence
 
 import tiktoken
 
@@ -12,6 +12,7 @@ __all__ = [
     "ParameterizationExperiment",
     "ParameterizationRegex",
     "ParameterizationRegexExperiment",
+    "ParameterizationScanner",
     "Parameterizer",
     "UniqueIdExperiment",
 ]
@@ -181,6 +182,95 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
 
+# Messages longer than this are scanned but never cached, so that a handful of huge log lines can't
+# blow up the memory used by the scanner cache.
+SCANNER_CACHE_MAX_CONTENT_LENGTH = 2048
+SCANNER_CACHE_SIZE = 10_000
+
+
+class ParameterizationScanner:
+    """
+    A precompiled, single-pass scanner over a fixed set of default parameterization patterns.
+
+    The output is identical to `Parameterizer.parametrize_w_regex`, but rather than inspecting the
+    full `groupdict()` of every match (which, given the number of groups in the combined pattern, is
+    the bulk of the work), the matching pattern is resolved from the index of the last closed group
+    via a lookup table built once at compile time. Results are kept in a bounded LRU cache keyed by
+    message, since high-volume projects tend to send the same few messages over and over.
+
+    Scanners are shared per process, so use `get_parameterization_scanner` rather than
+    instantiating this directly.
+    """
+
+    def __init__(self, pattern_keys: Sequence[str], cache_size: int = SCANNER_CACHE_SIZE):
+        self.pattern_keys = tuple(pattern_keys)
+        self._regex = Parameterizer._make_regex_from_patterns(self.pattern_keys)
+        # Map from group index to (pattern key, placeholder). Each pattern is wrapped in its own
+        # named group, which is always the last group to close when that pattern matches.
+        self._placeholders: dict[int, tuple[str, str]] = {
+            index: (key, f"<{key}>") for key, index in self._regex.groupindex.items()
+        }
+        self._scan_cached = functools.lru_cache(maxsize=cache_size)(self._scan)
+
+    def _resolve_match(self, match: re.Match[str]) -> tuple[str, str] | None:
+        resolved = self._placeholders.get(match.lastindex or 0)
+        if resolved is not None:
+            return resolved
+
+        # Shouldn't happen given the way the combined pattern is built, but fall back to the slow
+        # path rather than producing different output from `parametrize_w_regex`
+        for key, value in match.groupdict().items():
+            if value is not None:
+                return key, f"<{key}>"
+        return None
+
+    def _scan(self, content: str) -> tuple[str, Mapping[str, int]]:
+        parts: list[str] = []
+        counts: dict[str, int] = {}
+        position = 0
+
+        for match in self._regex.finditer(content):
+            start, end = match.span()
+            parts.append(content[position:start])
+            resolved = self._resolve_match(match)
+            if resolved is not None:
+                key, placeholder = resolved
+                parts.append(placeholder)
+                counts[key] = counts.get(key, 0) + 1
+            position = end
+
+        if not parts:
+            return content, counts
+
+        parts.append(content[position:])
+        return "".join(parts), counts
+
+    def scan(self, content: str) -> tuple[str, Mapping[str, int]]:
+        """
+        Parameterize the given content.
+
+        @param content: The string to replace matches in.
+        @returns: The parameterized content and the number of matches per pattern key. The counts
+            mapping may be shared with other callers and must not be mutated.
+        """
+        if len(content) > SCANNER_CACHE_MAX_CONTENT_LENGTH:
+            return self._scan(content)
+        return self._scan_cached(content)
+
+    def cache_info(self) -> functools._CacheInfo:
+        return self._scan_cached.cache_info()
+
+    def cache_clear(self) -> None:
+        self._scan_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=16)
+def get_parameterization_scanner(pattern_keys: tuple[str, ...]) -> ParameterizationScanner:
+    """
+    Return the process-wide scanner for the given pattern keys, compiling it on first use.
+    """
+    return ParameterizationScanner(pattern_keys)
+
 
 @dataclasses.dataclass
 class ParameterizationCallable:
@@ -218,7 +308,7 @@ class _UniqueId:
     NAME = "uniq_id"
 
     @staticmethod
-    @lru_cache(maxsize=1)
+    @functools.lru_cache(maxsize=1)
     def tiktoken_encoding() -> tiktoken.Encoding:
         return tiktoken.get_encoding("cl100k_base")
 
@@ -281,6 +371,7 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
+        self._regex_pattern_keys = tuple(regex_pattern_keys)
         self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
         self._experiments = experiments
 
@@ -326,6 +417,23 @@ class Parameterizer:
 
         return self._parameterization_regex.sub(_handle_regex_match, content)
 
+    def parametrize_w_scanner(self, content: str) -> str:
+        """
+        Replace all matches of the regex pattern keys in the content with a placeholder string,
+        using the shared precompiled `ParameterizationScanner`.
+
+        Produces the same output and match counts as `parametrize_w_regex`, but results for
+        recently-seen messages are served from the scanner's cache.
+
+        @param content: The string to replace matches in.
+        @returns: The content with all matches replaced with placeholders.
+        """
+        scanner = get_parameterization_scanner(self._regex_pattern_keys)
+        parameterized, counts = scanner.scan(content)
+        for key, count in counts.items():
+            self.matches_counter[key] += count
+        return parameterized
+
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
     ) -> str:
@@ -363,6 +471,13 @@ class Parameterizer:
         return [e for e in self._experiments if self.matches_counter[e.name] > 0]
 
     def parameterize_all(
-        self, content: str, should_run: Callable[[str], bool] = lambda _: True
+        self,
+        content: str,
+        should_run: Callable[[str], bool] = lambda _: True,
+        use_scanner: bool = False,
     ) -> str:
-        return self.parametrize_w_experiments(self.parametrize_w_regex(content), should_run)
+        if use_scanner:
+            content = self.parametrize_w_scanner(content)
+        else:
+            content = self.parametrize_w_regex(content)
+        return self.parametrize_w_experiments(content, should_run)
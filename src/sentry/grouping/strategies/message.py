@@ -3,7 +3,7 @@ from typing import Any
 
 from sentry import analytics
 from sentry.eventstore.models import Event
-from sentry.features.rollout import in_rollout_group
+from sentry.features.rollout import in_random_rollout, in_rollout_group
 from sentry.grouping.component import MessageGroupingComponent
 from sentry.grouping.parameterization import Parameterizer, UniqueIdExperiment
 from sentry.grouping.strategies.base import (
@@ -79,7 +79,11 @@ def normalize_message_for_grouping(message: str, event: Event, share_analytics:
             )
         )
 
-    normalized = parameterizer.parameterize_all(trimmed, _shoudl_run_experiment)
+    normalized = parameterizer.parameterize_all(
+        trimmed,
+        _shoudl_run_experiment,
+        use_scanner=in_random_rollout("grouping.parameterization.use_scanner"),
+    )
 
     for experiment in parameterizer.get_successful_experiments():
         if share_analytics and experiment.counter < 100:
@@ -19,7 +19,8 @@ from sentry.processing.backpressure.arroyo import HealthChecker, create_backpres
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
-from .simple_event import process_simple_event_message
+from .processors import DeferredTransactionSave
+from .simple_event import process_deferred_transaction_message, process_simple_event_message
 
 
 class MultiProcessConfig(NamedTuple):
@@ -166,6 +167,10 @@ class IngestTransactionsStrategyFactory(ProcessingStrategyFactory[KafkaPayload])
     Processes transactions in either celery or no-celery mode.
     Transactions are either dispatched to `save_transaction_event` or stored directly in the
     consumer depending on the mode.
+
+    In no-celery mode, `save_processes` moves saving into a separate step with its own pool and
+    batching, so that decoding and saving can be scaled independently. Both steps keep messages in
+    order, so offsets are still committed in order for each partition.
     """
 
     def __init__(
@@ -178,6 +183,9 @@ class IngestTransactionsStrategyFactory(ProcessingStrategyFactory[KafkaPayload])
         input_block_size: int | None,
         output_block_size: int | None,
         no_celery_mode: bool = False,
+        save_processes: int = 0,
+        save_max_batch_size: int | None = None,
+        save_max_batch_time: int | None = None,
     ):
         self.consumer_type = ConsumerType.Transactions
         self.reprocess_only_stuck_events = reprocess_only_stuck_events
@@ -194,6 +202,18 @@ class IngestTransactionsStrategyFactory(ProcessingStrategyFactory[KafkaPayload])
         self.health_checker = HealthChecker("ingest-transactions")
         self.no_celery_mode = no_celery_mode
 
+        self._save_pool: MultiprocessingPool | None = None
+        self.save_multi_process: MultiProcessConfig | None = None
+        if no_celery_mode and save_processes > 0:
+            self._save_pool = MultiprocessingPool(save_processes)
+            self.save_multi_process = MultiProcessConfig(
+                save_processes,
+                save_max_batch_size or max_batch_size,
+                save_max_batch_time or max_batch_time,
+                input_block_size,
+                output_block_size,
+            )
+
     def create_with_partitions(
         self,
         commit: Commit,
@@ -203,6 +223,26 @@ class IngestTransactionsStrategyFactory(ProcessingStrategyFactory[KafkaPayload])
 
         final_step = CommitOffsets(commit)
 
+        if self.save_multi_process is not None:
+            save_step = maybe_multiprocess_step(
+                self.save_multi_process,
+                process_deferred_transaction_message,
+                final_step,
+                self._save_pool,
+            )
+            # Messages which didn't result in anything to save (duplicates, load shedding, ...)
+            # only need their offsets committed
+            filter_step = FilterStep(function=_has_payload, next_step=save_step)
+            event_function = partial(
+                process_simple_event_message,
+                consumer_type=self.consumer_type,
+                reprocess_only_stuck_events=self.reprocess_only_stuck_events,
+                no_celery_mode=self.no_celery_mode,
+                defer_save=True,
+            )
+            next_step = maybe_multiprocess_step(mp, event_function, filter_step, self._pool)
+            return create_backpressure_step(health_checker=self.health_checker, next_step=next_step)
+
         event_function = partial(
             process_simple_event_message,
             consumer_type=self.consumer_type,
@@ -214,3 +254,9 @@ class IngestTransactionsStrategyFactory(ProcessingStrategyFactory[KafkaPayload])
 
     def shutdown(self) -> None:
         self._pool.close()
+        if self._save_pool:
+            self._save_pool.close()
+
+
+def _has_payload(message: Message[DeferredTransactionSave | None]) -> bool:
+    return message.payload is not None
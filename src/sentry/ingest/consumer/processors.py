@@ -2,7 +2,7 @@ import functools
 import logging
 import os
 from collections.abc import Mapping, MutableMapping
-from typing import Any
+from typing import Any, NamedTuple
 
 import orjson
 import sentry_sdk
@@ -10,7 +10,7 @@ from django.conf import settings
 from django.core.cache import cache
 from usageaccountant import UsageUnit
 
-from sentry import eventstore, features
+from sentry import eventstore, features, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import EventManager, save_attachment
 from sentry.eventstore.processing import event_processing_store, transaction_processing_store
@@ -40,6 +40,20 @@ class Retriable(Exception):
     pass
 
 
+class DeferredTransactionSave(NamedTuple):
+    """
+    A transaction which `process_event` has accepted but not saved yet, because saving happens in
+    a separate step of the consumer. See `save_deferred_transaction`.
+    """
+
+    data: MutableMapping[str, Any]
+    project: Project
+    attachments: Any
+    start_time: float
+    deduplication_key: str
+    remote_addr: str | None
+
+
 def trace_func(**span_kwargs):
     def wrapper(f):
         @functools.wraps(f)
@@ -97,9 +111,13 @@ def process_event(
     project: Project,
     reprocess_only_stuck_events: bool = False,
     no_celery_mode: bool = False,
-) -> None:
+    defer_save: bool = False,
+) -> DeferredTransactionSave | None:
     """
     Perform some initial filtering and deserialize the message payload.
+
+    With `defer_save`, transactions in `no_celery_mode` aren't saved here but returned, to be
+    passed to `save_deferred_transaction`.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -197,10 +215,20 @@ def process_event(
 
         # The no_celery_mode version of the transactions consumer skips one trip to rc-processing
         # Otherwise, we have to store the event in processing store here for the save_event task to
-        # fetch later
+        # fetch later. Error events which are small enough to be passed inline are only stored by
+        # `preprocess_event` if they turn out to need processing.
+        data_is_stored = False
         if no_celery_mode:
             cache_key = None
+        elif (
+            data.get("type") not in ("transaction", "feedback")
+            and not reprocess_only_stuck_events
+            and options.get("store.inline-payload.max-bytes") > 0
+        ):
+            cache_key = cache_key_for_event(data)
+            save_attachments(attachments, cache_key)
         else:
+            data_is_stored = True
             with metrics.timer("ingest_consumer._store_event"):
                 cache_key = processing_store.store(data)
             if consumer_type == ConsumerType.Transactions:
@@ -227,7 +255,16 @@ def process_event(
             pass
 
         if data.get("type") == "transaction":
-            if no_celery_mode:
+            if no_celery_mode and defer_save:
+                return DeferredTransactionSave(
+                    data=data,
+                    project=project,
+                    attachments=attachments,
+                    start_time=start_time,
+                    deduplication_key=deduplication_key,
+                    remote_addr=remote_addr,
+                )
+            elif no_celery_mode:
                 with sentry_sdk.start_span(op="ingest_consumer.process_transaction_no_celery"):
                     sentry_sdk.set_tag("no_celery_mode", True)
 
@@ -271,22 +308,59 @@ def process_event(
                     event_id=event_id,
                     project=project,
                     has_attachments=bool(attachments),
+                    data_is_stored=data_is_stored,
                 )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        with sentry_sdk.start_span(op="cache.set"):
-            cache.set(deduplication_key, "", CACHE_TIMEOUT)
-
-        # emit event_accepted once everything is done
-        with sentry_sdk.start_span(op="event_accepted.send_robust"):
-            event_accepted.send_robust(
-                ip=remote_addr, data=data, project=project, sender=process_event
-            )
+        _mark_event_accepted(deduplication_key, remote_addr, data, project)
     except Exception as exc:
         if isinstance(exc, KeyError):  # ex: missing event_id in message["payload"]
             raise
         raise Retriable(exc)
 
+    return None
+
+
+@trace_func(name="ingest_consumer.save_deferred_transaction")
+@metrics.wraps("ingest_consumer.save_deferred_transaction")
+def save_deferred_transaction(deferred: DeferredTransactionSave) -> None:
+    """
+    Save a transaction returned by `process_event` with `defer_save`, and finish up what
+    `process_event` would have done after saving it.
+    """
+    try:
+        with sentry_sdk.start_span(op="ingest_consumer.process_transaction_no_celery"):
+            sentry_sdk.set_tag("no_celery_mode", True)
+
+            process_transaction_no_celery(
+                deferred.data, deferred.project.id, deferred.attachments, deferred.start_time
+            )
+
+        try:
+            collect_span_metrics(deferred.project, deferred.data)
+        except Exception:
+            pass
+
+        _mark_event_accepted(
+            deferred.deduplication_key, deferred.remote_addr, deferred.data, deferred.project
+        )
+    except Exception as exc:
+        raise Retriable(exc)
+
+
+def _mark_event_accepted(
+    deduplication_key: str,
+    remote_addr: str | None,
+    data: Mapping[str, Any],
+    project: Project,
+) -> None:
+    # remember for an 1 hour that we saved this event (deduplication protection)
+    with sentry_sdk.start_span(op="cache.set"):
+        cache.set(deduplication_key, "", CACHE_TIMEOUT)
+
+    # emit event_accepted once everything is done
+    with sentry_sdk.start_span(op="event_accepted.send_robust"):
+        event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
+
 
 def save_attachments(attachments: Any, cache_key: str) -> None:
     if attachments:
@@ -8,7 +8,13 @@ from arroyo.types import BrokerValue, Message
 from sentry.models.project import Project
 from sentry.utils import metrics
 
-from .processors import IngestMessage, Retriable, process_event
+from .processors import (
+    DeferredTransactionSave,
+    IngestMessage,
+    Retriable,
+    process_event,
+    save_deferred_transaction,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +24,8 @@ def process_simple_event_message(
     consumer_type: str,
     reprocess_only_stuck_events: bool,
     no_celery_mode: bool = False,
-) -> None:
+    defer_save: bool = False,
+) -> DeferredTransactionSave | None:
     """
     Processes a single Kafka Message containing a "simple" Event payload.
 
@@ -32,7 +39,8 @@ def process_simple_event_message(
       `preprocess_event`, which will schedule a followup task such as
       `symbolicate_event` or `process_event`.
 
-    No celery mode only applies to the transactions consumer.
+    No celery mode only applies to the transactions consumer. With `defer_save`, transactions are
+    returned instead of saved, see `process_deferred_transaction_message`.
     """
 
     raw_payload = raw_message.payload.value
@@ -56,7 +64,7 @@ def process_simple_event_message(
             with metrics.timer("ingest_consumer.fetch_project"):
                 project = Project.objects.get_from_cache(id=project_id)
         except Project.DoesNotExist:
-            return
+            return None
 
         return process_event(
             consumer_type,
@@ -64,6 +72,7 @@ def process_simple_event_message(
             project,
             reprocess_only_stuck_events,
             no_celery_mode,
+            defer_save,
         )
 
     except Exception as exc:
@@ -74,3 +83,10 @@ def process_simple_event_message(
         raw_value = raw_message.value
         assert isinstance(raw_value, BrokerValue)
         raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+
+
+def process_deferred_transaction_message(message: Message[DeferredTransactionSave]) -> None:
+    """
+    Save a transaction returned by `process_simple_event_message` with `defer_save`.
+    """
+    save_deferred_transaction(message.payload)
@@ -27,6 +27,9 @@ MAX_SET_SIZE = 4000
 #: Remove the set if it has not received any updates for 24 hours.
 SET_TTL = 24 * 60 * 60
 
+#: Retention of the serialized clusterer tree of a project.
+TREE_TTL = 30 * 24 * 60 * 60
+
 
 # TODO(iker): accept multiple values to add to the set. Right now, multiple
 # calls for each individual value are required, producing too many Redis calls.
@@ -39,6 +42,11 @@ def _get_redis_key(namespace: ClustererNamespace, project: Project) -> str:
     return f"{prefix}:o:{project.organization_id}:p:{project.id}"
 
 
+def _get_tree_key(namespace: ClustererNamespace, project: Project) -> str:
+    prefix = namespace.value.data
+    return f"{prefix}:tree:o:{project.organization_id}:p:{project.id}"
+
+
 def _get_projects_key(namespace: ClustererNamespace) -> str:
     """The key for the meta-set of projects"""
     prefix = namespace.value.data
@@ -100,6 +108,22 @@ def clear_samples(namespace: ClustererNamespace, project: Project) -> None:
     client.unlink(redis_key)
 
 
+def get_tree(namespace: ClustererNamespace, project: Project) -> str | None:
+    """Return the serialized clusterer tree stored for the given project"""
+    client = get_redis_client()
+    return client.get(_get_tree_key(namespace, project))
+
+
+def store_tree(namespace: ClustererNamespace, project: Project, tree: str) -> None:
+    client = get_redis_client()
+    client.set(_get_tree_key(namespace, project), tree, ex=TREE_TTL)
+
+
+def clear_tree(namespace: ClustererNamespace, project: Project) -> None:
+    client = get_redis_client()
+    client.unlink(_get_tree_key(namespace, project))
+
+
 def record_transaction_name(project: Project, event_data: Mapping[str, Any], **kwargs: Any) -> None:
     if transaction_name := _should_store_transaction_name(event_data):
         safe_execute(
@@ -5,11 +5,13 @@ from typing import Any
 
 import sentry_sdk
 
+from sentry import options
 from sentry.models.project import Project
 from sentry.tasks.base import instrumented_task
 from sentry.utils import metrics
 
 from . import ClustererNamespace, rules
+from .base import ReplacementRule
 from .datasource import redis
 from .meta import track_clusterer_run
 from .tree import TreeClusterer
@@ -28,6 +30,10 @@ MERGE_THRESHOLD = 200
 #: very low-cardinality or very high-cardinality, so we can use a more aggressive threshold.
 MERGE_THRESHOLD_SPANS = 50
 
+#: Maximum number of nodes in a clusterer tree which is kept between runs. Merging
+#: keeps the tree small, bigger trees are dropped rather than growing without bounds.
+MAX_TREE_NODES = 100_000
+
 #: Number of projects to process in one celery task
 #: The number 100 was chosen at random and might still need tweaking.
 PROJECTS_PER_TASK = 100
@@ -73,7 +79,9 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                 span.set_data("project_id", project.id)
                 tx_names = list(redis.get_transaction_names(project))
                 new_rules = []
-                if len(tx_names) >= MERGE_THRESHOLD:
+                if options.get("txnames.incremental-tree.enable"):
+                    new_rules = _cluster_incrementally(project, tx_names)
+                elif len(tx_names) >= MERGE_THRESHOLD:
                     clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
                     clusterer.add_input(tx_names)
                     new_rules = clusterer.get_rules()
@@ -118,3 +126,25 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                     "projects.unclustered.ids": [p.id for p in pending],
                 },
             )
+
+
+def _cluster_incrementally(project: Project, tx_names: Sequence[str]) -> list[ReplacementRule]:
+    """Add the transaction names to the tree kept from previous runs, and get
+    the rules for the parts of the tree they changed."""
+    tree = redis.get_tree(ClustererNamespace.TRANSACTIONS, project)
+    if tree is None:
+        clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
+    else:
+        clusterer = TreeClusterer.loads(tree, merge_threshold=MERGE_THRESHOLD)
+
+    clusterer.add_input(tx_names)
+    new_rules = clusterer.get_rules()
+
+    num_nodes = len(clusterer)
+    metrics.distribution("txcluster.tree_size", num_nodes)
+    if num_nodes > MAX_TREE_NODES:
+        redis.clear_tree(ClustererNamespace.TRANSACTIONS, project)
+    else:
+        redis.store_tree(ClustererNamespace.TRANSACTIONS, project, clusterer.dumps())
+
+    return new_rules
@@ -43,13 +43,18 @@ Resulting in the following replacement rules:
 
 The replacement rules are interpreted by Relay to match and replace `*`, and to match but ignore `**`.
 
+The tree can be serialized and picked up again by a later run. Transaction names added to a tree
+which has already been merged end up in the merged nodes they match, and only the subtrees which
+received new transaction names are merged again and produce rules.
+
 """
 
 import logging
-from collections import UserDict, defaultdict
-from collections.abc import Iterable
-from typing import TypeAlias, Union
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any, TypeAlias, Union
 
+import orjson
 import sentry_sdk
 
 from .base import Clusterer, ReplacementRule
@@ -77,20 +82,17 @@ logger = logging.getLogger(__name__)
 
 
 class TreeClusterer(Clusterer):
-    def __init__(self, *, merge_threshold: int) -> None:
+    def __init__(self, *, merge_threshold: int, tree: Union["Node", None] = None) -> None:
         self._merge_threshold = merge_threshold
-        self._tree = Node()
+        self._tree = Node() if tree is None else tree
         self._rules: list[ReplacementRule] | None = None
 
     def add_input(self, strings: Iterable[str]) -> None:
         for string in strings:
-            parts = string.split(SEP, maxsplit=MAX_DEPTH)
-            node = self._tree
-            for part in parts:
-                node = node.setdefault(part, Node())
+            self._tree.insert(string.split(SEP, maxsplit=MAX_DEPTH))
 
     def get_rules(self) -> list[ReplacementRule]:
-        """Computes the rules for the current tree."""
+        """Computes the rules for the transaction names added since the last call."""
         self._extract_rules()
         self._clean_rules()
         self._sort_rules()
@@ -98,15 +100,29 @@ class TreeClusterer(Clusterer):
         assert self._rules is not None  # Keep mypy happy
         return self._rules
 
+    def __len__(self) -> int:
+        """The number of nodes in the tree"""
+        return sum(1 for _ in self._tree.paths())
+
+    def dumps(self) -> str:
+        """Serialize the tree, so it can be picked up by a later run with `loads`."""
+        return self._tree.dumps()
+
+    @classmethod
+    def loads(cls, data: str, *, merge_threshold: int) -> "TreeClusterer":
+        return cls(merge_threshold=merge_threshold, tree=Node.loads(data))
+
     def _extract_rules(self) -> None:
         """Merge high-cardinality nodes in the graph and extract rules"""
         with sentry_sdk.start_span(op="cluster_merge"):
             self._tree.merge(self._merge_threshold)
 
         # Generate exactly 1 rule for every merge
-        rule_paths = [path for path in self._tree.paths() if path[-1] is MERGED]
+        rule_paths = [path for path in self._tree.paths(dirty=True) if path[-1] is MERGED]
         self._rules = [self._build_rule(path) for path in rule_paths]
 
+        self._tree.mark_clean()
+
     def _clean_rules(self) -> None:
         """Deletes the rules that are not valid."""
         if not self._rules:
@@ -127,39 +143,127 @@ class TreeClusterer(Clusterer):
 
 
 #: Represents the edges between graph nodes. These edges serve as keys in the
-#: node dictionary.
+#: children of a node.
 Edge: TypeAlias = Union[str, Merged]
 
 
-class Node(UserDict):
-    """Keys in this dict are names of the children"""
-
-    def paths(self, ancestors: list[Edge] | None = None) -> Iterable[list[Edge]]:
-        """Collect all paths and subpaths through the graph"""
-        if ancestors is None:
-            ancestors = []
-        for name, child in self.items():
-            path = ancestors + [name]
-            yield path
-            yield from child.paths(ancestors=path)
+class Node:
+    """A node of the tree, with its children by name.
+
+    Nodes are dirty when transaction names were added below them since the tree
+    was last merged. Merging skips the other nodes, their children have been
+    merged already.
+    """
+
+    __slots__ = ("children", "dirty")
+
+    def __init__(self, dirty: bool = True) -> None:
+        self.children: dict[Edge, Node] = {}
+        self.dirty = dirty
+
+    def insert(self, parts: Iterable[str]) -> None:
+        """Add the path made of `parts` to the tree. Parts which end up in a merged
+        node are added to it, since they'd be replaced by its rule."""
+        node = self
+        node.dirty = True
+        for part in parts:
+            child = node.children.get(MERGED)
+            if child is None:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = Node()
+            child.dirty = True
+            node = child
+
+    def paths(self, dirty: bool = False) -> Iterator[list[Edge]]:
+        """Collect all paths and subpaths through the graph, in depth-first order.
+
+        With `dirty`, only the paths through dirty nodes are collected."""
+        stack: list[tuple[list[Edge], Iterator[tuple[Edge, Node]]]] = [
+            ([], iter(self.children.items()))
+        ]
+        while stack:
+            ancestors, children = stack[-1]
+            for name, child in children:
+                if dirty and not child.dirty:
+                    continue
+                path = ancestors + [name]
+                yield path
+                stack.append((path, iter(child.children.items())))
+                break
+            else:
+                stack.pop()
 
     def merge(self, merge_threshold: int) -> None:
-        """Recursively merge children of high-cardinality nodes"""
-        if len(self) >= merge_threshold:
-            merged_children = self._merge_nodes(self.values())
-            self.clear()
-            self[MERGED] = merged_children
-
-        for child in self.values():
-            child.merge(merge_threshold)
+        """Merge children of high-cardinality nodes in the dirty part of the tree"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node.dirty:
+                continue
+
+            if len(node.children) >= merge_threshold and MERGED not in node.children:
+                node.children = {MERGED: self._merge_nodes(node.children.values())}
+
+            stack.extend(node.children.values())
+
+    def mark_clean(self) -> None:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.dirty:
+                node.dirty = False
+                stack.extend(node.children.values())
 
     @classmethod
     def _merge_nodes(cls, nodes: Iterable["Node"]) -> "Node":
         children_by_name = defaultdict(list)
         for node in nodes:
-            for name, child in node.items():
+            for name, child in node.children.items():
                 children_by_name[name].append(child)
 
-        return Node(
-            {name: cls._merge_nodes(children) for name, children in children_by_name.items()}
-        )
+        merged = Node()
+        merged.children = {
+            name: cls._merge_nodes(children) for name, children in children_by_name.items()
+        }
+        return merged
+
+    def dumps(self) -> str:
+        """Serialize the tree as a flat list, in depth-first order: the number of children
+        of the node, followed by the name and the serialized subtree of each child.
+        `MERGED` is serialized as `null`."""
+        data: list[Any] = []
+        stack: list[Node | Edge] = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, Node):
+                data.append(len(item.children))
+                # Push the children in reverse, so they're popped in order
+                for name, child in reversed(item.children.items()):
+                    stack.append(child)
+                    stack.append(name)
+            else:
+                data.append(None if item is MERGED else item)
+
+        return orjson.dumps(data).decode()
+
+    @classmethod
+    def loads(cls, data: str) -> "Node":
+        """Load a tree serialized with `dumps`. Loaded nodes are clean."""
+        items = iter(orjson.loads(data))
+        root = Node(dirty=False)
+        # Every node on the stack, with the number of its children still to be read
+        stack = [(root, next(items))]
+        while stack:
+            node, remaining = stack.pop()
+            if remaining == 0:
+                continue
+            stack.append((node, remaining - 1))
+
+            name = next(items)
+            if name is None:
+                name = MERGED
+            child = node.children[name] = Node(dirty=False)
+            stack.append((child, next(items)))
+
+        return root
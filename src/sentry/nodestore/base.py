@@ -72,6 +72,8 @@ class NodeStorage(local, Service):
         "get_multi",
         "set",
         "set_bytes",
+        "set_bytes_multi",
+        "set_many",
         "set_subkeys",
         "cleanup",
         "validate",
@@ -234,6 +236,25 @@ class NodeStorage(local, Service):
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
 
+    def set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        """
+        >>> nodestore.set_bytes_multi({'key1': b"{'foo': 'bar'}", 'key2': b"{'foo': 'baz'}"})
+        """
+        for data in items.values():
+            metrics.distribution("nodestore.set_bytes", len(data))
+        return self._set_bytes_multi(items, ttl)
+
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        """
+        Write multiple nodes. Backends should override this with a batched
+        write where they can.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+        """
+        for item_id, data in items.items():
+            self._set_bytes(item_id, data, ttl)
+
     def set(self, item_id: str, data: Mapping[str, Any], ttl: timedelta | None = None) -> None:
         """
         Set value for `item_id`. Note that this deletes existing subkeys for `item_id` as
@@ -267,6 +288,31 @@ class NodeStorage(local, Service):
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
 
+    @sentry_sdk.tracing.trace
+    def set_many(
+        self,
+        items: Mapping[str, dict[str | None, Mapping[str, Any]]],
+        ttl: timedelta | None = None,
+    ) -> None:
+        """
+        Set values and subkeys for multiple items in one write. Every value is
+        in the format accepted by `set_subkeys`.
+
+        >>> nodestore.set_many({
+        ...    'key1': {None: {'foo': 'bar'}},
+        ...    'key2': {None: {'foo': 'baz'}, "unprocessed": {'foo': 'bam'}},
+        ... })
+        """
+        if not items:
+            return
+
+        cache_items = {item_id: data.get(None) for item_id, data in items.items()}
+        bytes_data = {item_id: self._encode(data) for item_id, data in items.items()}
+        self.set_bytes_multi(bytes_data, ttl=ttl)
+        # set cache only after encoding and write to nodestore has succeeded
+        if options.get("nodestore.set-subkeys.enable-set-cache-item"):
+            self._set_cache_items({item_id: data for item_id, data in cache_items.items() if data})
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
 
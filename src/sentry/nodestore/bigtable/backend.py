@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Mapping
 from datetime import timedelta
 from typing import Any
 
@@ -76,6 +77,10 @@ class BigtableNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         self.store.set(id, data, ttl)
 
+    @sentry_sdk.tracing.trace
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        self.store.set_many(items, ttl)
+
     def delete(self, id: str) -> None:
         if self.skip_deletes:
             return
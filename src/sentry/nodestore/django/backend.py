@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import math
 import pickle
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -55,6 +56,15 @@ class DjangoNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
 
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        now = timezone.now()
+        Node.objects.bulk_create(
+            [Node(id=id, data=compress(data), timestamp=now) for id, data in items.items()],
+            update_conflicts=True,
+            update_fields=["data", "timestamp"],
+            unique_fields=["id"],
+        )
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
 
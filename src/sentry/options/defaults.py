@@ -745,6 +745,23 @@ register(
     "store.nodestore-stats-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
 
+# Share of event payloads written to the processing store as zstd-compressed msgpack rather than
+# JSON. Both formats are always readable.
+register(
+    "eventstore.processing.compact-encoding",
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE | FLAG_RATE,
+)
+
+# Error events up to this size (in bytes of JSON) which need no processing are passed to
+# `save_event` inline instead of through the processing store. 0 disables this.
+register(
+    "store.inline-payload.max-bytes",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch to stop storing any reprocessing payloads.
 register("store.reprocessing-force-disable", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1129,6 +1146,19 @@ register(
 # Controls whether generic inbound filters are sent to Relay.
 register("relay.emit-generic-inbound-filters", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Number of threads computing project configs when invalidating a whole organization. 1 computes
+# them in the task's thread.
+register(
+    "relay.invalidate-organization.compute-workers",
+    type=Int,
+    default=1,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Reuse sections of project configs which are identical for many projects, see
+# `sentry.relay.config.fragments`.
+register("relay.config.fragment-cache.enable", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1292,6 +1322,23 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# How long (in seconds) the Postgres indexer remembers strings which were rate limited or couldn't
+# be resolved, instead of looking them up again. 0 disables the negative cache.
+register(
+    "sentry-metrics.indexer.negative-cache.ttl",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Use the per-process cache in front of the indexer cache. Only has an effect if
+# SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE is set.
+register(
+    "sentry-metrics.indexer.local-cache.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # An option to enable reading from the new schema for the caching indexer
 register(
     "sentry-metrics.indexer.read-new-cache-namespace",
@@ -1327,6 +1374,14 @@ register(
     "sentry-metrics.indexer.reconstruct.enable-orjson", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
 
+# Option to use the columnar representation of the strings in IndexerBatch, which also serializes
+# the output with orjson
+register(
+    "sentry-metrics.indexer.columnar-batch.rollout",
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 
 # Option to remove support for percentiles on a per-use case basis.
 # Add the use case name (e.g. "custom") to this list
@@ -1505,6 +1560,9 @@ register(
 
 # Performance issue option for *all* performance issues detection
 register("performance.issues.all.problem-detection", default=1.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Rate of events for which detectors only visit the spans they're interested in, looked up in an
+# index of the event's spans shared by all detectors
+register("performance.issues.span-index.rollout", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # Individual system-wide options in case we need to turn off specific detectors for load concerns, ignoring the set project options.
 register(
@@ -1951,6 +2009,11 @@ register("hybrid_cloud.rpc.disabled-service-methods", default=[], flags=FLAG_AUT
 
 # Decides whether an incoming transaction triggers an update of the clustering rule applied to it.
 register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Keep the tree of the transaction clusterer between runs, and add the new transaction names to it
+# instead of building it from the latest sample only.
+register(
+    "txnames.incremental-tree.enable", type=Bool, default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
 
 # === Nodestore related runtime options ===
 
@@ -2460,6 +2523,14 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Rate at which to parameterize messages using the precompiled, cached scanner instead of the
+# combined regex
+register(
+    "grouping.parameterization.use_scanner",
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE | FLAG_RATE,
+)
+
 # Rates controlling the rollout of grouping parameterization experiments
 register(
     "grouping.experiments.parameterization.uniq_id",
@@ -2560,6 +2631,28 @@ register(
     default=300,  # 5 minutes
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Store spans in the buffer as zstd-compressed batches instead of one list item per span
+register(
+    "standalone-spans.buffer-compression.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Maximum size in bytes of the (uncompressed) spans buffered for a segment, spans written past the
+# limit are dropped. 0 disables the limit.
+register(
+    "standalone-spans.buffer-max-segment-bytes",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Also drain the buckets of unprocessed segments written as lists (partition-2) before they were
+# moved to sorted sets (partition-3). Once disabled everywhere, the legacy drain in
+# `sentry.spans.buffer.redis` and this option are to be removed.
+register(
+    "standalone-spans.buffer-drain-legacy-buckets.enable",
+    default=True,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.detect-performance-issues-consumer.enable",
     default=True,
@@ -2771,12 +2864,52 @@ register(
     default=10000,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Process the delayed rules of the projects of an organization together, making the snuba queries
+# they have in common once
+register(
+    "delayed_processing.merge_organization_queries",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "celery_split_queue_task_rollout",
     default={},
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Pre-aggregate `RedisBuffer.incr` calls in process and write them out once this many keys are
+# pending, or once the oldest pending call is `max-age` seconds old. Values of 0 or 1 disable this.
+register(
+    "buffer.incr.coalesce.max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "buffer.incr.coalesce.max-age",
+    type=Float,
+    default=1.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Drain batches of `RedisBuffer` keys with a single script call per host and apply them to the
+# database with one statement per model, rather than key by key
+register(
+    "buffer.process.bulk-flush",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Reuse the hashes and variants calculated for earlier events with identical grouping inputs
+register(
+    "grouping.variants_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 register(
     "grouping.grouphash_metadata.ingestion_writes_enabled",
     type=Bool,
@@ -2784,6 +2917,23 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Reuse the span group hashes calculated for earlier spans with the same op and description
+register(
+    "spans.grouping.cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Match the frames of events against ownership schemas compiled into an index of their path rules,
+# instead of testing every rule
+register(
+    "ownership.compiled-schema.enable",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 register(
     "ecosystem:enable_integration_form_error_raise", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
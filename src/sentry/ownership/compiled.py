@@ -0,0 +1,278 @@
+"""
+Ownership schemas compiled into an index over the frames of an event.
+
+`Matcher.test` globs every frame against every rule, which is one call into Relay per rule and
+frame value. Schemas converted from CODEOWNERS files easily have thousands of path rules, while
+only a handful of them can match any given frame. A compiled schema indexes the literal path
+segments of the patterns, so that each frame value only has to be checked against the rules which
+can possibly match it. The index never decides a match by itself: every candidate is still checked
+with the same glob function `Matcher.test` uses, so both always agree.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+import orjson
+from cachetools import LRUCache
+
+from sentry.ownership.grammar import CODEOWNERS, PATH, Rule, load_schema
+from sentry.utils import metrics
+from sentry.utils.codeowners import codeowners_match
+from sentry.utils.glob import glob_match
+
+COMPILED_SCHEMA_CACHE_SIZE = 1000
+
+# A path segment containing any of these is not matched literally
+PATTERN_SPECIAL_CHARS = frozenset("*?[]{}!\\")
+
+FrameValueMatcher = Callable[[Any, str], bool]
+
+
+def _match_path(value: Any, pattern: str) -> bool:
+    return bool(glob_match(value, pattern, ignorecase=True, path_normalize=True))
+
+
+def _match_codeowners(value: Any, pattern: str) -> bool:
+    return bool(codeowners_match(value, pattern))
+
+
+def _is_literal(segment: str) -> bool:
+    return bool(segment) and PATTERN_SPECIAL_CHARS.isdisjoint(segment)
+
+
+def _literal_tail(segment: str) -> str:
+    """The literal end of a pattern segment, e.g. `.py` for `test_*.py`"""
+    for i in range(len(segment) - 1, -1, -1):
+        if segment[i] in PATTERN_SPECIAL_CHARS:
+            return segment[i + 1 :]
+    return segment
+
+
+class _TrieNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.positions: list[int] = []
+
+
+class FrameIndex:
+    """
+    The frame rules of one matcher type, indexed by what a frame value needs to contain for the
+    pattern to match it:
+
+    - Path patterns are anchored at the start, so the literal segments they start with
+      (`src/sentry/*`) have to be the first segments of the value. Those are kept in a trie, which
+      yields all such rules in one walk over the segments of the value.
+    - Otherwise, a literal segment of the pattern (`*/sentry/*`, `sentry/`) has to be a segment of
+      the value.
+    - Otherwise, the literal end of the last segment of the pattern (`*.py`), or a literal segment
+      following `**/`, has to end a segment of the value.
+
+    Rules which fit none of these, or whose matching can't be reproduced safely (case folding of
+    non-ASCII characters, escapes), are candidates for every value.
+    """
+
+    def __init__(self, matcher_type: str) -> None:
+        self.matcher_type = matcher_type
+        # Issue owner paths are matched case insensitive and with normalized separators, while
+        # CODEOWNERS paths are matched as they are
+        self.normalize = matcher_type == PATH
+        self.match: FrameValueMatcher = _match_path if self.normalize else _match_codeowners
+
+        self.patterns: dict[int, str] = {}
+        self.prefixes = _TrieNode()
+        self.segments: defaultdict[str, list[int]] = defaultdict(list)
+        self.tails: defaultdict[str, list[int]] = defaultdict(list)
+        self.tail_lengths: set[int] = set()
+        self.unindexed: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def add(self, position: int, pattern: str) -> None:
+        self.patterns[position] = pattern
+
+        if "\\" in pattern or (self.normalize and not pattern.isascii()):
+            self.unindexed.append(position)
+            return
+
+        segments = (pattern.lower() if self.normalize else pattern).split("/")
+
+        if self.normalize:
+            node = self.prefixes
+            for segment in segments:
+                # The leading "" of an absolute path is a literal segment as well
+                if segment != "" and not _is_literal(segment):
+                    break
+                node = node.children.setdefault(segment, _TrieNode())
+            if node is not self.prefixes:
+                node.positions.append(position)
+                return
+
+        tail = _literal_tail(segments[-1])
+        for i in range(len(segments) - 1, -1, -1):
+            if not _is_literal(segments[i]):
+                continue
+            # `**/` also matches the start of a segment in CODEOWNERS, so a literal segment following
+            # it only has to end a segment of the value
+            if i > 0 and segments[i - 1] == "**":
+                tail = tail or segments[i]
+                continue
+            self.segments[segments[i]].append(position)
+            return
+
+        if tail:
+            self.tails[tail].append(position)
+            self.tail_lengths.add(len(tail))
+            return
+
+        self.unindexed.append(position)
+
+    def candidates(self, value: Any) -> Iterable[int]:
+        """The positions of the rules which can match the frame value"""
+        if not isinstance(value, str) or (self.normalize and not value.isascii()):
+            return self.patterns.keys()
+
+        if self.normalize:
+            value = value.replace("\\", "/").lower()
+        segments = value.split("/")
+
+        candidates = list(self.unindexed)
+
+        node = self.prefixes
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+            candidates.extend(node.positions)
+
+        for segment in segments:
+            positions = self.segments.get(segment)
+            if positions:
+                candidates.extend(positions)
+
+            for length in self.tail_lengths:
+                if length <= len(segment):
+                    positions = self.tails.get(segment[-length:])
+                    if positions:
+                        candidates.extend(positions)
+
+        return candidates
+
+    def test(self, values: Iterable[Any], matched: set[int]) -> None:
+        """Add the positions of the rules matching any of the frame values to `matched`"""
+        for value in values:
+            for position in self.candidates(value):
+                if position not in matched and self.match(value, self.patterns[position]):
+                    matched.add(position)
+
+
+class CompiledSchema:
+    """
+    The rules of an ownership schema, with the `path` and `codeowners` rules indexed by
+    `FrameIndex`. Rules of other types are tested with `Rule.test`.
+
+    Compiled schemas are shared between events and must be treated as read-only.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        self.path_index = FrameIndex(PATH)
+        self.codeowners_index = FrameIndex(CODEOWNERS)
+        self.other_positions: list[int] = []
+
+        for position, rule in enumerate(rules):
+            if rule.matcher.type == PATH:
+                self.path_index.add(position, rule.matcher.pattern)
+            elif rule.matcher.type == CODEOWNERS:
+                self.codeowners_index.add(position, rule.matcher.pattern)
+            else:
+                self.other_positions.append(position)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def matching_rules(
+        self,
+        data: Mapping[str, Any],
+        munged_data: tuple[Sequence[Mapping[str, Any]], Sequence[str]],
+    ) -> list[Rule]:
+        """
+        The rules which match the event, in schema order. Equivalent to
+        `[rule for rule in rules if rule.test(data, munged_data)]`.
+        """
+        frames, keys = munged_data
+
+        # Frames of the same event mostly share their file names, every distinct value is checked
+        # once. Values are collected in a dict to keep their order.
+        path_values: dict[Any, None] = {}
+        codeowners_values: dict[Any, None] = {}
+        other_values: list[tuple[Any, bool]] = []
+        for frame in frames:
+            # CODEOWNERS rules only apply to in-app frames, see `Matcher.test`
+            in_app = frame.get("in_app") is not False
+            for key in keys:
+                value = frame.get(key)
+                if not value:
+                    continue
+                if not isinstance(value, str):
+                    other_values.append((value, in_app))
+                    continue
+                path_values[value] = None
+                if in_app:
+                    codeowners_values[value] = None
+
+        matched: set[int] = set()
+        if self.path_index:
+            self.path_index.test(path_values, matched)
+            self.path_index.test((value for value, _ in other_values), matched)
+        if self.codeowners_index:
+            self.codeowners_index.test(codeowners_values, matched)
+            self.codeowners_index.test((value for value, in_app in other_values if in_app), matched)
+
+        for position in self.other_positions:
+            if self.rules[position].test(data, munged_data):
+                matched.add(position)
+
+        return [self.rules[position] for position in sorted(matched)]
+
+
+# Per-process cache. Ownership objects are read from the cache on every call to
+# `ProjectOwnership.get_ownership_cached`, so compiled schemas are keyed by the content of the
+# schema rather than the object.
+_compiled_schema_cache: LRUCache[str, CompiledSchema] = LRUCache(maxsize=COMPILED_SCHEMA_CACHE_SIZE)
+_compiled_schema_cache_lock = threading.Lock()
+
+
+def get_compiled_schema(schema: Mapping[str, Any]) -> CompiledSchema:
+    """
+    Compile the rules of an ownership schema, or reuse the result of a previous call with an equal
+    schema.
+    """
+    key = hashlib.md5(orjson.dumps(schema)).hexdigest()
+    with _compiled_schema_cache_lock:
+        compiled = _compiled_schema_cache.get(key)
+
+    if compiled is not None:
+        metrics.incr("projectownership.compiled_schema_cache", tags={"result": "hit"})
+        return compiled
+
+    metrics.incr("projectownership.compiled_schema_cache", tags={"result": "miss"})
+    compiled = CompiledSchema(load_schema(schema))
+
+    with _compiled_schema_cache_lock:
+        _compiled_schema_cache[key] = compiled
+
+    return compiled
+
+
+def clear_compiled_schema_cache() -> None:
+    with _compiled_schema_cache_lock:
+        _compiled_schema_cache.clear()
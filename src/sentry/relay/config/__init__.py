@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import uuid
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Generator, Iterable, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Any, Literal, NotRequired, TypedDict
+from typing import Any, Literal, NamedTuple, NotRequired, TypedDict
 
 import sentry_sdk
 from sentry_sdk import capture_exception
@@ -33,6 +35,7 @@ from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey
 from sentry.relay.config.experimental import TimeChecker, add_experimental_config
+from sentry.relay.config.fragments import get_fragment, timed_section
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -71,6 +74,14 @@ EXPOSABLE_FEATURES = [
     "projects:relay-otel-endpoint",
 ]
 
+# Organization features checked while building a project config, other than the exposed ones
+ORGANIZATION_FEATURES = [
+    "organizations:dynamic-sampling",
+    "organizations:performance-calculate-mobile-perf-score-relay",
+    "organizations:transaction-metrics-extraction",
+    "organizations:transaction-name-normalize",
+]
+
 EXTRACT_METRICS_VERSION = 1
 EXTRACT_ABNORMAL_MECHANISM_VERSION = 2
 
@@ -81,11 +92,78 @@ MIN_CLUSTERER_RUNS = 10
 logger = logging.getLogger(__name__)
 
 
+class _OrganizationInputs(NamedTuple):
+    organization_id: int
+    features: Mapping[str, bool]
+    event_retention: int | None
+
+
+_organization_inputs: ContextVar[_OrganizationInputs | None] = ContextVar(
+    "relay_config_organization_inputs", default=None
+)
+
+
+@contextmanager
+def prefetch_organization_inputs(organization: Organization) -> Generator[None, None, None]:
+    """
+    Fetch the organization-level inputs of project configs once and reuse them for all projects
+    of the organization whose configs are built within the context.
+
+    Use this when building the configs of many projects of one organization at once. Threads
+    building configs need to run in a copy of the current context to see the prefetched values.
+    """
+    feature_names = [
+        *(feature for feature in EXPOSABLE_FEATURES if feature.startswith("organizations:")),
+        *ORGANIZATION_FEATURES,
+    ]
+    with sentry_sdk.start_span(op="prefetch_organization_features"):
+        batch_features = features.batch_has(feature_names, organization=organization) or {}
+
+    organization_features = batch_features.get(f"organization:{organization.id}") or {}
+    token = _organization_inputs.set(
+        _OrganizationInputs(
+            organization_id=organization.id,
+            # Features the handlers couldn't decide on in batch are checked one by one
+            features={
+                name: enabled
+                for name, enabled in organization_features.items()
+                if enabled is not None
+            },
+            event_retention=quotas.backend.get_event_retention(organization),
+        )
+    )
+    try:
+        yield
+    finally:
+        _organization_inputs.reset(token)
+
+
+def _get_organization_inputs(organization: Organization) -> _OrganizationInputs | None:
+    inputs = _organization_inputs.get()
+    if inputs is not None and inputs.organization_id == organization.id:
+        return inputs
+    return None
+
+
+def _has_organization_feature(feature: str, organization: Organization) -> bool:
+    inputs = _get_organization_inputs(organization)
+    if inputs is not None and feature in inputs.features:
+        return inputs.features[feature]
+    return features.has(feature, organization)
+
+
+def _get_event_retention(organization: Organization) -> int | None:
+    inputs = _get_organization_inputs(organization)
+    if inputs is not None:
+        return inputs.event_retention
+    return quotas.backend.get_event_retention(organization)
+
+
 def get_exposed_features(project: Project) -> Sequence[str]:
     active_features = []
     for feature in EXPOSABLE_FEATURES:
         if feature.startswith("organizations:"):
-            has_feature = features.has(feature, project.organization)
+            has_feature = _has_organization_feature(feature, project.organization)
         elif feature.startswith("projects:"):
             has_feature = features.has(feature, project)
         else:
@@ -309,7 +387,7 @@ def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mappi
         # This killswitch will cause extra load, and should only be used for AM1->AM2 migration.
         return None
 
-    if features.has("organizations:dynamic-sampling", project.organization):
+    if _has_organization_feature("organizations:dynamic-sampling", project.organization):
         return {"version": 2, "rules": generate_rules(project)}
 
     return None
@@ -333,7 +411,9 @@ class TransactionNameRule(TypedDict):
 def get_transaction_names_config(
     timeout: TimeChecker, project: Project
 ) -> Sequence[TransactionNameRule] | None:
-    if not features.has("organizations:transaction-name-normalize", project.organization):
+    if not _has_organization_feature(
+        "organizations:transaction-name-normalize", project.organization
+    ):
         return None
 
     cluster_rules = get_sorted_rules(ClustererNamespace.TRANSACTIONS, project)
@@ -341,7 +421,11 @@ def get_transaction_names_config(
     if not cluster_rules:
         return None
 
-    return [_get_tx_name_rule(p, s) for p, s in cluster_rules]
+    return get_fragment(
+        "txNameRules",
+        tuple(cluster_rules),
+        lambda: [_get_tx_name_rule(p, s) for p, s in cluster_rules],
+    )
 
 
 def _get_tx_name_rule(pattern: str, seen_last: int) -> TransactionNameRule:
@@ -955,7 +1039,7 @@ def _get_default_browser_performance_profiles(
 def _get_mobile_performance_profiles(
     organization: Organization,
 ) -> list[dict[str, Any]]:
-    if not features.has(
+    if not _has_organization_feature(
         "organizations:performance-calculate-mobile-perf-score-relay", organization
     ):
         return []
@@ -1019,6 +1103,23 @@ def _get_mobile_performance_profiles(
     ]
 
 
+def get_performance_score_profiles(organization: Organization) -> list[dict[str, Any]]:
+    # All profiles are static, apart from the mobile ones being behind a feature
+    has_mobile_profiles = _has_organization_feature(
+        "organizations:performance-calculate-mobile-perf-score-relay", organization
+    )
+    return get_fragment(
+        "performanceScore",
+        (has_mobile_profiles,),
+        lambda: [
+            *_get_desktop_browser_performance_profiles(organization),
+            *_get_mobile_browser_performance_profiles(organization),
+            *_get_mobile_performance_profiles(organization),
+            *_get_default_browser_performance_profiles(organization),
+        ],
+    )
+
+
 def _get_project_config(
     project: Project, project_keys: Iterable[ProjectKey] | None = None
 ) -> ProjectConfig:
@@ -1027,7 +1128,7 @@ def _get_project_config(
 
     public_keys = get_public_key_configs(project_keys=project_keys)
 
-    with sentry_sdk.start_span(op="get_public_config"):
+    with timed_section("get_public_config"):
         now = datetime.now(timezone.utc)
         cfg = {
             "disabled": False,
@@ -1052,48 +1153,57 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    with sentry_sdk.start_span(op="get_exposed_features"):
+    with timed_section("get_exposed_features"):
         if exposed_features := get_exposed_features(project):
             config["features"] = exposed_features
 
     # NOTE: Omitting dynamicSampling because of a failure increases the number
     # of events forwarded by Relay, because dynamic sampling will stop filtering
     # anything.
-    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
+    with timed_section("get_dynamic_sampling_config"):
+        add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
 
     # Rules to replace high cardinality transaction names
-    add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
-
-    # Mark the project as ready if it has seen >= 10 clusterer runs.
-    # This prevents projects from prematurely marking all URL transactions as sanitized.
-    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
-        config["txNameReady"] = True
+    with timed_section("get_transaction_names_config"):
+        add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
+
+        # Mark the project as ready if it has seen >= 10 clusterer runs.
+        # This prevents projects from prematurely marking all URL transactions as sanitized.
+        if (
+            get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"]
+            >= MIN_CLUSTERER_RUNS
+        ):
+            config["txNameReady"] = True
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
-    add_experimental_config(config, "metrics", get_metrics_config, project)
+    with timed_section("get_metrics_config"):
+        add_experimental_config(config, "metrics", get_metrics_config, project)
 
     if _should_extract_transaction_metrics(project):
-        add_experimental_config(
-            config,
-            "transactionMetrics",
-            get_transaction_metrics_settings,
-            project,
-            config.get("breakdownsV2"),
-        )
+        with timed_section("get_transaction_metrics_settings"):
+            add_experimental_config(
+                config,
+                "transactionMetrics",
+                get_transaction_metrics_settings,
+                project,
+                config.get("breakdownsV2"),
+            )
 
         # This config key is technically not specific to _transaction_ metrics,
         # is however currently both only applied to transaction metrics in
         # Relay, and only used to tag transaction metrics in Sentry.
-        add_experimental_config(
-            config,
-            "metricConditionalTagging",
-            get_metric_conditional_tagging_rules,
-            project,
-        )
+        with timed_section("get_metric_conditional_tagging_rules"):
+            add_experimental_config(
+                config,
+                "metricConditionalTagging",
+                get_metric_conditional_tagging_rules,
+                project,
+            )
 
-        if metric_extraction := get_metric_extraction_config(project):
-            config["metricExtraction"] = metric_extraction
+        with timed_section("get_metric_extraction_config"):
+            if metric_extraction := get_metric_extraction_config(project):
+                config["metricExtraction"] = metric_extraction
 
     config["sessionMetrics"] = {
         "version": (
@@ -1103,27 +1213,22 @@ def _get_project_config(
         ),
     }
 
-    performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
-        *_get_mobile_performance_profiles(project.organization),
-        *_get_default_browser_performance_profiles(project.organization),
-    ]
-    if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
+    with timed_section("get_performance_score_profiles"):
+        if performance_score_profiles := get_performance_score_profiles(project.organization):
+            config["performanceScore"] = {"profiles": performance_score_profiles}
 
-    with sentry_sdk.start_span(op="get_filter_settings"):
+    with timed_section("get_filter_settings"):
         if filter_settings := get_filter_settings(project):
             config["filterSettings"] = filter_settings
-    with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
+    with timed_section("get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
-    with sentry_sdk.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
+    with timed_section("get_event_retention"):
+        event_retention = _get_event_retention(project.organization)
         if event_retention is not None:
             config["eventRetention"] = event_retention
-    with sentry_sdk.start_span(op="get_all_quotas"):
+    with timed_section("get_all_quotas"):
         if quotas_config := get_quotas(project, keys=project_keys):
             config["quotas"] = quotas_config
 
@@ -1312,7 +1417,7 @@ class TransactionMetricsSettings(TypedDict):
 
 
 def _should_extract_transaction_metrics(project: Project) -> bool:
-    return features.has(
+    return _has_organization_feature(
         "organizations:transaction-metrics-extraction", project.organization
     ) and not killswitches.killswitch_matches_context(
         "relay.drop-transaction-metrics", {"project_id": project.id}
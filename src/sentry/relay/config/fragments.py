@@ -0,0 +1,72 @@
+"""
+Sections of project configs which only depend on a few inputs, like an organization feature or the
+transaction name rules of a project, and are identical for many projects. Building them once and
+reusing the result while their inputs don't change takes the cost out of building every config.
+"""
+
+import threading
+from collections.abc import Callable, Generator, Hashable
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+import sentry_sdk
+from cachetools import TTLCache
+
+from sentry import options
+from sentry.utils import metrics
+
+FRAGMENT_CACHE_SIZE = 1000
+FRAGMENT_CACHE_TTL = 300
+
+T = TypeVar("T")
+
+# Per-process cache. Fragments are shared between all configs which use them, so they must be
+# treated as read-only.
+_fragment_cache: TTLCache[tuple[str, Hashable], Any] = TTLCache(
+    maxsize=FRAGMENT_CACHE_SIZE, ttl=FRAGMENT_CACHE_TTL
+)
+# Configs of an organization can be built from several threads, see `compute_organization_configs`
+_fragment_cache_lock = threading.Lock()
+
+
+def get_fragment(section: str, inputs: Hashable, builder: Callable[[], T]) -> T:
+    """
+    Build a section of the project config with ``builder``, or reuse the result of a previous call
+    for the same section with equal ``inputs``.
+
+    ``inputs`` has to cover everything the result depends on, like the values of the options and
+    feature flags the builder checks, or the version of the rules it converts.
+    """
+    if not options.get("relay.config.fragment-cache.enable"):
+        return builder()
+
+    key = (section, inputs)
+    with _fragment_cache_lock:
+        fragment = _fragment_cache.get(key)
+
+    if fragment is not None:
+        metrics.incr("relay.config.fragment_cache", tags={"section": section, "result": "hit"})
+        return fragment
+
+    metrics.incr("relay.config.fragment_cache", tags={"section": section, "result": "miss"})
+    fragment = builder()
+
+    with _fragment_cache_lock:
+        _fragment_cache[key] = fragment
+
+    return fragment
+
+
+def clear_fragment_cache() -> None:
+    with _fragment_cache_lock:
+        _fragment_cache.clear()
+
+
+@contextmanager
+def timed_section(section: str) -> Generator[None, None, None]:
+    """Trace and time building a section of the project config."""
+    with (
+        sentry_sdk.start_span(op=section),
+        metrics.timer("relay.config.get_project_config.section", tags={"section": section}),
+    ):
+        yield
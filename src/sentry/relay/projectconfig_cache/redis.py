@@ -71,8 +71,7 @@ class RedisProjectConfigCache(ProjectConfigCache):
             "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
         )
 
-    def get(self, public_key):
-        rv_b = self.cluster_read.get(self.__get_redis_key(public_key))
+    def __decode(self, rv_b):
         if rv_b is not None:
             try:
                 rv = zstandard.decompress(rv_b).decode()
@@ -82,6 +81,20 @@ class RedisProjectConfigCache(ProjectConfigCache):
             return json.loads(rv)
         return None
 
+    def get(self, public_key):
+        return self.__decode(self.cluster_read.get(self.__get_redis_key(public_key)))
+
+    def get_many(self, public_keys):
+        public_keys = list(public_keys)
+
+        # Note: Those are multiple pipelines, one per cluster node.
+        with self.cluster_read.pipeline(transaction=False) as p:
+            for public_key in public_keys:
+                p.get(self.__get_redis_key(public_key))
+            values = p.execute()
+
+        return {public_key: self.__decode(rv_b) for public_key, rv_b in zip(public_keys, values)}
+
     def get_rev(self, public_key) -> str | None:
         if value := self.cluster_read.get(self.__get_redis_rev_key(public_key)):
             return value.decode()
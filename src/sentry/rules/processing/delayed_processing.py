@@ -2,7 +2,7 @@ import logging
 import math
 import uuid
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from datetime import datetime, timedelta, timezone
 from itertools import islice
 from typing import Any, DefaultDict, NamedTuple
@@ -25,7 +25,9 @@ from sentry.rules.conditions.event_frequency import (
     DEFAULT_COMPARISON_INTERVAL,
     BaseEventFrequencyCondition,
     ComparisonType,
+    EventFrequencyCondition,
     EventFrequencyConditionData,
+    EventUniqueUserFrequencyCondition,
     percent_increase,
 )
 from sentry.rules.processing.processor import (
@@ -47,6 +49,17 @@ logger = logging.getLogger("sentry.rules.delayed_processing")
 EVENT_LIMIT = 100
 COMPARISON_INTERVALS_VALUES = {k: v[1] for k, v in COMPARISON_INTERVALS.items()}
 
+#: Conditions whose batch queries only depend on the groups, the query window
+#: and the environment, and not on the project or the rule. The same query of
+#: several projects of an organization can be made once for all of their groups.
+ORGANIZATION_WIDE_CONDITIONS = frozenset(
+    [EventFrequencyCondition.id, EventUniqueUserFrequencyCondition.id]
+)
+
+#: Maximum number of projects of an organization processed in one task, when
+#: their queries are merged.
+PROJECTS_PER_ORGANIZATION_TASK = 10
+
 
 class UniqueConditionQuery(NamedTuple):
     """
@@ -304,53 +317,114 @@ def get_group_to_groupevent(
 def get_condition_group_results(
     condition_groups: dict[UniqueConditionQuery, DataAndGroups], project: Project
 ) -> dict[UniqueConditionQuery, dict[int, int]] | None:
-    condition_group_results = {}
+    return get_organization_condition_group_results({project: condition_groups})[project.id]
+
+
+def get_organization_condition_group_results(
+    condition_groups_by_project: Mapping[Project, dict[UniqueConditionQuery, DataAndGroups]]
+) -> dict[int, dict[UniqueConditionQuery, dict[int, int]]]:
+    """
+    Make the queries of the condition groups of several projects of the same
+    organization, keyed by project id. Queries of the conditions in
+    `ORGANIZATION_WIDE_CONDITIONS` which are the same in several projects are
+    made once for the groups of all of them, and the results are shared.
+    """
+    condition_group_results: dict[int, dict[UniqueConditionQuery, dict[int, int]]] = {
+        project.id: {} for project in condition_groups_by_project
+    }
     current_time = datetime.now(tz=timezone.utc)
-    project_id = project.id
 
-    for unique_condition, (condition_data, group_ids, rule_id) in condition_groups.items():
-        cls_id = unique_condition.cls_id
-        condition_cls = rules.get(cls_id)
-        if condition_cls is None:
-            logger.warning(
-                "Unregistered condition %r",
-                cls_id,
-                extra={"project_id": project_id},
-            )
-            continue
+    rule_ids = {
+        rule_id
+        for condition_groups in condition_groups_by_project.values()
+        for _, _, rule_id in condition_groups.values()
+        if rule_id
+    }
+    rules_by_id = Rule.objects.in_bulk(rule_ids) if rule_ids else {}
+
+    # The queries to make, with the projects which need their results
+    planned_queries: dict[
+        tuple[UniqueConditionQuery, int | None], tuple[Project, DataAndGroups, list[int]]
+    ] = {}
+    for project, condition_groups in condition_groups_by_project.items():
+        for unique_condition, data_and_groups in condition_groups.items():
+            if unique_condition.cls_id in ORGANIZATION_WIDE_CONDITIONS:
+                plan_key = (unique_condition, None)
+            else:
+                plan_key = (unique_condition, project.id)
+
+            if planned_query := planned_queries.get(plan_key):
+                _, planned_data_and_groups, project_ids = planned_query
+                planned_data_and_groups.group_ids.update(data_and_groups.group_ids)
+                project_ids.append(project.id)
+            else:
+                planned_queries[plan_key] = (
+                    project,
+                    data_and_groups._replace(group_ids=set(data_and_groups.group_ids)),
+                    [project.id],
+                )
 
-        if rule_id:
-            rule = Rule.objects.get(id=rule_id)
-        else:
-            rule = None
+    num_queries = sum(len(groups) for groups in condition_groups_by_project.values())
+    if num_merged := num_queries - len(planned_queries):
+        metrics.incr("delayed_processing.merged_condition_queries", amount=num_merged)
 
-        condition_inst = condition_cls(
-            project=project, data=condition_data, rule=rule  # type: ignore[arg-type]
+    for (unique_condition, _), (project, data_and_groups, project_ids) in planned_queries.items():
+        result = get_condition_query_result(
+            unique_condition, data_and_groups, project, rules_by_id, current_time
         )
-
-        if not isinstance(condition_inst, BaseEventFrequencyCondition):
-            logger.warning("Unregistered condition %r", cls_id, extra={"project_id": project_id})
+        if result is None:
             continue
 
-        _, duration = condition_inst.intervals[unique_condition.interval]
+        for project_id in project_ids:
+            condition_group_results[project_id][unique_condition] = result
 
-        comparison_interval: timedelta | None = None
-        if unique_condition.comparison_interval is not None:
-            comparison_interval = COMPARISON_INTERVALS_VALUES.get(
-                unique_condition.comparison_interval
-            )
+    return condition_group_results
 
-        result = safe_execute(
-            condition_inst.get_rate_bulk,
-            duration=duration,
-            group_ids=group_ids,
-            environment_id=unique_condition.environment_id,
-            current_time=current_time,
-            comparison_interval=comparison_interval,
+
+def get_condition_query_result(
+    unique_condition: UniqueConditionQuery,
+    data_and_groups: DataAndGroups,
+    project: Project,
+    rules_by_id: Mapping[int, Rule],
+    current_time: datetime,
+) -> dict[int, int] | None:
+    condition_data, group_ids, rule_id = data_and_groups
+    project_id = project.id
+
+    cls_id = unique_condition.cls_id
+    condition_cls = rules.get(cls_id)
+    if condition_cls is None:
+        logger.warning(
+            "Unregistered condition %r",
+            cls_id,
+            extra={"project_id": project_id},
         )
-        condition_group_results[unique_condition] = result or {}
+        return None
 
-    return condition_group_results
+    rule = rules_by_id.get(rule_id) if rule_id else None
+
+    condition_inst = condition_cls(
+        project=project, data=condition_data, rule=rule  # type: ignore[arg-type]
+    )
+    if not isinstance(condition_inst, BaseEventFrequencyCondition):
+        logger.warning("Unregistered condition %r", cls_id, extra={"project_id": project_id})
+        return None
+
+    _, duration = condition_inst.intervals[unique_condition.interval]
+
+    comparison_interval: timedelta | None = None
+    if unique_condition.comparison_interval is not None:
+        comparison_interval = COMPARISON_INTERVALS_VALUES.get(unique_condition.comparison_interval)
+
+    result = safe_execute(
+        condition_inst.get_rate_bulk,
+        duration=duration,
+        group_ids=group_ids,
+        environment_id=unique_condition.environment_id,
+        current_time=current_time,
+        comparison_interval=comparison_interval,
+    )
+    return result or {}
 
 
 def passes_comparison(
@@ -482,7 +556,9 @@ def bucket_num_groups(num_groups: int) -> str:
     return "1"
 
 
-def process_rulegroups_in_batches(project_id: int):
+def process_rulegroups_in_batches(
+    project_id: int, organization_projects: DefaultDict[int, list[int]] | None = None
+):
     """
     This will check the number of rulegroup_to_event_data items in the Redis buffer for a project.
 
@@ -496,6 +572,10 @@ def process_rulegroups_in_batches(project_id: int):
     redis doesn't maintain the sort order of the hash keys.
 
     `apply_delayed` will fetch the batch from redis and process the rules.
+
+    If `organization_projects` is given, projects which fit into a single batch
+    are added to the list of their organization instead, to be processed
+    together with the other projects of the organization.
     """
     batch_size = options.get("delayed_processing.batch_size")
     event_count = buffer.backend.get_hash_length(Project, {"project_id": project_id})
@@ -504,6 +584,9 @@ def process_rulegroups_in_batches(project_id: int):
     )
 
     if event_count < batch_size:
+        if organization_projects is not None and (project := fetch_project(project_id)):
+            organization_projects[project.organization_id].append(project_id)
+            return
         return apply_delayed.delay(project_id)
 
     logger.info(
@@ -543,12 +626,77 @@ def process_delayed_alert_conditions() -> None:
         log_str = ", ".join(f"{project_id}: {timestamp}" for project_id, timestamp in project_ids)
         logger.info("delayed_processing.project_id_list", extra={"project_ids": log_str})
 
+        organization_projects: DefaultDict[int, list[int]] | None = None
+        if options.get("delayed_processing.merge_organization_queries"):
+            organization_projects = defaultdict(list)
+
         for project_id, _ in project_ids:
-            process_rulegroups_in_batches(project_id)
+            process_rulegroups_in_batches(project_id, organization_projects)
+
+        for org_project_ids in (organization_projects or {}).values():
+            for project_ids_chunk in chunked(org_project_ids, PROJECTS_PER_ORGANIZATION_TASK):
+                if len(project_ids_chunk) == 1:
+                    apply_delayed.delay(project_ids_chunk[0])
+                else:
+                    apply_delayed_for_organization.delay(project_ids_chunk)
 
         buffer.backend.delete_key(PROJECT_ID_BUFFER_LIST_KEY, min=0, max=fetch_time.timestamp())
 
 
+class DelayedRulesBatch(NamedTuple):
+    """The rules and groups of a project which are waiting in the buffer"""
+
+    project: Project
+    batch_key: str | None
+    rulegroup_to_event_data: dict[str, str]
+    rules_to_groups: DefaultDict[int, set[int]]
+    alert_rules: list[Rule]
+    condition_groups: dict[UniqueConditionQuery, DataAndGroups]
+
+
+def get_delayed_rules_batch(
+    project: Project, batch_key: str | None, rulegroup_to_event_data: dict[str, str] | None = None
+) -> DelayedRulesBatch:
+    if rulegroup_to_event_data is None:
+        rulegroup_to_event_data = fetch_rulegroup_to_event_data(project.id, batch_key)
+    rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
+    alert_rules = fetch_alert_rules(list(rules_to_groups.keys()))
+    condition_groups = get_condition_query_groups(alert_rules, rules_to_groups)
+    logger.info(
+        "delayed_processing.condition_groups",
+        extra={"condition_groups": condition_groups, "project_id": project.id},
+    )
+    return DelayedRulesBatch(
+        project, batch_key, rulegroup_to_event_data, rules_to_groups, alert_rules, condition_groups
+    )
+
+
+def fire_delayed_rules(
+    batch: DelayedRulesBatch,
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int]] | None,
+) -> None:
+    project = batch.project
+    rules_to_slow_conditions = defaultdict(list)
+    for rule in batch.alert_rules:
+        rules_to_slow_conditions[rule].extend(get_slow_conditions(rule))
+
+    rules_to_fire = defaultdict(set)
+    if condition_group_results:
+        rules_to_fire = get_rules_to_fire(
+            condition_group_results, rules_to_slow_conditions, batch.rules_to_groups, project.id
+        )
+        logger.info(
+            "delayed_processing.rule_to_fire",
+            extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project.id},
+        )
+
+    parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(batch.rulegroup_to_event_data)
+    with metrics.timer("delayed_processing.fire_rules.duration"):
+        fire_rules(rules_to_fire, parsed_rulegroup_to_event_data, batch.alert_rules, project)
+
+    cleanup_redis_buffer(project.id, batch.rules_to_groups, batch.batch_key)
+
+
 @instrumented_task(
     name="sentry.rules.processing.delayed_processing",
     queue="delayed_rules",
@@ -566,37 +714,77 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
     if not project:
         return
 
-    rulegroup_to_event_data = fetch_rulegroup_to_event_data(project_id, batch_key)
-    rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
-    alert_rules = fetch_alert_rules(list(rules_to_groups.keys()))
-    condition_groups = get_condition_query_groups(alert_rules, rules_to_groups)
-    logger.info(
-        "delayed_processing.condition_groups",
-        extra={"condition_groups": condition_groups, "project_id": project_id},
-    )
+    batch = get_delayed_rules_batch(project, batch_key)
 
     with metrics.timer("delayed_processing.get_condition_group_results.duration"):
-        condition_group_results = get_condition_group_results(condition_groups, project)
+        condition_group_results = get_condition_group_results(batch.condition_groups, project)
 
-    rules_to_slow_conditions = defaultdict(list)
-    for rule in alert_rules:
-        rules_to_slow_conditions[rule].extend(get_slow_conditions(rule))
+    fire_delayed_rules(batch, condition_group_results)
 
-    rules_to_fire = defaultdict(set)
-    if condition_group_results:
-        rules_to_fire = get_rules_to_fire(
-            condition_group_results, rules_to_slow_conditions, rules_to_groups, project.id
+
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing.apply_delayed_for_organization",
+    queue="delayed_rules",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=50,
+    time_limit=60,
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed_for_organization(project_ids: list[int], *args: Any, **kwargs: Any) -> None:
+    """
+    Like `apply_delayed`, for several projects of the same organization. Their
+    slow conditions are evaluated together, so the snuba queries they have in
+    common are only made once. The rules of each project are then fired in
+    their own `fire_delayed_rules_for_project` task.
+    """
+    batches = [
+        get_delayed_rules_batch(project, None)
+        for project in map(fetch_project, project_ids)
+        if project
+    ]
+
+    with metrics.timer("delayed_processing.get_condition_group_results.duration"):
+        condition_group_results = get_organization_condition_group_results(
+            {batch.project: batch.condition_groups for batch in batches}
         )
-        logger.info(
-            "delayed_processing.rule_to_fire",
-            extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project_id},
+
+    for batch in batches:
+        fire_delayed_rules_for_project.delay(
+            batch.project.id,
+            batch.rulegroup_to_event_data,
+            condition_group_results[batch.project.id],
         )
 
-    parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(rulegroup_to_event_data)
-    with metrics.timer("delayed_processing.fire_rules.duration"):
-        fire_rules(rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project)
 
-    cleanup_redis_buffer(project_id, rules_to_groups, batch_key)
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing.fire_delayed_rules_for_project",
+    queue="delayed_rules",
+    default_retry_delay=5,
+    max_retries=5,
+    soft_time_limit=50,
+    time_limit=60,
+    silo_mode=SiloMode.REGION,
+)
+def fire_delayed_rules_for_project(
+    project_id: int,
+    rulegroup_to_event_data: dict[str, str],
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int]],
+    *args: Any,
+    **kwargs: Any,
+) -> None:
+    """
+    Fire the rules of a project whose slow conditions were evaluated by
+    `apply_delayed_for_organization`. Only the rules and groups that were
+    evaluated are fired and removed from the buffer, anything buffered since
+    is left for the next run.
+    """
+    project = fetch_project(project_id)
+    if not project:
+        return
+
+    batch = get_delayed_rules_batch(project, None, rulegroup_to_event_data)
+    fire_delayed_rules(batch, condition_group_results)
 
 
 if not redis_buffer_registry.has(BufferHookEvent.FLUSH):
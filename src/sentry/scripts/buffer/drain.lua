@@ -0,0 +1,18 @@
+-- Atomically read and delete a batch of buffer hashes, and remove them from the pending set.
+--
+-- KEYS[1]: the pending set
+-- KEYS[2..n]: the buffer hashes to drain
+--
+-- Returns the contents of each hash as a flat list of field/value pairs, in the order the keys
+-- were passed. Hashes which don't exist (anymore) come back as empty lists.
+local pending_key = KEYS[1]
+local results = {}
+
+for i = 2, #KEYS do
+    local key = KEYS[i]
+    results[i - 1] = redis.call('HGETALL', key)
+    redis.call('DEL', key)
+    redis.call('ZREM', pending_key, key)
+end
+
+return results
@@ -0,0 +1,17 @@
+-- Atomically pop all segments which were first seen at or before a timestamp from a partition's
+-- bucket of unprocessed segments.
+--
+-- KEYS[1]: the bucket, a sorted set of segment keys scored by their first-seen timestamp
+-- ARGV[1]: the maximum first-seen timestamp of segments to pop (inclusive)
+--
+-- Returns the popped segment keys and their timestamps as a flat list of member/score pairs,
+-- ordered by timestamp.
+local bucket_key = KEYS[1]
+local max_timestamp = ARGV[1]
+
+local segments = redis.call('ZRANGEBYSCORE', bucket_key, '-inf', max_timestamp, 'WITHSCORES')
+if #segments > 0 then
+    redis.call('ZREMRANGEBYSCORE', bucket_key, '-inf', max_timestamp)
+end
+
+return segments
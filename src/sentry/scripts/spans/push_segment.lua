@@ -0,0 +1,33 @@
+-- Append a batch of spans to a segment unless that would grow the segment past its size limit.
+--
+-- KEYS[1]: the segment, a list of spans (or compressed batches of spans)
+-- KEYS[2]: the total size in bytes of the spans written to the segment so far
+-- ARGV[1]: the maximum size of a segment in bytes
+-- ARGV[2]: the TTL of the size key in seconds, set when the key is created
+-- ARGV[3]: the size in bytes of the batch being written
+-- ARGV[4...]: the values to append to the segment
+--
+-- Returns the length of the segment after the write, like RPUSH, or -1 if the batch was dropped
+-- because the segment is full.
+local segment_key = KEYS[1]
+local size_key = KEYS[2]
+local max_segment_bytes = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local batch_bytes = tonumber(ARGV[3])
+
+local segment_bytes = tonumber(redis.call('GET', size_key) or 0)
+if segment_bytes + batch_bytes > max_segment_bytes then
+    return -1
+end
+
+if redis.call('INCRBY', size_key, batch_bytes) == batch_bytes then
+    redis.call('EXPIRE', size_key, ttl)
+end
+
+-- Push in chunks to stay clear of Lua's limit on the number of arguments to unpack
+local length = 0
+for i = 4, #ARGV, 1000 do
+    length = redis.call('RPUSH', segment_key, unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+
+return length
@@ -21,6 +21,7 @@ from sentry import options
 from sentry.features.rollout import in_random_rollout
 from sentry.sentry_metrics.aggregation_option_registry import get_aggregation_options
 from sentry.sentry_metrics.configuration import MAX_INDEXED_COLUMN_LENGTH
+from sentry.sentry_metrics.consumers.indexer.columnar import MessageColumns
 from sentry.sentry_metrics.consumers.indexer.common import (
     BrokerMeta,
     IndexerOutputMessageBatch,
@@ -114,6 +115,14 @@ class IndexerBatch:
         self.filtered_msg_meta: set[BrokerMeta] = set()
         self.parsed_payloads_by_meta: MutableMapping[BrokerMeta, ParsedMessage] = {}
 
+        # The strings of the valid messages, used instead of the parsed payloads
+        # when extracting and resolving strings
+        self._columns: MessageColumns | None = (
+            MessageColumns()
+            if in_random_rollout("sentry-metrics.indexer.columnar-batch.rollout")
+            else None
+        )
+
         self._extract_messages()
 
     @metrics.wraps("process_messages.extract_messages")
@@ -147,6 +156,14 @@ class IndexerBatch:
             try:
                 parsed_payload = self._extract_message(msg)
                 self._validate_message(parsed_payload)
+                if self._columns is not None:
+                    self._columns.append(
+                        broker_meta,
+                        parsed_payload["use_case_id"],
+                        parsed_payload["org_id"],
+                        parsed_payload["name"],
+                        parsed_payload.get("tags", {}),
+                    )
                 self.parsed_payloads_by_meta[broker_meta] = parsed_payload
             except Exception as e:
                 self.invalid_msg_meta.add(broker_meta)
@@ -271,6 +288,24 @@ class IndexerBatch:
 
     @metrics.wraps("process_messages.extract_strings")
     def extract_strings(self) -> Mapping[UseCaseID, Mapping[OrgId, set[str]]]:
+        if self._columns is not None:
+            # Invalid messages are never added to the columns
+            strings = self._columns.extract_strings(
+                self.filtered_msg_meta, self.__should_index_tag_values
+            )
+        else:
+            strings = self._extract_strings_from_payloads()
+
+        for use_case_id, org_mapping in strings.items():
+            metrics.gauge(
+                "process_messages.lookups_per_batch",
+                value=sum(len(parsed_strings) for parsed_strings in org_mapping.values()),
+                tags={"use_case": use_case_id.value},
+            )
+
+        return strings
+
+    def _extract_strings_from_payloads(self) -> Mapping[UseCaseID, Mapping[OrgId, set[str]]]:
         strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]] = defaultdict(
             lambda: defaultdict(set)
         )
@@ -294,13 +329,6 @@ class IndexerBatch:
 
             strings[use_case_id][org_id].update(strings_in_message)
 
-        for use_case_id, org_mapping in strings.items():
-            metrics.gauge(
-                "process_messages.lookups_per_batch",
-                value=sum(len(parsed_strings) for parsed_strings in org_mapping.values()),
-                tags={"use_case": use_case_id.value},
-            )
-
         return strings
 
     @metrics.wraps("process_messages.reconstruct_messages")
@@ -344,26 +372,23 @@ class IndexerBatch:
 
             with metrics.timer("metrics_consumer.reconstruct_messages.get_indexed_tags"):
                 try:
-                    for k, v in tags.items():
-                        used_tags.update({k, v})
-                        new_k = mapping[use_case_id][org_id][k]
-                        if new_k is None:
-                            metadata = bulk_record_meta[use_case_id][org_id].get(k)
-                            if (
-                                metadata
-                                and metadata.fetch_type_ext
-                                and metadata.fetch_type_ext.is_global
-                            ):
-                                exceeded_global_quotas += 1
-                            else:
-                                exceeded_org_quotas += 1
-                            continue
-
-                        value_to_write: int | str = v
-                        if self.__should_index_tag_values:
-                            new_v = mapping[use_case_id][org_id][v]
-                            if new_v is None:
-                                metadata = bulk_record_meta[use_case_id][org_id].get(v)
+                    if self._columns is not None:
+                        resolved_tags = self._columns.resolve_tags(
+                            self._columns.positions[broker_meta],
+                            mapping[use_case_id][org_id],
+                            bulk_record_meta[use_case_id][org_id],
+                            self.__should_index_tag_values,
+                        )
+                        new_tags = resolved_tags.tags
+                        used_tags = resolved_tags.used_strings
+                        exceeded_global_quotas = resolved_tags.exceeded_global_quotas
+                        exceeded_org_quotas = resolved_tags.exceeded_org_quotas
+                    else:
+                        for k, v in tags.items():
+                            used_tags.update({k, v})
+                            new_k = mapping[use_case_id][org_id][k]
+                            if new_k is None:
+                                metadata = bulk_record_meta[use_case_id][org_id].get(k)
                                 if (
                                     metadata
                                     and metadata.fetch_type_ext
@@ -373,10 +398,25 @@ class IndexerBatch:
                                 else:
                                     exceeded_org_quotas += 1
                                 continue
-                            else:
-                                value_to_write = new_v
 
-                        new_tags[str(new_k)] = value_to_write
+                            value_to_write: int | str = v
+                            if self.__should_index_tag_values:
+                                new_v = mapping[use_case_id][org_id][v]
+                                if new_v is None:
+                                    metadata = bulk_record_meta[use_case_id][org_id].get(v)
+                                    if (
+                                        metadata
+                                        and metadata.fetch_type_ext
+                                        and metadata.fetch_type_ext.is_global
+                                    ):
+                                        exceeded_global_quotas += 1
+                                    else:
+                                        exceeded_org_quotas += 1
+                                    continue
+                                else:
+                                    value_to_write = new_v
+
+                            new_tags[str(new_k)] = value_to_write
                 except KeyError:
                     logger.exception("process_messages.key_error", extra={"tags": tags})
                     continue
@@ -501,7 +541,9 @@ class IndexerBatch:
                 with metrics.timer(
                     "metrics_consumer.reconstruct_messages.build_new_payload.json_step"
                 ):
-                    if in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson"):
+                    if self._columns is not None or in_random_rollout(
+                        "sentry-metrics.indexer.reconstruct.enable-orjson"
+                    ):
                         serialized_msg = orjson.dumps(new_payload_value)
                     else:
                         serialized_msg = rapidjson.dumps(new_payload_value).encode()
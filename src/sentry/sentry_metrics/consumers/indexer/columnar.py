@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from collections.abc import Collection, Mapping
+from typing import NamedTuple
+
+from sentry.sentry_metrics.consumers.indexer.common import BrokerMeta
+from sentry.sentry_metrics.indexer.base import Metadata
+from sentry.sentry_metrics.use_case_id_registry import UseCaseID
+
+OrgId = int
+
+# Marks a string which is missing from the mapping passed to `resolve_tags`
+_MISSING = -1
+
+
+class ResolvedTags(NamedTuple):
+    tags: dict[str, str | int]
+    # Every string of the message, which is what ends up in the mapping meta
+    used_strings: set[str]
+    exceeded_global_quotas: int
+    exceeded_org_quotas: int
+
+
+class MessageColumns:
+    """
+    Columnar representation of the strings in a batch of parsed metric
+    messages.
+
+    Every distinct string in the batch is stored once in `strings` and referred
+    to by its index (its code) everywhere else. Messages are identified by their
+    position in the batch:
+
+    - `group_codes[pos]` is the index of the message's (use case, org) in `groups`
+    - `names[pos]` is the code of the metric name
+    - `tag_keys[tag_offsets[pos]:tag_offsets[pos + 1]]` are the codes of the tag
+      keys, with the codes of the values at the same positions in `tag_values`
+
+    Resolving the indexed ids happens once per (use case, org) and string rather
+    than once per tag of every message.
+    """
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._string_codes: dict[str, int] = {}
+
+        self.groups: list[tuple[UseCaseID, OrgId]] = []
+        self._group_codes: dict[tuple[UseCaseID, OrgId], int] = {}
+
+        self.positions: dict[BrokerMeta, int] = {}
+        self.group_codes = array("I")
+        self.names = array("I")
+        self.tag_offsets = array("I", [0])
+        self.tag_keys = array("I")
+        self.tag_values = array("I")
+
+        # code -> id, filled lazily per group by `resolve_tags`
+        self._resolved: dict[int, dict[int, int | None]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _intern(self, string: str) -> int:
+        code = self._string_codes.get(string)
+        if code is None:
+            code = self._string_codes[string] = len(self.strings)
+            self.strings.append(string)
+        return code
+
+    def append(
+        self,
+        broker_meta: BrokerMeta,
+        use_case_id: UseCaseID,
+        org_id: OrgId,
+        name: str,
+        tags: Mapping[str, str],
+    ) -> None:
+        group = (use_case_id, org_id)
+        group_code = self._group_codes.get(group)
+        if group_code is None:
+            group_code = self._group_codes[group] = len(self.groups)
+            self.groups.append(group)
+
+        # intern everything before touching the columns, so that they stay
+        # consistent if any of the strings can't be hashed
+        name_code = self._intern(name)
+        key_codes = [self._intern(key) for key in tags.keys()]
+        value_codes = [self._intern(value) for value in tags.values()]
+
+        self.positions[broker_meta] = len(self.names)
+        self.group_codes.append(group_code)
+        self.names.append(name_code)
+        self.tag_keys.extend(key_codes)
+        self.tag_values.extend(value_codes)
+        self.tag_offsets.append(len(self.tag_keys))
+
+    def extract_strings(
+        self, skipped: Collection[BrokerMeta], include_tag_values: bool
+    ) -> Mapping[UseCaseID, Mapping[OrgId, set[str]]]:
+        codes_by_group: dict[int, set[int]] = defaultdict(set)
+
+        for broker_meta, pos in self.positions.items():
+            if broker_meta in skipped:
+                continue
+
+            codes = codes_by_group[self.group_codes[pos]]
+            codes.add(self.names[pos])
+            start, end = self.tag_offsets[pos], self.tag_offsets[pos + 1]
+            codes.update(self.tag_keys[start:end])
+            if include_tag_values:
+                codes.update(self.tag_values[start:end])
+
+        strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        for group_code, codes in codes_by_group.items():
+            use_case_id, org_id = self.groups[group_code]
+            strings[use_case_id][org_id].update(self.strings[code] for code in codes)
+
+        return strings
+
+    def get_group(self, pos: int) -> tuple[UseCaseID, OrgId]:
+        return self.groups[self.group_codes[pos]]
+
+    def get_name(self, pos: int) -> str:
+        return self.strings[self.names[pos]]
+
+    def resolve_tags(
+        self,
+        pos: int,
+        org_mapping: Mapping[str, int | None],
+        org_meta: Mapping[str, Metadata],
+        index_tag_values: bool,
+    ) -> ResolvedTags:
+        """
+        Replace the strings in the tags of the message at `pos` with their ids.
+        Tags which weren't indexed because of a quota are counted instead.
+
+        Raises `KeyError` if a string is missing from `org_mapping`, like
+        looking it up in the mapping directly would.
+        """
+        strings = self.strings
+        resolved = self._resolved[self.group_codes[pos]]
+
+        def resolve(code: int) -> int | None:
+            id = resolved.get(code, _MISSING)
+            if id == _MISSING:
+                id = resolved[code] = org_mapping.get(strings[code], _MISSING)
+            if id == _MISSING:
+                raise KeyError(strings[code])
+            return id
+
+        def is_global_quota(code: int) -> bool:
+            metadata = org_meta.get(strings[code])
+            return bool(metadata and metadata.fetch_type_ext and metadata.fetch_type_ext.is_global)
+
+        new_tags: dict[str, str | int] = {}
+        used_codes = {self.names[pos]}
+        exceeded_global_quotas = 0
+        exceeded_org_quotas = 0
+
+        start, end = self.tag_offsets[pos], self.tag_offsets[pos + 1]
+        for key_code, value_code in zip(self.tag_keys[start:end], self.tag_values[start:end]):
+            used_codes.add(key_code)
+            used_codes.add(value_code)
+
+            new_k = resolve(key_code)
+            if new_k is None:
+                if is_global_quota(key_code):
+                    exceeded_global_quotas += 1
+                else:
+                    exceeded_org_quotas += 1
+                continue
+
+            value_to_write: int | str = strings[value_code]
+            if index_tag_values:
+                new_v = resolve(value_code)
+                if new_v is None:
+                    if is_global_quota(value_code):
+                        exceeded_global_quotas += 1
+                    else:
+                        exceeded_org_quotas += 1
+                    continue
+                value_to_write = new_v
+
+            new_tags[str(new_k)] = value_to_write
+
+        return ResolvedTags(
+            new_tags,
+            {strings[code] for code in used_codes},
+            exceeded_global_quotas,
+            exceeded_org_quotas,
+        )
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
+import threading
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
 
+from cachetools import TLRUCache
 from django.conf import settings
 from django.core.cache import caches
 
@@ -34,12 +36,15 @@ _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-wri
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
 
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local-cache"
+
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
 
 NAMESPACED_WRITE_FEAT_FLAG = "sentry-metrics.indexer.write-new-cache-namespace"
 NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
+LOCAL_CACHE_FEAT_FLAG = "sentry-metrics.indexer.local-cache.enabled"
 
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
@@ -205,10 +210,95 @@ class StringIndexerCache:
             )
 
 
+class LocalIndexerCache:
+    """
+    A bounded per-process cache of indexer results, used in front of the
+    `StringIndexerCache` so the hot set of metric names and tag keys/values
+    doesn't need a round-trip to the cache cluster for every batch.
+
+    Holds up to `max_size` entries in each direction:
+        "use_case_id:org_id:string" -> id
+        (use_case_id, org_id, id) -> string
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._ids: TLRUCache[str, int] = TLRUCache(maxsize=max_size, ttu=self._get_expiry)
+        self._strings: TLRUCache[tuple[str, int, int], str] = TLRUCache(
+            maxsize=max_size, ttu=self._get_expiry
+        )
+
+    @property
+    def randomized_ttl(self) -> float:
+        # same jitter as `StringIndexerCache.randomized_ttl`, so entries
+        # written by a single large batch don't all expire at once
+        jitter = random.uniform(0, 0.25) * self.ttl
+        return self.ttl + jitter
+
+    def _get_expiry(self, key: object, value: object, now: float) -> float:
+        return now + self.randomized_ttl
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        with self._lock:
+            return {key: id for key in keys if (id := self._ids.get(key)) is not None}
+
+    def set_many(self, key_values: Mapping[str, int]) -> None:
+        with self._lock:
+            for key, id in key_values.items():
+                use_case_id, org_id, string = key.split(":", 2)
+                self._ids[key] = id
+                self._strings[(use_case_id, int(org_id), id)] = string
+
+    def get_many_strings(self, use_case_id: str, org_id: int, ids: Iterable[int]) -> dict[int, str]:
+        with self._lock:
+            return {
+                id: string
+                for id in ids
+                if (string := self._strings.get((use_case_id, org_id, id))) is not None
+            }
+
+    def set_many_strings(
+        self, use_case_id: str, org_id: int, id_strings: Mapping[int, str]
+    ) -> None:
+        with self._lock:
+            for id, string in id_strings.items():
+                self._strings[(use_case_id, org_id, id)] = string
+                self._ids[f"{use_case_id}:{org_id}:{string}"] = id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._strings.clear()
+
+
 class CachingIndexer(StringIndexer):
-    def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
+    def __init__(
+        self,
+        cache: StringIndexerCache,
+        indexer: StringIndexer,
+        local_cache: LocalIndexerCache | None = None,
+    ) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = local_cache
+
+    def _get_local_cache(self) -> LocalIndexerCache | None:
+        if self.local_cache is not None and options.get(LOCAL_CACHE_FEAT_FLAG):
+            return self.local_cache
+        return None
+
+    def _record_local_cache_metrics(self, caller: str, hits: int, misses: int) -> None:
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true", "caller": caller},
+            amount=hits,
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false", "caller": caller},
+            amount=misses,
+        )
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -216,7 +306,21 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+
+        local_cache = self._get_local_cache()
+        local_results: Mapping[str, int] = {}
+        if local_cache is not None:
+            local_results = local_cache.get_many(cache_key_strs)
+            self._record_local_cache_metrics(
+                "get_many_ids", len(local_results), len(cache_key_strs) - len(local_results)
+            )
+            cache_key_strs = [k for k in cache_key_strs if k not in local_results]
+
+        cache_results = (
+            self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+            if cache_key_strs
+            else {}
+        )
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -238,9 +342,14 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
+        cache_hits = {k: v for k, v in cache_results.items() if v is not None}
+        if local_cache is not None:
+            local_cache.set_many(cache_hits)
+            cache_hits.update(local_results)
+
         cache_key_results = UseCaseKeyResults()
         cache_key_results.add_use_case_key_results(
-            [UseCaseKeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
+            [UseCaseKeyResult.from_string(k, v) for k, v in cache_hits.items()],
             FetchType.CACHE_HIT,
         )
 
@@ -256,9 +365,10 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_mapped_results = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_mapped_results)
+        if local_cache is not None:
+            local_cache.set_many(db_mapped_results)
 
         return cache_key_results.merge(db_record_key_results)
 
@@ -269,6 +379,17 @@ class CachingIndexer(StringIndexer):
     @metric_path_key_compatible_resolve
     def resolve(self, use_case_id: UseCaseID, org_id: int, string: str) -> int | None:
         key = f"{use_case_id.value}:{org_id}:{string}"
+
+        local_cache = self._get_local_cache()
+        if local_cache is not None:
+            local_result = local_cache.get_many([key]).get(key)
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": str(local_result is not None).lower(), "caller": "resolve"},
+            )
+            if local_result is not None:
+                return local_result
+
         result = self.cache.get(RESOLVE_CACHE_NAMESPACE, key)
 
         if result and isinstance(result, int):
@@ -276,10 +397,14 @@ class CachingIndexer(StringIndexer):
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "true", "use_case": use_case_id.value},
             )
+            if local_cache is not None:
+                local_cache.set_many({key: result})
             return result
 
         id = self.indexer.resolve(use_case_id, org_id, string)
         if id is not None:
+            if local_cache is not None:
+                local_cache.set_many({key: id})
             metrics.incr(
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "false", "use_case": use_case_id.value},
@@ -303,7 +428,22 @@ class CachingIndexer(StringIndexer):
     def bulk_reverse_resolve(
         self, use_case_id: UseCaseID, org_id: int, ids: Collection[int]
     ) -> Mapping[int, str]:
-        return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+        local_cache = self._get_local_cache()
+        if local_cache is None:
+            return self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids)
+
+        results = local_cache.get_many_strings(use_case_id.value, org_id, ids)
+        self._record_local_cache_metrics(
+            "bulk_reverse_resolve", len(results), len(ids) - len(results)
+        )
+
+        missing_ids = [id for id in ids if id not in results]
+        if missing_ids:
+            indexer_results = self.indexer.bulk_reverse_resolve(use_case_id, org_id, missing_ids)
+            local_cache.set_many_strings(use_case_id.value, org_id, indexer_results)
+            results.update(indexer_results)
+
+        return results
 
     def resolve_shared_org(self, string: str) -> int | None:
         raise NotImplementedError(
@@ -1,18 +1,22 @@
+import threading
 from collections.abc import Collection, Mapping, Sequence
 from functools import reduce
 from operator import or_
 from time import sleep
-from typing import Any
+from typing import Any, NamedTuple
 
 import sentry_sdk
+from cachetools import TLRUCache
 from django.conf import settings
 from django.db.models import Q
 from psycopg2 import OperationalError
 from psycopg2.errorcodes import DEADLOCK_DETECTED
 
+from sentry import options
 from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
 from sentry.sentry_metrics.indexer.base import (
     FetchType,
+    FetchTypeExt,
     OrgId,
     StringIndexer,
     UseCaseKeyCollection,
@@ -21,7 +25,11 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_resolve,
     metric_path_key_compatible_rev_resolve,
 )
-from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalIndexerCache,
+    StringIndexerCache,
+)
 from sentry.sentry_metrics.indexer.limiters.writes import writes_limiter_factory
 from sentry.sentry_metrics.indexer.postgres.models import TABLE_MAPPING, BaseIndexer, IndexerTable
 from sentry.sentry_metrics.indexer.strings import StaticStringIndexer
@@ -33,6 +41,9 @@ __all__ = ["PostgresIndexer"]
 
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 _INDEXER_DB_METRIC = "sentry_metrics.indexer.postgres"
+_INDEXER_DB_NEGATIVE_CACHE_METRIC = "sentry_metrics.indexer.postgres.negative-cache"
+
+NEGATIVE_CACHE_SIZE = 50000
 
 _PARTITION_KEY = "pg"
 
@@ -40,6 +51,21 @@ indexer_cache = StringIndexerCache(
     **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
 )
 
+local_indexer_cache = (
+    LocalIndexerCache(
+        max_size=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE,
+        ttl=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL,
+    )
+    if settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE
+    else None
+)
+
+
+class NegativeResult(NamedTuple):
+    # `None` for strings which couldn't be resolved even though they were written
+    fetch_type: FetchType | None
+    fetch_type_ext: FetchTypeExt | None
+
 
 class PGStringIndexerV2(StringIndexer):
     """
@@ -47,6 +73,54 @@ class PGStringIndexerV2(StringIndexer):
     and the corresponding reverse lookup.
     """
 
+    def __init__(self) -> None:
+        # Strings which were rate limited or couldn't be resolved recently, keyed
+        # by "use_case_id:org_id:string". They are answered without going to the
+        # database until they expire, so orgs over their write limits don't cause
+        # the same SELECT for every batch.
+        self._negative_cache: TLRUCache[str, NegativeResult] = TLRUCache(
+            maxsize=NEGATIVE_CACHE_SIZE, ttu=self._get_negative_cache_expiry
+        )
+        self._negative_cache_lock = threading.Lock()
+
+    def _get_negative_cache_expiry(self, key: str, value: NegativeResult, now: float) -> float:
+        return now + options.get("sentry-metrics.indexer.negative-cache.ttl")
+
+    def _get_negative_results(
+        self, keys: UseCaseKeyCollection
+    ) -> tuple[UseCaseKeyCollection, dict[str, NegativeResult]]:
+        """
+        Split `keys` into the keys which still need to be looked up, and the
+        cached negative results for the others.
+        """
+        if not options.get("sentry-metrics.indexer.negative-cache.ttl"):
+            return keys, {}
+
+        with self._negative_cache_lock:
+            negative_results = {
+                key: result
+                for key in keys.as_strings()
+                if (result := self._negative_cache.get(key)) is not None
+            }
+        if not negative_results:
+            return keys, {}
+
+        metrics.incr(_INDEXER_DB_NEGATIVE_CACHE_METRIC, amount=len(negative_results))
+
+        remaining: dict[UseCaseID, dict[OrgId, set[str]]] = {}
+        for use_case_id, org_id, string in keys.as_tuples():
+            if f"{use_case_id.value}:{org_id}:{string}" not in negative_results:
+                remaining.setdefault(use_case_id, {}).setdefault(org_id, set()).add(string)
+
+        return UseCaseKeyCollection(remaining), negative_results
+
+    def _set_negative_results(self, negative_results: Mapping[str, NegativeResult]) -> None:
+        if not negative_results or not options.get("sentry-metrics.indexer.negative-cache.ttl"):
+            return
+
+        with self._negative_cache_lock:
+            self._negative_cache.update(negative_results)
+
     def _get_db_records(self, db_use_case_keys: UseCaseKeyCollection) -> Any:
         """
         The order of operations for our changes needs to be:
@@ -120,7 +194,19 @@ class PGStringIndexerV2(StringIndexer):
     ) -> UseCaseKeyResults:
         metric_path_key = self._get_metric_path_key(strings.keys())
 
-        db_read_keys = UseCaseKeyCollection(strings)
+        db_read_keys, negative_results = self._get_negative_results(UseCaseKeyCollection(strings))
+
+        negative_key_results = UseCaseKeyResults()
+        for key, negative_result in negative_results.items():
+            if negative_result.fetch_type is not None:
+                negative_key_results.add_use_case_key_result(
+                    UseCaseKeyResult.from_string(key, None),
+                    fetch_type=negative_result.fetch_type,
+                    fetch_type_ext=negative_result.fetch_type_ext,
+                )
+
+        if db_read_keys.size == 0:
+            return negative_key_results
 
         db_read_key_results = UseCaseKeyResults()
         db_read_key_results.add_use_case_key_results(
@@ -139,6 +225,7 @@ class PGStringIndexerV2(StringIndexer):
             ],
             FetchType.DB_READ,
         )
+        db_read_key_results = db_read_key_results.merge(negative_key_results)
         db_write_keys = db_read_key_results.get_unmapped_use_case_keys(db_read_keys)
 
         metrics.incr(
@@ -189,6 +276,15 @@ class PGStringIndexerV2(StringIndexer):
                     fetch_type_ext=dropped_string.fetch_type_ext,
                 )
 
+            negative_results = {}
+            for dropped_string in writes_limiter_state.dropped_strings:
+                result = dropped_string.use_case_key_result
+                key = f"{result.use_case_id.value}:{result.org_id}:{result.string}"
+                negative_results[key] = NegativeResult(
+                    dropped_string.fetch_type, dropped_string.fetch_type_ext
+                )
+            self._set_negative_results(negative_results)
+
             if accepted_keys.size == 0:
                 return db_read_key_results.merge(rate_limited_key_results)
 
@@ -232,6 +328,15 @@ class PGStringIndexerV2(StringIndexer):
             fetch_type=FetchType.FIRST_SEEN,
         )
 
+        self._set_negative_results(
+            {
+                key: NegativeResult(None, None)
+                for key in db_write_key_results.get_unmapped_use_case_keys(
+                    accepted_keys
+                ).as_strings()
+            }
+        )
+
         return db_read_key_results.merge(db_write_key_results).merge(rate_limited_key_results)
 
     def bulk_record(
@@ -324,4 +429,6 @@ class PGStringIndexerV2(StringIndexer):
 
 class PostgresIndexer(StaticStringIndexer):
     def __init__(self) -> None:
-        super().__init__(CachingIndexer(indexer_cache, PGStringIndexerV2()))
+        super().__init__(
+            CachingIndexer(indexer_cache, PGStringIndexerV2(), local_cache=local_indexer_cache)
+        )
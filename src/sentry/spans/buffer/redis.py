@@ -1,16 +1,31 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Mapping
-from typing import NamedTuple
+import struct
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
 
 import sentry_sdk
 from django.conf import settings
+from redis.exceptions import NoScriptError
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
-from sentry.utils import redis
+from sentry.utils import metrics, redis
+from sentry.utils.codecs import ZstdCodec
 from sentry.utils.iterators import chunked
+from sentry.utils.redis import load_redis_script
+
+drain_segments = load_redis_script("spans/drain_segments.lua")
+push_segment = load_redis_script("spans/push_segment.lua")
+
+# Every zstd frame starts with these bytes, while uncompressed spans are JSON objects
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+# Spans are length-prefixed in compressed batches, since span payloads can contain any byte
+SPAN_LENGTH = struct.Struct("<I")
+
+zstd_codec = ZstdCodec()
 
 
 @dataclasses.dataclass
@@ -34,14 +49,76 @@ def get_segment_key(project_id: str | int, segment_id: str) -> str:
     return f"segment:{segment_id}:{project_id}:process-segment"
 
 
+def get_segment_size_key(segment_key: str) -> str:
+    # Hash tag the segment key, so the size key lives in the same cluster slot as the segment
+    return f"{{{segment_key}}}:size"
+
+
 def get_last_processed_timestamp_key(partition_index: int) -> str:
     return f"performance-issues:last-processed-timestamp:partition:{partition_index}"
 
 
 def get_unprocessed_segments_key(partition_index: int) -> str:
+    return f"performance-issues:unprocessed-segments:partition-3:{partition_index}"
+
+
+def get_legacy_unprocessed_segments_key(partition_index: int) -> str:
+    # Buckets written as lists by previous versions, only drained while
+    # `standalone-spans.buffer-drain-legacy-buckets.enable` is set
     return f"performance-issues:unprocessed-segments:partition-2:{partition_index}"
 
 
+def get_push_segment_command(
+    segment_key: str, max_segment_bytes: int, ttl: int, size: int, values: Sequence[bytes]
+) -> tuple[Any, ...]:
+    # Cluster pipelines queue scripts without loading them, so the script is queued as a plain
+    # EVALSHA and only loaded once a node turns out not to know it
+    return (
+        "EVALSHA",
+        push_segment.sha,
+        2,
+        segment_key,
+        get_segment_size_key(segment_key),
+        max_segment_bytes,
+        ttl,
+        size,
+        *values,
+    )
+
+
+def compress_spans(spans: Sequence[bytes]) -> bytes:
+    return zstd_codec.encode(b"".join(SPAN_LENGTH.pack(len(span)) + span for span in spans))
+
+
+def decompress_spans(value: bytes) -> list[bytes]:
+    data = zstd_codec.decode(value)
+
+    spans = []
+    offset = 0
+    while offset < len(data):
+        (length,) = SPAN_LENGTH.unpack_from(data, offset)
+        offset += SPAN_LENGTH.size
+        spans.append(data[offset : offset + length])
+        offset += length
+
+    return spans
+
+
+def decode_segment(values: Sequence[bytes]) -> list[bytes]:
+    """
+    Expand the compressed batches of spans in a segment. Segments can contain both compressed and
+    uncompressed spans while `standalone-spans.buffer-compression.enable` is being rolled out.
+    """
+    spans = []
+    for value in values:
+        if value.startswith(ZSTD_MAGIC_NUMBER):
+            spans.extend(decompress_spans(value))
+        else:
+            spans.append(value)
+
+    return spans
+
+
 class RedisSpansBuffer:
     def __init__(self):
         self.client: RedisCluster | StrictRedis = get_redis_client()
@@ -56,25 +133,56 @@ class RedisSpansBuffer:
         1. Pushes batches of spans to redis
         2. Check if number of spans pushed == to the number of elements that exist on the key. This
             tells us if it was the first time we see the key. This works fine because RPUSH is atomic.
-        3. If it is the first time we see a particular segment, push the segment id and first seen
-            timestamp to a bucket so we know when it is ready to be processed.
+        3. If it is the first time we see a particular segment, add the segment key to a bucket
+            sorted by first seen timestamp so we know when it is ready to be processed.
         3. Checks if 1 second has passed since the last time segments were processed for a partition.
         """
         keys = list(spans_map.keys())
         spans_written_per_segment = []
         ttl = options.get("standalone-spans.buffer-ttl.seconds")
+        compress = options.get("standalone-spans.buffer-compression.enable")
+        max_segment_bytes = options.get("standalone-spans.buffer-max-segment-bytes")
 
         # Batch write spans in a segment
+        push_segment_commands: list[tuple[Any, ...]] = []
         with self.client.pipeline() as p:
             for key in keys:
                 segment_id, project_id, partition = key
                 spans = spans_map[key]
                 segment_key = get_segment_key(project_id, segment_id)
-                # RPUSH is atomic
-                p.rpush(segment_key, *spans)
-                spans_written_per_segment.append(len(spans))
 
-            results = p.execute()
+                values = spans
+                if compress:
+                    values = [compress_spans(spans)]
+                    metrics.distribution(
+                        "spans.buffer.compression_ratio",
+                        sum(len(span) for span in spans) / len(values[0]),
+                    )
+
+                if max_segment_bytes:
+                    # The limit applies to the uncompressed spans, as that's what ends up in the
+                    # segment's payload
+                    command = get_push_segment_command(
+                        segment_key,
+                        max_segment_bytes,
+                        ttl,
+                        sum(len(span) for span in spans),
+                        values,
+                    )
+                    push_segment_commands.append(command)
+                    p.execute_command(*command)
+                else:
+                    # RPUSH is atomic
+                    p.rpush(segment_key, *values)
+                spans_written_per_segment.append(len(values))
+
+            results = p.execute(raise_on_error=False)
+
+        if push_segment_commands:
+            self._retry_unloaded_push_segment(push_segment_commands, results)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
         partitions = list(latest_ts_by_partition.keys())
         with self.client.pipeline() as p:
@@ -89,6 +197,10 @@ class RedisSpansBuffer:
             for result in zip(keys, spans_written_per_segment, results):
                 # Check if this is a new segment, if yes, add to bucket to be processed
                 key, num_written, num_total = result
+                if num_total < 0:
+                    metrics.incr("spans.buffer.segment_overflow", amount=len(spans_map[key]))
+                    continue
+
                 if num_written == num_total:
                     segment_id, project_id, partition = key
                     segment_key = get_segment_key(project_id, segment_id)
@@ -96,7 +208,7 @@ class RedisSpansBuffer:
 
                     timestamp = segment_first_seen_ts[key]
                     p.expire(segment_key, ttl)
-                    p.rpush(bucket, timestamp, segment_key)
+                    p.zadd(bucket, {segment_key: timestamp}, nx=True)
 
             timestamp_results = p.execute()
 
@@ -115,28 +227,80 @@ class RedisSpansBuffer:
 
         return process_segments_contexts
 
-    def read_and_expire_many_segments(self, keys: list[str]) -> list[list[str | bytes]]:
+    def _retry_unloaded_push_segment(
+        self, commands: Sequence[tuple[Any, ...]], results: list[Any]
+    ) -> None:
+        """
+        Load the push script and retry the writes which failed because a node didn't know it yet,
+        e.g. after a restart or a failover. Those writes weren't applied, so they are retried once.
+        """
+        retry_positions = [
+            i for i, result in enumerate(results) if isinstance(result, NoScriptError)
+        ]
+        if not retry_positions:
+            return
+
+        metrics.incr("spans.buffer.push_segment_noscript", amount=len(retry_positions))
+        self.client.script_load(push_segment.script)
+
+        with self.client.pipeline() as p:
+            for i in retry_positions:
+                p.execute_command(*commands[i])
+            for i, result in zip(retry_positions, p.execute(raise_on_error=False)):
+                results[i] = result
+
+    def read_and_expire_many_segments(self, keys: list[str]) -> list[list[bytes]]:
         values = []
         with self.client.pipeline() as p:
             for key in keys:
                 p.lrange(key, 0, -1)
 
-            p.delete(*keys)
+            # Cluster pipelines can only delete one key per command
+            for key in keys:
+                p.delete(key)
+                p.delete(get_segment_size_key(key))
             response = p.execute()
 
-        for value in response[:-1]:
-            values.append(value)
+        for value in response[: len(keys)]:
+            values.append(decode_segment(value))
 
         return values
 
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
-        key = get_unprocessed_segments_key(partition)
-        results = self.client.lrange(key, 0, -1) or []
-
+        """
+        Pop the keys of all segments in the partition which were first seen at
+        least `standalone-spans.buffer-window.seconds` before `now`, oldest
+        first.
+        """
         buffer_window = options.get("standalone-spans.buffer-window.seconds")
 
-        segment_keys = []
+        segment_keys: list[str] = []
+        if options.get("standalone-spans.buffer-drain-legacy-buckets.enable"):
+            segment_keys = self._get_legacy_unprocessed_segments_and_prune_bucket(
+                now, partition, buffer_window
+            )
+
+        results = drain_segments(
+            [get_unprocessed_segments_key(partition)], [now - buffer_window], self.client
+        )
+
         processed_segment_ts = None
+        for segment_key, segment_timestamp in chunked(results, 2):
+            processed_segment_ts = int(float(segment_timestamp))
+            segment_keys.append(segment_key.decode("utf-8"))
+
+        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
+        sentry_sdk.set_context("processed_segment", segment_context)
+
+        return segment_keys
+
+    def _get_legacy_unprocessed_segments_and_prune_bucket(
+        self, now: int, partition: int, buffer_window: int
+    ) -> list[str]:
+        key = get_legacy_unprocessed_segments_key(partition)
+        results = self.client.lrange(key, 0, -1) or []
+
+        segment_keys: list[str] = []
         for result in chunked(results, 2):
             try:
                 segment_timestamp, segment_key = result
@@ -144,16 +308,13 @@ class RedisSpansBuffer:
                 if now - segment_timestamp < buffer_window:
                     break
 
-                processed_segment_ts = segment_timestamp
                 segment_keys.append(segment_key.decode("utf-8"))
             except Exception:
                 # Just in case something funky happens here
                 sentry_sdk.capture_exception()
                 break
 
-        self.client.ltrim(key, len(segment_keys) * 2, -1)
-
-        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
-        sentry_sdk.set_context("processed_segment", segment_context)
+        if results:
+            self.client.ltrim(key, len(segment_keys) * 2, -1)
 
         return segment_keys
@@ -1,10 +1,14 @@
 import re
+import threading
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from typing import Any, NotRequired, Optional, TypedDict
 
+from cachetools import LRUCache
+
+from sentry import options
 from sentry.spans.grouping.utils import Hash, parse_fingerprint_var
-from sentry.utils import urls
+from sentry.utils import metrics, urls
 
 
 class Span(TypedDict):
@@ -27,8 +31,68 @@ class Span(TypedDict):
 # should return `None` to indicate that the strategy should not be used
 # and to try a different strategy. If the strategy does apply, it should
 # return a list of strings that will serve as the span fingerprint.
+#
+# Strategies may only look at the op and the description of the span, since
+# the span groups they produce are cached by those two, see `SpanGroupCache`.
 CallableStrategy = Callable[[Span], Optional[Sequence[str]]]
 
+SPAN_GROUP_CACHE_SIZE = 10000
+
+SpanGroupCacheKey = tuple[str, Optional[str], Optional[str]]
+
+# Per-process cache of (strategy name, span op, span description) -> span group
+_span_group_cache: LRUCache[SpanGroupCacheKey, str] = LRUCache(maxsize=SPAN_GROUP_CACHE_SIZE)
+_span_group_cache_lock = threading.Lock()
+
+
+def clear_span_group_cache() -> None:
+    with _span_group_cache_lock:
+        _span_group_cache.clear()
+
+
+class SpanGroupCache:
+    """
+    The span groups calculated while grouping a batch of events. Spans without a
+    custom fingerprint are grouped by their op and description only, and those
+    repeat a lot within and across events, so their groups are remembered for
+    the rest of the batch and, if enabled, in a per-process LRU cache.
+    """
+
+    def __init__(self, strategy_name: str) -> None:
+        self.strategy_name = strategy_name
+        self.use_process_cache = options.get("spans.grouping.cache.enabled")
+        self.groups: dict[SpanGroupCacheKey, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_span_group(self, span: Span, get_group: Callable[[Span], str]) -> str:
+        if span.get("fingerprint"):
+            return get_group(span)
+
+        key = (self.strategy_name, span.get("op"), span.get("description"))
+        group = self.groups.get(key)
+        if group is None and self.use_process_cache:
+            with _span_group_cache_lock:
+                group = _span_group_cache.get(key)
+
+        if group is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            group = get_group(span)
+            if self.use_process_cache:
+                with _span_group_cache_lock:
+                    _span_group_cache[key] = group
+
+        self.groups[key] = group
+        return group
+
+    def record_metrics(self) -> None:
+        if self.hits:
+            metrics.incr("spans.grouping.cache", amount=self.hits, tags={"result": "hit"})
+        if self.misses:
+            metrics.incr("spans.grouping.cache", amount=self.misses, tags={"result": "miss"})
+
 
 @dataclass(frozen=True)
 class SpanGroupingStrategy:
@@ -37,14 +101,28 @@ class SpanGroupingStrategy:
     strategies: Sequence[CallableStrategy]
 
     def execute(self, event_data: Any) -> dict[str, str]:
-        spans = event_data.get("spans", [])
-        span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+        return self.execute_many([event_data])[0]
+
+    def execute_many(self, events_data: Sequence[Any]) -> list[dict[str, str]]:
+        """Group the spans of a batch of events, calculating the group of
+        spans which are the same in several events only once."""
+        cache = SpanGroupCache(self.name)
+
+        results = []
+        for event_data in events_data:
+            spans = event_data.get("spans", [])
+            span_groups = {
+                span["span_id"]: cache.get_span_group(span, self.get_span_group) for span in spans
+            }
+
+            # make sure to get the group id for the transaction root span
+            span_id = event_data["contexts"]["trace"]["span_id"]
+            span_groups[span_id] = self.get_transaction_span_group(event_data)
 
-        # make sure to get the group id for the transaction root span
-        span_id = event_data["contexts"]["trace"]["span_id"]
-        span_groups[span_id] = self.get_transaction_span_group(event_data)
+            results.append(span_groups)
 
-        return span_groups
+        cache.record_metrics()
+        return results
 
     def get_transaction_span_group(self, event_data: Any) -> str:
         result = Hash()
@@ -30,6 +30,27 @@ class SpanGroupingConfig:
         results = self.strategy.execute(event_data)
         return SpanGroupingResults(self.id, results)
 
+    def execute_strategy_many(self, events_data: Sequence[Any]) -> list[SpanGroupingResults]:
+        grouping_results: list[SpanGroupingResults | None] = []
+        missing_events_data = []
+        for event_data in events_data:
+            existing_results = SpanGroupingResults.from_event(event_data)
+            if existing_results is not None and existing_results.id == self.id:
+                grouping_results.append(existing_results)
+            else:
+                grouping_results.append(None)
+                missing_events_data.append(event_data)
+
+        missing_results = iter(self.strategy.execute_many(missing_events_data))
+        return [
+            (
+                existing_results
+                if existing_results is not None
+                else SpanGroupingResults(self.id, next(missing_results))
+            )
+            for existing_results in grouping_results
+        ]
+
 
 CONFIGURATIONS: dict[str, SpanGroupingConfig] = {}
 
@@ -1,9 +1,12 @@
+import contextvars
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import sentry_sdk
-from django.db import router, transaction
+from django.db import connections, router, transaction
 
+from sentry import options
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -124,22 +127,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
-                project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+            configs = compute_organization_configs(organization)
     elif project_id:
         for project in Project.objects.filter(id=project_id):
             for key in ProjectKey.objects.filter(project_id=project_id):
@@ -178,6 +166,79 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def compute_organization_configs(organization):
+    """Computes the configs of all keys of all projects in the organization which are currently
+    cached.
+
+    The cached configs are looked up all at once and organization-level inputs are only fetched
+    a single time, see :func:`sentry.relay.config.prefetch_organization_inputs`.  The
+    ``relay.invalidate-organization.compute-workers`` option controls how many configs are
+    computed in parallel.
+
+    :returns: A dict mapping the public keys to their new config.
+    """
+    from sentry.models.project import Project
+    from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config import prefetch_organization_inputs
+
+    projects = {}
+    for project in Project.objects.filter(organization_id=organization.id):
+        project.set_cached_field_value("organization", organization)
+        projects[project.id] = project
+
+    keys = []
+    for key in ProjectKey.objects.filter(project_id__in=projects.keys()):
+        key.set_cached_field_value("project", projects[key.project_id])
+        keys.append(key)
+
+    # If we find the config in the cache it means it was active.  As such we want to
+    # recalculate it.  If the config was not there at all, we leave it and avoid the
+    # cost of re-computation.
+    cached_configs = projectconfig_cache.backend.get_many([key.public_key for key in keys])
+    keys_to_compute = [key for key in keys if cached_configs.get(key.public_key) is not None]
+
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(keys_to_compute),
+        tags={"action": "recompute", "scope": "organization"},
+    )
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(keys) - len(keys_to_compute),
+        tags={"action": "not-cached", "scope": "organization"},
+    )
+
+    with prefetch_organization_inputs(organization):
+        workers = options.get("relay.invalidate-organization.compute-workers")
+        if workers <= 1 or len(keys_to_compute) <= 1:
+            return {key.public_key: compute_projectkey_config(key) for key in keys_to_compute}
+
+        # Each thread computes a share of the configs, so it only opens a single set of database
+        # connections
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    _compute_projectkey_configs_in_thread,
+                    keys_to_compute[i::workers],
+                )
+                for i in range(workers)
+            ]
+
+            configs = {}
+            for future in futures:
+                configs.update(future.result())
+            return configs
+
+
+def _compute_projectkey_configs_in_thread(keys):
+    try:
+        return {key.public_key: compute_projectkey_config(key) for key in keys}
+    finally:
+        # Database connections are per thread, don't leak the ones opened in the pool
+        connections.close_all()
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
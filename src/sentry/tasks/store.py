@@ -79,6 +79,25 @@ def submit_process(
     )
 
 
+def fits_inline(data: Mapping[str, Any]) -> bool:
+    """
+    Check whether the event payload is small enough to be passed to the next task as part of the
+    task message, rather than through the processing store. Controlled by the
+    `store.inline-payload.max-bytes` option, 0 disables it.
+    """
+    max_bytes = options.get("store.inline-payload.max-bytes")
+    if max_bytes <= 0:
+        return False
+
+    try:
+        size = len(orjson.dumps(data))
+    except TypeError:
+        return False
+
+    metrics.distribution("events.inline-payload.size", size, unit="byte")
+    return size <= max_bytes
+
+
 @dataclass(frozen=True)
 class SaveEventTaskKind:
     has_attachments: bool = False
@@ -92,9 +111,20 @@ def submit_save_event(
     event_id: str | None,
     start_time: float | None,
     data: MutableMapping[str, Any] | None,
+    data_is_stored: bool = True,
 ) -> None:
     if cache_key:
-        data = None
+        # Small payloads skip the processing store and are passed along with the task. The cache
+        # key is still passed, `save_event` needs it for attachments and to store the event for
+        # post processing.
+        if data is not None and fits_inline(data):
+            metrics.incr("events.inline-payload", tags={"result": "inline"})
+        else:
+            if not data_is_stored:
+                assert data is not None
+                processing.event_processing_store.store(data)
+            metrics.incr("events.inline-payload", tags={"result": "stored"})
+            data = None
 
     # XXX: honor from_reprocessing
     if task_kind.has_attachments:
@@ -121,7 +151,14 @@ def _do_preprocess_event(
     from_reprocessing: bool,
     project: Project | None,
     has_attachments: bool = False,
+    data_is_stored: bool = True,
 ) -> None:
+    """
+    Decide which task an event goes to next.
+
+    If `data_is_stored` is false, the caller has passed `data` without putting it into the
+    processing store, and it's only stored here if the next task needs to read it from there.
+    """
     from sentry.stacktraces.processing import find_stacktraces_in_data
     from sentry.tasks.symbolication import (
         get_symbolication_function_for_platform,
@@ -181,6 +218,8 @@ def _do_preprocess_event(
         ):
             reprocessing2.backup_unprocessed_event(data=original_data)
 
+            if not data_is_stored:
+                processing.event_processing_store.store(data)
             submit_symbolicate(
                 SymbolicatorTaskKind(
                     platform=first_platform,
@@ -197,6 +236,8 @@ def _do_preprocess_event(
 
     # NOTE: Events considered for symbolication always go through `do_process_event`
     if should_symbolicate or should_process(data):
+        if not data_is_stored:
+            processing.event_processing_store.store(data)
         submit_process(
             from_reprocessing=from_reprocessing,
             cache_key=cache_key,
@@ -217,6 +258,7 @@ def _do_preprocess_event(
         event_id=event_id,
         start_time=start_time,
         data=original_data,
+        data_is_stored=data_is_stored,
     )
 
 
@@ -234,6 +276,7 @@ def preprocess_event(
     event_id: str | None = None,
     project: Project | None = None,
     has_attachments: bool = False,
+    data_is_stored: bool = True,
     **kwargs: Any,
 ) -> None:
     return _do_preprocess_event(
@@ -244,6 +287,7 @@ def preprocess_event(
         from_reprocessing=False,
         project=project,
         has_attachments=has_attachments,
+        data_is_stored=data_is_stored,
     )
 
 
@@ -518,8 +562,8 @@ def _do_save_event(
 
     if cache_key and data is None:
         data = processing_store.get(cache_key)
-        if data is not None:
-            event_type = data.get("type") or "none"
+    if data is not None:
+        event_type = data.get("type") or "none"
 
     with metrics.global_tags(event_type=event_type):
         if event_id is None and data is not None:
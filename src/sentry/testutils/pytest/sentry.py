@@ -364,6 +364,11 @@ def pytest_runtest_teardown(item: pytest.Item) -> None:
     ProjectOption.objects.clear_local_cache()
     UserOption.objects.clear_local_cache()
 
+    from sentry.api.event_search import clear_parsed_query_cache
+
+    # Tokens parsed while a test patched the field types must not leak into other tests
+    clear_parsed_query_cache()
+
     sentry_sdk.Scope.get_global_scope().set_client(None)
 
 
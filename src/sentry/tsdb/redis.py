@@ -3,6 +3,7 @@ import itertools
 import logging
 import random
 import uuid
+from array import array
 from collections import defaultdict, namedtuple
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from datetime import datetime
@@ -199,21 +200,22 @@ class RedisTSDB(BaseTSDB):
         """
         model_key = self.get_model_key(key)
 
-        if isinstance(model_key, int):
-            vnode = model_key % self.vnodes
-        else:
-            vnode = _crc32(force_bytes(model_key)) % self.vnodes
-
         return (
             "{prefix}{model}:{epoch}:{vnode}".format(
                 prefix=self.prefix,
                 model=model.value,
                 epoch=self.normalize_to_rollup(timestamp, rollup),
-                vnode=vnode,
+                vnode=self.get_counter_vnode(model_key),
             ),
             self.add_environment_parameter(model_key, environment_id),
         )
 
+    def get_counter_vnode(self, model_key: int | str) -> int:
+        if isinstance(model_key, int):
+            return model_key % self.vnodes
+        else:
+            return _crc32(force_bytes(model_key)) % self.vnodes
+
     def get_model_key(self, key: int | str | bytes) -> int | str:
         # We specialize integers so that a pure int-map can be optimized by
         # Redis, whereas long strings (say tag values) will store in a more
@@ -338,29 +340,77 @@ class RedisTSDB(BaseTSDB):
 
         self.validate_arguments([model], [environment_id])
 
+        timestamps, counts = self.get_range_arrays(model, keys, start, end, rollup, environment_id)
+        return {key: list(zip(timestamps, key_counts)) for key, key_counts in counts.items()}
+
+    def get_sums(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+    ) -> dict[int, int]:
+        self.validate_arguments([model], [environment_id])
+
+        _, counts = self.get_range_arrays(model, keys, start, end, rollup, environment_id)
+        return {key: sum(key_counts) for key, key_counts in counts.items()}
+
+    def get_range_arrays(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+    ) -> tuple[list[int], dict[TSDBKey, array[int]]]:
+        """
+        Get the counters of ``keys`` in the range as a list of the timestamps of the rollup
+        buckets, and an array of the counts in those buckets for every key.
+
+        The fields of all keys which share a hash (the same bucket and vnode) are read with a
+        single HMGET, so the number of commands only depends on the number of buckets and vnodes,
+        and the counts are written straight into the arrays of the keys.
+        """
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        _series = [to_datetime(item) for item in series]
+        timestamps = [int(to_datetime(item).timestamp()) for item in series]
+        if not timestamps:
+            return timestamps, {}
+
+        unique_keys = list(dict.fromkeys(keys))
+        counts = {key: array("q", bytes(8 * len(timestamps))) for key in unique_keys}
+
+        # The keys sharing a hash, and their fields in it
+        keys_by_vnode: dict[int, tuple[list[TSDBKey], list[str | int]]] = defaultdict(
+            lambda: ([], [])
+        )
+        for key in unique_keys:
+            model_key = self.get_model_key(key)
+            vnode_keys, vnode_fields = keys_by_vnode[self.get_counter_vnode(model_key)]
+            vnode_keys.append(key)
+            vnode_fields.append(self.add_environment_parameter(model_key, environment_id))
 
         results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in _series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (int(timestamp.timestamp()), key, client.hget(hash_key, hash_field))
-                    )
-
-        results_by_key: dict[TSDBKey, dict[int, int]] = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
-
-        output = {}
-        for key, points in results_by_key.items():
-            output[key] = sorted(points.items())
-        return output
+            for position, timestamp in enumerate(timestamps):
+                epoch = self.normalize_to_rollup(timestamp, rollup)
+                for vnode, (vnode_keys, vnode_fields) in keys_by_vnode.items():
+                    hash_key = f"{self.prefix}{model.value}:{epoch}:{vnode}"
+                    results.append((position, vnode_keys, client.hmget(hash_key, vnode_fields)))
+
+        for position, vnode_keys, promise in results:
+            for key, count in zip(vnode_keys, promise.value):
+                if count:
+                    counts[key][position] = int(count)
+
+        return timestamps, counts
 
     def merge(
         self,
@@ -2,6 +2,7 @@ import zlib
 from abc import ABC, abstractmethod
 from typing import Any, Generic, TypeVar
 
+import msgpack
 import zstandard
 
 from sentry.utils import json
@@ -77,6 +78,19 @@ class JSONCodec(Codec[Any, str]):
         return json.loads(value)
 
 
+class MsgpackCodec(Codec[Any, bytes]):
+    """
+    Encode/decode Python data structures to/from msgpack. Types msgpack doesn't support natively
+    are converted the same way `JSONCodec` converts them.
+    """
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=json.better_default_encoder)
+
+    def decode(self, value: bytes) -> Any:
+        return msgpack.unpackb(value, strict_map_key=False)
+
+
 class ZlibCodec(Codec[bytes, bytes]):
     def encode(self, value: bytes) -> bytes:
         return zlib.compress(value)
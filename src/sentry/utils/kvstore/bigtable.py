@@ -10,9 +10,10 @@ import sentry_sdk
 from django.utils import timezone
 from google.api_core import exceptions, retry
 from google.cloud import bigtable
-from google.cloud.bigtable.row import PartialRowData
+from google.cloud.bigtable.row import DirectRow, PartialRowData
 from google.cloud.bigtable.row_set import RowSet
 from google.cloud.bigtable.table import Table
+from google.rpc import code_pb2
 
 from sentry.utils.codecs import Codec, ZlibCodec, ZstdCodec
 from sentry.utils.kvstore.abstract import KVStorage
@@ -24,6 +25,11 @@ class BigtableError(Exception):
     pass
 
 
+# The status codes of rows in a batch write which are worth retrying, the same failures for which
+# `BigtableKVStorage.set` retries
+RETRYABLE_CODES = frozenset([code_pb2.INTERNAL, code_pb2.UNAVAILABLE])
+
+
 class BigtableKVStorage(KVStorage[str, bytes]):
     column_family = "x"
 
@@ -185,9 +191,56 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             return self._set(key, value, ttl)
 
     def _set(self, key: str, value: bytes, ttl: timedelta | None = None) -> None:
+        row = self._build_row(self._get_table(), key, value, ttl)
+
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        try:
+            errors = self._set_many(items, ttl)
+            retry_keys = [key for key, error in errors.items() if error.args[0] in RETRYABLE_CODES]
+        except (exceptions.InternalServerError, exceptions.ServiceUnavailable):
+            errors = {}
+            retry_keys = list(items)
+
+        if retry_keys:
+            # Delete cached client before retry
+            with self.__table_lock:
+                del self.__table
+            # Retry the failed rows once, the same as `set` does
+            for key in retry_keys:
+                errors.pop(key, None)
+            errors.update(self._set_many({key: items[key] for key in retry_keys}, ttl))
+
+        if errors:
+            (key, error), *others = errors.items()
+            error.add_note(f"Failed to write row {key!r}")
+            for other_key, other_error in others:
+                error.add_note(f"Also failed to write row {other_key!r}: {other_error}")
+            raise error
+
+    def _set_many(
+        self, items: Mapping[str, bytes], ttl: timedelta | None = None
+    ) -> dict[str, BigtableError]:
+        """
+        Write the rows in a single batch, returning the errors of the rows which failed.
+        """
+        table = self._get_table()
+        rows = [self._build_row(table, key, value, ttl) for key, value in items.items()]
+
+        errors = {}
+        for key, status in zip(items, table.mutate_rows(rows)):
+            if status.code != 0:
+                errors[key] = BigtableError(status.code, status.message)
+
+        return errors
+
+    def _build_row(self, table: Table, key: str, value: bytes, ttl: timedelta | None) -> DirectRow:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -245,9 +298,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
 
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
@@ -93,6 +93,13 @@ class PerformanceDetector(ABC):
     def visit_span(self, span: Span) -> None:
         raise NotImplementedError
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        """
+        The prefixes of the ops of all spans which can affect detection. When detection runs on a
+        `SpanIndex`, `visit_span` is only called for those spans. `None` visits every span.
+        """
+        return None
+
     def on_complete(self) -> None:
         pass
 
@@ -55,6 +55,9 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
         self.spans: list[Span] = []
         self.span_hashes: dict[str, str | None] = {}
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        return tuple(self.settings.get("allowed_span_ops", []))
+
     def visit_span(self, span: Span) -> None:
         if not NPlusOneAPICallsDetector.is_span_eligible(span):
             return
@@ -41,6 +41,16 @@ class SlowDBQueryDetector(PerformanceDetector):
 
         self.stored_problems = {}
 
+    def get_span_op_prefixes(self) -> tuple[str, ...] | None:
+        op_prefixes: list[str] = []
+        for setting in self.settings:
+            allowed_span_ops = setting.get("allowed_span_ops", [])
+            if not allowed_span_ops:
+                # See `find_span_prefix`, no allowed ops allows all of them
+                return None
+            op_prefixes.extend(allowed_span_ops)
+        return tuple(op_prefixes)
+
     def visit_span(self, span: Span) -> None:
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
@@ -10,6 +10,7 @@ import sentry_sdk
 
 from sentry import nodestore, options, projectoptions
 from sentry.eventstore.models import Event, GroupEvent
+from sentry.features.rollout import in_random_rollout
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -35,6 +36,7 @@ from .detectors.render_blocking_asset_span_detector import RenderBlockingAssetSp
 from .detectors.slow_db_query_detector import SlowDBQueryDetector
 from .detectors.uncompressed_asset_detector import UncompressedAssetSpanDetector
 from .performance_problem import PerformanceProblem
+from .span_index import SpanIndex
 
 PERFORMANCE_GROUP_COUNT_LIMIT = 10
 INTEGRATIONS_OF_INTEREST = [
@@ -346,11 +348,22 @@ def _detect_performance_problems(
             if detector_class.is_detector_enabled()
         ]
 
+    span_index = None
+    if in_random_rollout("performance.issues.span-index.rollout"):
+        with sentry_sdk.start_span(op="function", name="build_span_index"):
+            span_index = SpanIndex(data.get("spans", []))
+
     for detector in detectors:
-        with sentry_sdk.start_span(
-            op="function", name=f"run_detector_on_data.{detector.type.value}"
+        with (
+            sentry_sdk.start_span(
+                op="function", name=f"run_detector_on_data.{detector.type.value}"
+            ),
+            metrics.timer(
+                "performance.performance_issue.detector.duration",
+                tags={"detector": detector.type.value, "span_index": span_index is not None},
+            ),
         ):
-            run_detector_on_data(detector, data)
+            run_detector_on_data(detector, data, span_index)
 
     with sentry_sdk.start_span(op="function", name="report_metrics_for_detectors"):
         # Metrics reporting only for detection, not created issues.
@@ -398,11 +411,16 @@ def _detect_performance_problems(
     return list(unique_problems)
 
 
-def run_detector_on_data(detector: PerformanceDetector, data: dict[str, Any]) -> None:
+def run_detector_on_data(
+    detector: PerformanceDetector, data: dict[str, Any], span_index: SpanIndex | None = None
+) -> None:
     if not detector.is_event_eligible(data):
         return
 
     spans = data.get("spans", [])
+    if span_index is not None and (op_prefixes := detector.get_span_op_prefixes()) is not None:
+        spans = span_index.get_spans_with_op_prefixes(op_prefixes)
+
     for span in spans:
         detector.visit_span(span)
 
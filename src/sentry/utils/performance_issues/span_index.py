@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Sequence
+
+from .types import Span
+
+
+class SpanIndex:
+    """
+    The spans of an event grouped by op. Built once per event and shared by all detectors, so the
+    ones which are only interested in a few ops don't have to walk every span of the event.
+    """
+
+    def __init__(self, spans: Sequence[Span]) -> None:
+        self.spans = spans
+
+        self._positions_by_op: defaultdict[str, list[int]] = defaultdict(list)
+        for position, span in enumerate(spans):
+            op = span.get("op")
+            if op and isinstance(op, str):
+                self._positions_by_op[op].append(position)
+
+        self._spans_by_op_prefixes: dict[tuple[str, ...], list[Span]] = {}
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def get_spans_with_op_prefixes(self, prefixes: tuple[str, ...]) -> list[Span]:
+        """Return the spans whose op starts with any of the `prefixes`, in event order."""
+        spans = self._spans_by_op_prefixes.get(prefixes)
+        if spans is None:
+            positions = sorted(
+                position
+                for op, op_positions in self._positions_by_op.items()
+                if op.startswith(prefixes)
+                for position in op_positions
+            )
+            spans = self._spans_by_op_prefixes[prefixes] = [self.spans[p] for p in positions]
+
+        return spans
@@ -0,0 +1,82 @@
+import pytest
+
+from sentry.api.event_search import clear_parsed_query_cache, parse_search_query
+from sentry.api.issue_search import parse_search_query as parse_issue_search_query
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_REPEATS = 20
+
+# Queries of the kind dashboard widgets and issue streams send over and over
+DASHBOARD_QUERIES = [
+    "",
+    "event.type:transaction",
+    "event.type:error",
+    "!event.type:transaction",
+    "event.type:transaction transaction.op:pageload",
+    "event.type:transaction transaction.op:navigation browser.name:Chrome",
+    "event.type:transaction transaction:/api/0/organizations/*",
+    "event.type:error level:[error, fatal] handled:no",
+    "event.type:error error.type:TypeError OR error.type:ValueError",
+    "transaction.duration:>2s transaction.status:ok",
+    "transaction.duration:<100ms http.method:GET",
+    "measurements.lcp:>2500 measurements.fcp:>1800",
+    "p95(transaction.duration):>1s count():>100",
+    "failure_rate():>0.05 transaction:/checkout/*",
+    "has:user.email !user.email:*@example.com",
+    "release:[frontend@1.0.0, frontend@1.0.1] environment:production",
+    'message:"Connection reset by peer" os.name:Linux',
+    "(browser.name:Firefox OR browser.name:Safari) device.family:iPhone",
+    "project.id:[1, 2, 3] http.status_code:[500, 502, 503]",
+    "sdk.name:sentry.javascript.react geo.country_code:US",
+]
+
+ISSUE_STREAM_QUERIES = [
+    "is:unresolved",
+    "is:unresolved is:for_review assigned_or_suggested:[me, my_teams, none]",
+    "is:unresolved issue.category:error",
+    "is:unresolved level:error times_seen:>100",
+    "is:unresolved !has:assigned issue.priority:[high, medium]",
+    "is:ignored",
+    "is:regressed firstRelease:latest",
+    "is:unresolved error.unhandled:true",
+]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cached", [False, True])
+def test_benchmark_parse_search_query(benchmark, cached):
+    def parse():
+        results = []
+        for _ in range(NUM_REPEATS):
+            for query in DASHBOARD_QUERIES:
+                if not cached:
+                    clear_parsed_query_cache()
+                results.append(parse_search_query(query))
+        return results
+
+    clear_parsed_query_cache()
+    results = benchmark.pedantic(parse, rounds=3)
+
+    assert len(results) == NUM_REPEATS * len(DASHBOARD_QUERIES)
+    clear_parsed_query_cache()
+    assert results[: len(DASHBOARD_QUERIES)] == [
+        parse_search_query(query) for query in DASHBOARD_QUERIES
+    ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cached", [False, True])
+def test_benchmark_parse_issue_search_query(benchmark, cached):
+    def parse():
+        results = []
+        for _ in range(NUM_REPEATS):
+            for query in ISSUE_STREAM_QUERIES:
+                if not cached:
+                    clear_parsed_query_cache()
+                results.append(parse_issue_search_query(query))
+        return results
+
+    clear_parsed_query_cache()
+    results = benchmark.pedantic(parse, rounds=3)
+
+    assert len(results) == NUM_REPEATS * len(ISSUE_STREAM_QUERIES)
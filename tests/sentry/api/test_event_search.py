@@ -8,12 +8,16 @@ from django.test import SimpleTestCase
 from django.utils import timezone
 
 from sentry.api.event_search import (
+    PARSED_QUERY_CACHE_MAX_QUERY_LENGTH,
     AggregateFilter,
     AggregateKey,
     SearchConfig,
     SearchFilter,
     SearchKey,
     SearchValue,
+    SearchVisitor,
+    clear_parsed_query_cache,
+    event_search_grammar,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
@@ -639,6 +643,90 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         assert search_filter.value.value == 'a"b'
 
 
+class ParsedQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        clear_parsed_query_cache()
+
+    def test_cached(self):
+        query = "user.email:foo@example.com (transaction:/api/* OR count():>10)"
+        tokens = parse_search_query(query)
+
+        with patch.object(SearchVisitor, "visit") as visit:
+            assert parse_search_query(query) == tokens
+        assert not visit.called
+
+    def test_long_query_not_cached(self):
+        query = " ".join(f"tag{i}:value{i}" for i in range(200))
+        assert len(query) > PARSED_QUERY_CACHE_MAX_QUERY_LENGTH
+        tokens = parse_search_query(query)
+
+        with patch(
+            "sentry.api.event_search.event_search_grammar.parse",
+            wraps=event_search_grammar.parse,
+        ) as grammar_parse:
+            assert parse_search_query(query) == tokens
+        assert grammar_parse.call_count == 1
+
+    def test_cached_tokens_are_copied(self):
+        query = "(release:[a, b] OR title:foo) issue.id:1"
+        tokens = parse_search_query(query)
+        expected = parse_search_query(query)
+        assert tokens == expected
+
+        tokens[0].children[0].value.raw_value.append("c")
+        tokens[0].children.pop()
+        tokens.pop()
+
+        assert parse_search_query(query) == expected
+
+    def test_config_and_params(self):
+        query = "someValue:123"
+        config = SearchConfig(key_mappings={"target_value": ["someValue"]})
+
+        assert parse_search_query(query) == [
+            SearchFilter(key=SearchKey(name="someValue"), operator="=", value=SearchValue("123"))
+        ]
+        assert parse_search_query(query, config=config) == [
+            SearchFilter(key=SearchKey(name="target_value"), operator="=", value=SearchValue("123"))
+        ]
+
+        with patch("sentry.api.event_search.SearchVisitor", wraps=SearchVisitor) as visitor:
+            parse_search_query(query, params={"environment": "prod", "end": timezone.now()})
+            parse_search_query(query, params={"environment": "prod", "end": timezone.now()})
+            assert visitor.call_count == 1
+            parse_search_query(query, params={"environment": "dev"})
+            assert visitor.call_count == 2
+
+    def test_relative_dates_not_cached(self):
+        now = timezone.now()
+        with freeze_time(now):
+            assert parse_search_query("time:-1d") == [
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(days=1)),
+                )
+            ]
+
+        with freeze_time(now + timedelta(hours=1)):
+            assert parse_search_query("time:-1d") == [
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(hours=23)),
+                )
+            ]
+
+    def test_custom_field_types_not_cached(self):
+        query = "foo:1kb"
+        assert parse_search_query(query, get_field_type=lambda _: "byte") == [
+            SearchFilter(key=SearchKey(name="foo"), operator="=", value=SearchValue(1000.0))
+        ]
+        assert parse_search_query(query, get_field_type=lambda _: None) == [
+            SearchFilter(key=SearchKey(name="foo"), operator="=", value=SearchValue("1kb"))
+        ]
+
+
 @pytest.mark.parametrize(
     "raw,result",
     [
@@ -6,6 +6,7 @@ from pytest import raises
 
 from sentry.buffer.base import Buffer
 from sentry.db import models
+from sentry.db.models.query import bulk_increment
 from sentry.models.group import Group
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -79,6 +80,33 @@ class BufferTest(TestCase):
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
 
+    def test_process_many(self):
+        groups = [Group.objects.create(project=Project(id=1)) for _ in range(3)]
+        # Make sure the groups are cached, to check the cache gets updated
+        for group in groups:
+            Group.objects.get_from_cache(id=group.id)
+        the_date = timezone.now() + timedelta(days=5)
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+
+        with mock.patch("sentry.buffer.base.bulk_increment", wraps=bulk_increment) as bulk:
+            self.buf.process_many(
+                [
+                    (Group, {"times_seen": 1}, {"id": groups[0].id}, {"last_seen": the_date}, None),
+                    (Group, {"times_seen": 5}, {"pk": groups[1].id}, {"last_seen": the_date}, None),
+                    (Group, {"times_seen": 2}, {"id": groups[2].id}, {}, None),
+                    (Group, {"times_seen": 1}, {"id": 0}, {}, None),
+                    (ReleaseProject, {"new_groups": 1}, filters, None, None),
+                ]
+            )
+
+        # One statement for the groups setting `last_seen`, one for those that don't
+        assert bulk.call_count == 2
+        assert Group.objects.get_from_cache(id=groups[0].id).times_seen == groups[0].times_seen + 1
+        assert Group.objects.get_from_cache(id=groups[0].id).last_seen == the_date
+        assert Group.objects.get_from_cache(id=groups[1].id).times_seen == groups[1].times_seen + 5
+        assert Group.objects.get(id=groups[2].id).times_seen == groups[2].times_seen + 2
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
+
     def test_push_to_hash_bulk(self):
         raises(NotImplementedError, self.buf.push_to_hash_bulk, Group, {"id": 1}, {"foo": "bar"})
 
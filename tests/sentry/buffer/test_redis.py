@@ -1,11 +1,14 @@
 import datetime
+import os
 import pickle
+import weakref
 from collections import defaultdict
 from collections.abc import Mapping
 from unittest import mock
 from unittest.mock import Mock
 
 import pytest
+from celery.signals import worker_process_shutdown
 from django.utils import timezone
 
 from sentry import options
@@ -13,6 +16,7 @@ from sentry.buffer.redis import (
     BufferHookEvent,
     RedisBuffer,
     _get_model_key,
+    _reset_coalescer_after_fork,
     redis_buffer_registry,
     redis_buffer_router,
 )
@@ -21,6 +25,7 @@ from sentry.models.project import Project
 from sentry.rules.processing.delayed_processing import process_delayed_alert_conditions
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
 from sentry.utils.redis import get_cluster_routing_client
@@ -209,6 +214,136 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    @override_options({"buffer.incr.coalesce.max-size": 3, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesces_calls(self):
+        earlier = datetime.datetime(2017, 5, 3, 6, 6, 6, tzinfo=datetime.UTC)
+        later = earlier + datetime.timedelta(seconds=10)
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1}
+        key = self.buf._make_key(model, filters=filters)
+
+        self.buf.incr(model, {"times_seen": 1}, filters, extra={"last_seen": later})
+        self.buf.incr(model, {"times_seen": 2}, filters, extra={"last_seen": earlier})
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2}, extra={"last_seen": earlier})
+
+        # Nothing is written until either the size or the age limit is hit
+        assert client.zrange("b:p", 0, -1) == []
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 0}
+
+        self.buf.flush_coalesced()
+
+        assert self.buf.get(model, ["times_seen"], filters=filters) == {"times_seen": 3}
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        if self.buf.is_redis_cluster:
+            last_seen = self.buf._load_value(json.loads(result["e+last_seen"]))
+        else:
+            last_seen = pickle.loads(result["e+last_seen"])
+        assert last_seen == later
+        assert len(client.zrange("b:p", 0, -1)) == 2
+
+    @override_options({"buffer.incr.coalesce.max-size": 2, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_flushes_at_max_size(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 0}
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 1}
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 2}) == {"times_seen": 1}
+
+    @override_options({"buffer.incr.coalesce.max-size": 2, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_keeps_counts_on_failed_flush(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        with (
+            mock.patch.object(self.buf, "_add_incr_to_pipeline", side_effect=Exception("boom")),
+            pytest.raises(Exception),
+        ):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+
+        assert len(self.buf._coalescer) == 2
+        self.buf.flush_coalesced()
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 1}
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 2}) == {"times_seen": 1}
+
+    @override_options({"buffer.incr.coalesce.max-size": 3, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_only_restores_rejected_commands(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        rejected_key = self.buf._make_key(model, filters={"pk": 2})
+        add_incr_to_pipeline = self.buf._add_incr_to_pipeline
+
+        def reject_increments(pipe, key, model, columns, *args):
+            if key == rejected_key:
+                # Not an integer, so HINCRBY fails
+                columns = {column: "x" for column in columns}
+            return add_incr_to_pipeline(pipe, key, model, columns, *args)
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+        with (
+            mock.patch.object(self.buf, "_add_incr_to_pipeline", side_effect=reject_increments),
+            pytest.raises(Exception),
+        ):
+            self.buf.flush_coalesced()
+
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 1}
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 2}) == {"times_seen": 0}
+        assert len(self.buf._coalescer) == 1
+
+        self.buf.flush_coalesced()
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 1}
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 2}) == {"times_seen": 1}
+
+    @override_options({"buffer.incr.coalesce.max-size": 3, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_drops_failed_pipelines(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        add_incr_to_pipeline = self.buf._add_incr_to_pipeline
+
+        def fail_execute(pipe, *args):
+            pipe.execute = mock.Mock(side_effect=ConnectionError("boom"))
+            return add_incr_to_pipeline(pipe, *args)
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        with (
+            mock.patch.object(self.buf, "_add_incr_to_pipeline", side_effect=fail_execute),
+            pytest.raises(ConnectionError),
+        ):
+            self.buf.flush_coalesced()
+
+        # Some of the commands may have been applied, so nothing is retried
+        assert len(self.buf._coalescer) == 0
+
+    @override_options({"buffer.incr.coalesce.max-size": 3, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_flushes_on_worker_process_shutdown(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 0}
+
+        worker_process_shutdown.send(sender=None, pid=os.getpid(), exitcode=0)
+        assert self.buf.get(model, ["times_seen"], filters={"pk": 1}) == {"times_seen": 1}
+
+    @override_options({"buffer.incr.coalesce.max-size": 3, "buffer.incr.coalesce.max-age": 60.0})
+    def test_incr_coalesce_resets_after_fork(self):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        assert len(self.buf._coalescer) == 1
+
+        # What `os.register_at_fork` runs in the child
+        _reset_coalescer_after_fork(weakref.ref(self.buf._coalescer))
+        assert len(self.buf._coalescer) == 0
+
     def group_rule_data_by_project_id(self, buffer, project_ids):
         project_ids_to_rule_data = defaultdict(list)
         for proj_id in project_ids:
@@ -606,6 +741,30 @@ class TestRedisBuffer:
         redis_buffer_router._routers = original_routers
         assert num_of_calls == 1
 
+    @django_db_all
+    @override_options({"buffer.process.bulk-flush": True})
+    def test_process_bulk(self, default_project):
+        groups = [Group.objects.create(project=default_project) for _ in range(2)]
+        the_date = timezone.now() + datetime.timedelta(days=5)
+        keys = []
+        for times_seen, group in enumerate(groups, 1):
+            for _ in range(times_seen):
+                self.buf.incr(Group, {"times_seen": 1}, {"id": group.id}, {"last_seen": the_date})
+            keys.append(self.buf._make_key(Group, {"id": group.id}))
+
+        with mock.patch.object(self.buf, "process_many", wraps=self.buf.process_many) as many:
+            self.buf.process(batch_keys=keys)
+
+        assert many.call_count == 1
+        for times_seen, group in enumerate(groups, 1):
+            updated_group = Group.objects.get(id=group.id)
+            assert updated_group.times_seen == group.times_seen + times_seen
+            assert updated_group.last_seen == the_date
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+        assert self.buf.get(Group, ["times_seen"], {"id": groups[0].id}) == {"times_seen": 0}
+
     @django_db_all
     @freeze_time()
     def test_incr_uses_signal_only(self, default_group, task_runner):
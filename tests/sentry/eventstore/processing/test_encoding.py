@@ -0,0 +1,64 @@
+from sentry.eventstore.processing.encoding import COMPACT_FORMAT_HEADER, EventPayloadCodec
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.kvstore.memory import MemoryKVStorage
+
+EVENT = {
+    "event_id": "a" * 32,
+    "platform": "native",
+    "exception": {"values": [{"type": "SIGSEGV", "stacktrace": {"frames": [{"addr": 1}] * 50}}]},
+    "tags": [["level", "error"]],
+}
+
+
+def test_json_encoding() -> None:
+    store: MemoryKVStorage[str, bytes] = MemoryKVStorage()
+    wrapper = KVStorageCodecWrapper(store, EventPayloadCodec())
+
+    with override_options({"eventstore.processing.compact-encoding": 0.0}):
+        wrapper.set("key", EVENT)
+
+    encoded = store.get("key")
+    assert encoded is not None
+    assert encoded.startswith(b"{")
+    assert wrapper.get("key") == EVENT
+
+
+def test_compact_encoding() -> None:
+    store: MemoryKVStorage[str, bytes] = MemoryKVStorage()
+    wrapper = KVStorageCodecWrapper(store, EventPayloadCodec())
+
+    with override_options({"eventstore.processing.compact-encoding": 1.0}):
+        wrapper.set("key", EVENT)
+
+    encoded = store.get("key")
+    assert encoded is not None
+    assert encoded.startswith(COMPACT_FORMAT_HEADER)
+    assert len(encoded) < len(EventPayloadCodec().json_codec.encode(EVENT))
+    assert wrapper.get("key") == EVENT
+
+
+def test_mixed_formats() -> None:
+    store: MemoryKVStorage[str, bytes] = MemoryKVStorage()
+    wrapper = KVStorageCodecWrapper(store, EventPayloadCodec())
+
+    with override_options({"eventstore.processing.compact-encoding": 0.0}):
+        wrapper.set("json", EVENT)
+    with override_options({"eventstore.processing.compact-encoding": 1.0}):
+        wrapper.set("compact", EVENT)
+
+    # Reading doesn't depend on the option
+    for rate in (0.0, 1.0):
+        with override_options({"eventstore.processing.compact-encoding": rate}):
+            assert dict(wrapper.get_many(["json", "compact"])) == {"json": EVENT, "compact": EVENT}
+
+
+def test_compact_encoding_falls_back_to_json() -> None:
+    codec = EventPayloadCodec()
+    event = {**EVENT, "extra": {"huge": 2**70}}
+
+    with override_options({"eventstore.processing.compact-encoding": 1.0}):
+        encoded = codec.encode(event)
+
+    assert encoded.startswith(b"{")
+    assert codec.decode(encoded) == event
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from sentry.eventstore.models import Event
+from sentry.grouping.api import get_grouping_config_dict_for_project, load_grouping_config
+from sentry.grouping.ingest.caching import (
+    clear_grouping_cache,
+    get_grouping_cache_key,
+    get_hashes_and_variants_with_cache,
+)
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+
+
+class GroupingCacheTest(TestCase):
+    def setUp(self) -> None:
+        clear_grouping_cache()
+        self.grouping_config = get_grouping_config_dict_for_project(self.project)
+        self.loaded_grouping_config = load_grouping_config(self.grouping_config)
+
+    def make_event(self, **overrides: Any) -> Event:
+        data = {
+            "platform": "python",
+            "exception": {
+                "values": [
+                    {
+                        "type": "FailedToFetchError",
+                        "value": "Charlie didn't bring the ball back",
+                        "stacktrace": {
+                            "frames": [{"function": "play_fetch", "filename": "dogpark.py"}]
+                        },
+                    }
+                ]
+            },
+            **overrides,
+        }
+        return Event(project_id=self.project.id, event_id="a" * 32, data=data)
+
+    def get_hashes_and_variants(self, event: Event):
+        return get_hashes_and_variants_with_cache(
+            self.project, event, self.grouping_config, self.loaded_grouping_config
+        )
+
+    def test_cache_key_ignores_non_grouping_data(self) -> None:
+        key = get_grouping_cache_key(self.project, self.make_event(), self.grouping_config)
+
+        assert key is not None
+        assert key == get_grouping_cache_key(
+            self.project, self.make_event(tags=[["dog", "charlie"]]), self.grouping_config
+        )
+        assert key != get_grouping_cache_key(
+            self.project, self.make_event(platform="javascript"), self.grouping_config
+        )
+        assert key != get_grouping_cache_key(
+            self.project,
+            self.make_event(),
+            {**self.grouping_config, "enhancements": "some other enhancements"},
+        )
+
+    def test_no_cache_key_for_fingerprint_variables(self) -> None:
+        assert (
+            get_grouping_cache_key(
+                self.project,
+                self.make_event(fingerprint=["{{ default }}", "{{ tags.dog }}"]),
+                self.grouping_config,
+            )
+            is None
+        )
+        assert (
+            get_grouping_cache_key(
+                self.project,
+                self.make_event(fingerprint=["{{ default }}", "dogs are great"]),
+                self.grouping_config,
+            )
+            is not None
+        )
+
+    @patch("sentry.grouping.ingest.caching.metrics.incr")
+    def test_reuses_results_for_identical_events(self, mock_metrics_incr: MagicMock) -> None:
+        with override_options({"grouping.variants_cache.enabled": True}):
+            first_event = self.make_event()
+            first_hashes, first_variants = self.get_hashes_and_variants(first_event)
+
+            second_event = self.make_event()
+            with patch.object(Event, "get_hashes_and_variants") as mock_get_hashes_and_variants:
+                second_hashes, second_variants = self.get_hashes_and_variants(second_event)
+
+        assert mock_get_hashes_and_variants.call_count == 0
+        assert second_hashes == first_hashes
+        assert second_variants is first_variants
+        assert second_event.data["hashes"] == first_event.data["hashes"]
+
+        assert [
+            call.kwargs["tags"]["result"]
+            for call in mock_metrics_incr.call_args_list
+            if call.args[0] == "grouping.variants_cache"
+        ] == ["miss", "hit"]
+
+    def test_disabled_by_default(self) -> None:
+        self.get_hashes_and_variants(self.make_event())
+
+        with patch.object(
+            Event, "get_hashes_and_variants", return_value=([], {})
+        ) as mock_get_hashes_and_variants:
+            self.get_hashes_and_variants(self.make_event())
+
+        assert mock_get_hashes_and_variants.call_count == 1
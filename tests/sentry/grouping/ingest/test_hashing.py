@@ -8,10 +8,13 @@ from sentry.grouping.ingest.hashing import (
     _calculate_background_grouping,
     _calculate_event_grouping,
     _calculate_secondary_hashes,
+    get_or_create_grouphashes,
 )
 from sentry.models.group import Group
+from sentry.models.grouphash import GroupHash
 from sentry.projectoptions.defaults import LEGACY_GROUPING_CONFIG
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.eventprocessing import save_new_event
 from sentry.testutils.skips import requires_snuba
 
 pytestmark = [requires_snuba]
@@ -169,3 +172,39 @@ class SecondaryGroupingTest(TestCase):
             mock_capture_exception.assert_called_with(secondary_grouping_error)
             # This proves the secondary grouping crash didn't crash the overall grouping process
             assert event.group
+
+
+class GetOrCreateGrouphashesTest(TestCase):
+    def test_only_creates_missing_grouphashes(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        assert event.group
+
+        with patch.object(
+            GroupHash.objects, "get_or_create", wraps=GroupHash.objects.get_or_create
+        ) as mock_get_or_create:
+            new_event = save_new_event({"message": "Dogs are great!"}, self.project)
+
+        assert new_event.group_id == event.group_id
+        assert mock_get_or_create.call_count == 0
+
+        with patch.object(
+            GroupHash.objects, "get_or_create", wraps=GroupHash.objects.get_or_create
+        ) as mock_get_or_create:
+            save_new_event({"message": "Adopt, don't shop"}, self.project)
+
+        assert mock_get_or_create.call_count == 1
+
+    def test_existing_grouphash_comes_with_group(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+
+        grouphashes = get_or_create_grouphashes(
+            event,
+            self.project,
+            event.get_grouping_variants(),
+            event.get_hashes(),
+            self.project.get_option("sentry:grouping_config"),
+        )
+
+        assert len(grouphashes) == 1
+        with self.assertNumQueries(0):
+            assert grouphashes[0].group == event.group
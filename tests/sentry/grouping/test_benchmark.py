@@ -1,21 +1,16 @@
 import pytest
 
+from sentry.grouping.enhancer.matchers import _create_match_frame_cached, create_match_frame
+from sentry.grouping.parameterization import Parameterizer, get_parameterization_scanner
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.safe import get_path
 from tests.sentry.grouping import GROUPING_INPUTS_DIR, GroupingInput, get_grouping_inputs
 
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name",
     sorted(CONFIGURATIONS.keys()),
@@ -37,3 +32,84 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+PARAMETERIZATION_PATTERN_KEYS = (
+    "email",
+    "url",
+    "hostname",
+    "ip",
+    "uuid",
+    "sha1",
+    "md5",
+    "date",
+    "duration",
+    "hex",
+    "float",
+    "int",
+    "quoted_str",
+    "bool",
+)
+
+# A mix of typical high-volume log messages, repeated the way they would be in a noisy project
+PARAMETERIZATION_MESSAGES = [
+    "Connection to 10.0.12.7:5432 timed out after 3000ms",
+    "Failed to fetch https://api.example.com/v1/users/8812?expand=org: 503 Service Unavailable",
+    "User jane.doe@example.com exceeded rate limit (limit=100, window=60s)",
+    "Job 7c1811ed-e98f-4c9c-a9f9-58c757ff494f failed at 2024-02-20T22:16:36Z with code -1",
+    "Cache miss for key user:8812:profile checksum=0751007cd28df267e8e051b51f918c60",
+    "Worker pid=4412 exited with signal 0x9 while processing batch 1.5",
+    'Retrying request id="a1b2c3" attempt=3 enabled=true',
+    "Could not resolve host www.time.co",
+] * 25
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("engine", ["regex", "scanner"])
+def test_benchmark_parameterization(engine, benchmark):
+    get_parameterization_scanner(PARAMETERIZATION_PATTERN_KEYS).cache_clear()
+
+    def run() -> None:
+        parameterizer = Parameterizer(regex_pattern_keys=PARAMETERIZATION_PATTERN_KEYS)
+        for message in PARAMETERIZATION_MESSAGES:
+            if engine == "scanner":
+                parameterizer.parametrize_w_scanner(message)
+            else:
+                parameterizer.parametrize_w_regex(message)
+
+    benchmark(run)
+
+
+def _get_stacktraces(data: dict) -> list[tuple[list[dict], str]]:
+    platform = data.get("platform") or "other"
+    containers = [
+        *(get_path(data, "exception", "values", filter=True) or []),
+        *(get_path(data, "threads", "values", filter=True) or []),
+        data,
+    ]
+    return [
+        (frames, platform)
+        for container in containers
+        if (frames := get_path(container, "stacktrace", "frames", filter=True))
+    ]
+
+
+GROUPING_STACKTRACES = [
+    stacktrace
+    for grouping_input in GROUPING_INPUTS
+    for stacktrace in _get_stacktraces(grouping_input.data)
+]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("memoized", [False, True])
+def test_benchmark_create_match_frame(memoized, benchmark):
+    def run() -> None:
+        for frames, platform in GROUPING_STACKTRACES:
+            if not memoized:
+                _create_match_frame_cached.cache_clear()
+            for frame in frames:
+                create_match_frame(frame, platform)
+
+    _create_match_frame_cached.cache_clear()
+    benchmark(run)
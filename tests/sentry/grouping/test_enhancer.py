@@ -563,3 +563,22 @@ family:javascript,native -group
 )
 def test_keep_profiling_rules(test_input, expected):
     assert keep_profiling_rules(test_input) == expected
+
+
+def test_create_match_frame_is_memoized():
+    frame = {"function": "std::panicking::begin_panic", "package": "C:\\Windows\\foo.dll"}
+
+    first = create_match_frame(frame, "native")
+    second = create_match_frame(dict(frame), "native")
+
+    assert first == second
+    assert first is not second
+    assert first["package"] == b"c:/windows/foo.dll"
+
+    # Mutating a returned match frame doesn't affect later calls
+    first["function"] = b"something else"
+    assert create_match_frame(frame, "native")["function"] == b"std::panicking::begin_panic"
+
+    # `1` and `True` are equal, but must not be served each other's cached entries
+    assert create_match_frame({"in_app": 1}, "native")["in_app"] == 1
+    assert create_match_frame({"in_app": True}, "native")["in_app"] is True
@@ -19,11 +19,13 @@ from django.conf import settings
 from sentry import eventstore
 from sentry.event_manager import EventManager
 from sentry.ingest.consumer.processors import (
+    DeferredTransactionSave,
     collect_span_metrics,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
     process_userreport,
+    save_deferred_transaction,
 )
 from sentry.ingest.types import ConsumerType
 from sentry.models.debugfile import create_files_from_dif_zip
@@ -108,9 +110,61 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
         "project": default_project,
         "start_time": start_time,
         "has_attachments": False,
+        "data_is_stored": True,
     }
 
 
+@django_db_all
+def test_transactions_deferred_save(default_project, task_runner, save_event_transaction):
+    now = datetime.datetime.now()
+    event = {
+        "type": "transaction",
+        "timestamp": now.isoformat(),
+        "start_timestamp": now.isoformat(),
+        "spans": [],
+        "contexts": {
+            "trace": {"trace_id": "a7d67cf796774551a95be6543cacd459", "span_id": "babaae0d4b7512d9"}
+        },
+    }
+    payload = get_normalized_event(event, default_project)
+    event_id = payload["event_id"]
+    message = {
+        "payload": orjson.dumps(payload).decode(),
+        "start_time": time.time() - 3600,
+        "event_id": event_id,
+        "project_id": default_project.id,
+        "remote_addr": "127.0.0.1",
+    }
+
+    deferred = process_event(
+        ConsumerType.Transactions,
+        message,
+        project=default_project,
+        no_celery_mode=True,
+        defer_save=True,
+    )
+
+    assert isinstance(deferred, DeferredTransactionSave)
+    assert deferred.data["event_id"] == event_id
+    assert eventstore.backend.get_event_by_id(default_project.id, event_id) is None
+    assert save_event_transaction.delay.call_count == 0
+
+    save_deferred_transaction(deferred)
+
+    assert eventstore.backend.get_event_by_id(default_project.id, event_id) is not None
+    # The message is only considered processed once the transaction is saved
+    assert (
+        process_event(
+            ConsumerType.Transactions,
+            message,
+            project=default_project,
+            no_celery_mode=True,
+            defer_save=True,
+        )
+        is None
+    )
+
+
 @django_db_all
 def test_transactions_spawn_save_event_transaction(
     default_project,
@@ -12,6 +12,7 @@ from sentry.ingest.transaction_clusterer.datasource.redis import (
     get_active_projects,
     get_redis_client,
     get_transaction_names,
+    get_tree,
     record_transaction_name,
 )
 from sentry.ingest.transaction_clusterer.meta import get_clusterer_meta
@@ -86,6 +87,36 @@ def test_clusterer_doesnt_generate_invalid_rules():
     assert clusterer.get_rules() == []
 
 
+def test_serialized_tree():
+    clusterer = TreeClusterer(merge_threshold=3)
+    clusterer.add_input(["/a/b1/c/", "/a/b2/c/", "/a/b3/c/", "/d"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+
+    data = clusterer.dumps()
+    loaded = TreeClusterer.loads(data, merge_threshold=3)
+    assert loaded.dumps() == data
+    assert len(loaded) == len(clusterer) == 6
+
+    # Rules are only computed for the new inputs
+    assert loaded.get_rules() == []
+
+
+def test_incremental_tree():
+    clusterer = TreeClusterer(merge_threshold=3)
+    clusterer.add_input(["/a/b1/c/d1", "/a/b2/c/d2", "/e/f1"])
+    assert clusterer.get_rules() == []
+
+    clusterer = TreeClusterer.loads(clusterer.dumps(), merge_threshold=3)
+    clusterer.add_input(["/a/b3/c/d3", "/e/f2"])
+    assert clusterer.get_rules() == ["/a/*/c/*/**", "/a/*/**"]
+
+    # New inputs end up in the merged nodes
+    clusterer = TreeClusterer.loads(clusterer.dumps(), merge_threshold=3)
+    clusterer.add_input(["/a/b4/c/d4"])
+    assert clusterer.get_rules() == ["/a/*/c/*/**", "/a/*/**"]
+    assert len(clusterer) == 8
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
 def test_collection():
     org = Organization(pk=666)
@@ -370,6 +401,57 @@ def test_clusterer_only_runs_when_enough_transactions(mock_update_rules, default
     )
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MERGE_THRESHOLD", 3)
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@django_db_all
+def test_clusterer_keeps_tree_between_runs(mock_update_rules, default_project):
+    project = default_project
+
+    with override_options({"txnames.incremental-tree.enable": True}):
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/1")
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/2")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, []
+        )
+        assert list(get_transaction_names(project)) == []
+
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/3")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, ["/transaction/number/*/**"]
+        )
+
+    assert get_tree(ClustererNamespace.TRANSACTIONS, project) is not None
+
+    with (
+        override_options({"txnames.incremental-tree.enable": True}),
+        mock.patch("sentry.ingest.transaction_clusterer.tasks.MAX_TREE_NODES", 2),
+    ):
+        cluster_projects([project])
+
+    assert get_tree(ClustererNamespace.TRANSACTIONS, project) is None
+
+
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MAX_TREE_NODES", 2)
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MERGE_THRESHOLD", 3)
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@django_db_all
+def test_clusterer_clears_large_tree(mock_update_rules, default_project):
+    project = default_project
+    for i in range(3):
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, f"/transaction/number/{i}")
+
+    with override_options({"txnames.incremental-tree.enable": True}):
+        cluster_projects([project])
+
+    # The tree is too large to be kept, but the rules of the run are still stored
+    assert mock_update_rules.call_args == mock.call(
+        ClustererNamespace.TRANSACTIONS, project, ["/transaction/number/*/**"]
+    )
+    assert get_tree(ClustererNamespace.TRANSACTIONS, project) is None
+
+
 @django_db_all
 def test_get_deleted_project():
     deleted_project = Project(pk=666, organization=Organization(pk=666))
@@ -4,9 +4,11 @@ from sentry.models.groupassignee import GroupAssignee
 from sentry.models.groupowner import GroupOwner, GroupOwnerType, OwnerRuleType
 from sentry.models.projectownership import ProjectOwnership
 from sentry.models.repository import Repository
+from sentry.ownership.compiled import clear_compiled_schema_cache
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import assume_test_silo_mode_of
 from sentry.testutils.skips import requires_snuba
 from sentry.types.actor import Actor, ActorType
@@ -196,6 +198,35 @@ class ProjectOwnershipTestCase(TestCase):
             ),
         )
 
+    def test_get_owners_compiled_schema(self):
+        self.code_mapping = self.create_code_mapping(project=self.project2)
+
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+        rule_c = Rule(Matcher("codeowners", "api/"), [Owner("team", self.team2.slug)])
+        rule_d = Rule(Matcher("module", "api.*"), [Owner("user", self.user2.email)])
+
+        ProjectOwnership.objects.create(
+            project_id=self.project2.id,
+            schema=dump_schema([rule_a, rule_b, rule_d]),
+            fallthrough=True,
+        )
+        self.create_codeowners(
+            self.project2, self.code_mapping, raw="api/ @dolphin-team", schema=dump_schema([rule_c])
+        )
+
+        data = {"stacktrace": {"frames": [{"filename": "api/foo.py", "module": "api.foo"}]}}
+        owners = ProjectOwnership.get_owners(self.project2.id, data)
+        assert owners[1] == [rule_c, rule_a, rule_d]
+
+        clear_compiled_schema_cache()
+        with override_options({"ownership.compiled-schema.enable": True}):
+            assert ProjectOwnership.get_owners(self.project2.id, data) == owners
+            assert ProjectOwnership.get_owners(self.project2.id, data) == owners
+            assert ProjectOwnership.get_issue_owners(
+                self.project2.id, data
+            ) == ProjectOwnership.get_issue_owners(self.project2.id, data)
+
     def test_get_issue_owners_no_codeowners_or_issueowners(self):
         assert ProjectOwnership.get_issue_owners(self.project.id, {}) == []
 
@@ -4,6 +4,7 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
@@ -98,3 +99,32 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_many(ns):
+    ns.set("node_2", {"foo": "old"})
+
+    ns.set_many(
+        {
+            "node_1": {None: {"foo": "a"}, "other": {"foo": "b"}},
+            "node_2": {None: {"foo": "c"}},
+        }
+    )
+
+    assert ns.get_multi(["node_1", "node_2"]) == {"node_1": {"foo": "a"}, "node_2": {"foo": "c"}}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_2", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": True})
+def test_set_many_populates_cache(ns):
+    ns.set_many({"node_1": {None: {"foo": "a"}}, "node_2": {None: {"foo": "b"}}})
+
+    with mock.patch.object(ns, "_get_bytes_multi") as get_bytes_multi:
+        assert ns.get_multi(["node_1", "node_2"]) == {
+            "node_1": {"foo": "a"},
+            "node_2": {"foo": "b"},
+        }
+
+    assert get_bytes_multi.call_count == 0
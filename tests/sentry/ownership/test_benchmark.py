@@ -0,0 +1,90 @@
+import random
+from typing import Any
+
+import pytest
+
+from sentry.ownership.compiled import clear_compiled_schema_cache, get_compiled_schema
+from sentry.ownership.grammar import (
+    Matcher,
+    convert_codeowners_syntax,
+    dump_schema,
+    load_schema,
+    parse_rules,
+)
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_CODEOWNERS_LINES = 5000
+NUM_FRAMES = 50
+
+DIRECTORIES = ["api", "models", "utils", "tasks", "integrations", "static", "components", "tests"]
+
+
+def random_path(rng: random.Random) -> str:
+    return "/".join(
+        f"{rng.choice(DIRECTORIES)}{rng.randrange(30)}" for _ in range(rng.randint(2, 4))
+    )
+
+
+@pytest.fixture
+def codeowners_schema() -> dict[str, Any]:
+    rng = random.Random(0)
+    lines = []
+    for i in range(NUM_CODEOWNERS_LINES):
+        path = random_path(rng)
+        kind = rng.randrange(4)
+        if kind == 0:
+            lines.append(f"/src/{path}/ @getsentry/team-{i % 100}")
+        elif kind == 1:
+            lines.append(f"{path}/*.py @getsentry/team-{i % 100}")
+        elif kind == 2:
+            lines.append(f"**/{path.rsplit('/', 1)[-1]}/ @getsentry/team-{i % 100}")
+        else:
+            lines.append(f"src/{path}/ @getsentry/team-{i % 100}")
+
+    code_mapping = type("", (), {})()
+    code_mapping.stack_root = "sentry/"
+    code_mapping.source_root = "src/"
+    associations = {f"@getsentry/team-{i}": f"#team-{i}" for i in range(100)}
+
+    rules_text = convert_codeowners_syntax("\n".join(lines), associations, code_mapping)
+    return dump_schema(parse_rules(rules_text))
+
+
+@pytest.fixture
+def event_data() -> dict[str, Any]:
+    rng = random.Random(1)
+    frames = []
+    for _ in range(NUM_FRAMES):
+        filename = f"sentry/{random_path(rng)}/{rng.choice(DIRECTORIES)}.py"
+        frames.append(
+            {
+                "filename": filename,
+                "abs_path": f"/usr/src/sentry/src/{filename}",
+                "module": filename[:-3].replace("/", "."),
+                "in_app": rng.random() < 0.8,
+            }
+        )
+    return {"platform": "python", "stacktrace": {"frames": frames}}
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("compiled", [False, True])
+def test_benchmark_matching_ownership_rules(benchmark, codeowners_schema, event_data, compiled):
+    clear_compiled_schema_cache()
+
+    def match():
+        munged_data = Matcher.munge_if_needed(event_data)
+        if compiled:
+            return get_compiled_schema(codeowners_schema).matching_rules(event_data, munged_data)
+        return [
+            rule for rule in load_schema(codeowners_schema) if rule.test(event_data, munged_data)
+        ]
+
+    rules = benchmark.pedantic(match, rounds=3)
+
+    munged_data = Matcher.munge_if_needed(event_data)
+    assert len(codeowners_schema["rules"]) == NUM_CODEOWNERS_LINES
+    assert rules
+    assert rules == [
+        rule for rule in load_schema(codeowners_schema) if rule.test(event_data, munged_data)
+    ]
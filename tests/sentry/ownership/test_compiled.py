@@ -0,0 +1,123 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from sentry.ownership.compiled import (
+    CompiledSchema,
+    FrameIndex,
+    clear_compiled_schema_cache,
+    get_compiled_schema,
+)
+from sentry.ownership.grammar import CODEOWNERS, PATH, Matcher, Owner, Rule, dump_schema
+
+PATTERNS = [
+    "*",
+    "*.py",
+    "src/*",
+    "/usr/src/*",
+    "SRC/sentry/*",
+    "src/sentry/api/foo.py",
+    "*/api/*",
+    "sentry/*.py",
+    "src\\sentry\\*",
+    "src/sentry/[am]*",
+    "**/models/",
+    "/src/sentry/",
+    "sentry/",
+    "api",
+    "*.js",
+    "Ä/*",
+]
+
+VALUES = [
+    "src/sentry/api/foo.py",
+    "/usr/src/sentry/src/sentry/api/foo.py",
+    "SRC\\sentry\\models\\release.py",
+    "sentry/models/release.py",
+    "app:///main.js",
+    "xapi/api.pyc",
+    "ä/foo.py",
+]
+
+
+def make_data(*frames: Mapping[str, Any]) -> dict[str, Any]:
+    return {"stacktrace": {"frames": list(frames)}}
+
+
+def naive_matching_rules(rules: Sequence[Rule], data: Mapping[str, Any]) -> list[Rule]:
+    munged_data = Matcher.munge_if_needed(data)
+    return [rule for rule in rules if rule.test(data, munged_data)]
+
+
+@pytest.mark.parametrize("matcher_type", [PATH, CODEOWNERS])
+@pytest.mark.parametrize("value", VALUES)
+def test_matching_rules(matcher_type: str, value: str) -> None:
+    rules = [
+        Rule(Matcher(matcher_type, pattern), [Owner("team", "backend")]) for pattern in PATTERNS
+    ]
+    data = make_data({"filename": value, "abs_path": value})
+
+    assert CompiledSchema(rules).matching_rules(
+        data, Matcher.munge_if_needed(data)
+    ) == naive_matching_rules(rules, data)
+
+
+def test_matching_rules_order() -> None:
+    rules = [
+        Rule(Matcher("url", "*.example.com/*"), [Owner("user", "a@example.com")]),
+        Rule(Matcher(PATH, "src/*"), [Owner("user", "b@example.com")]),
+        Rule(Matcher("tags.foo", "bar"), [Owner("user", "c@example.com")]),
+        Rule(Matcher(CODEOWNERS, "*.py"), [Owner("user", "d@example.com")]),
+        Rule(Matcher(PATH, "*.py"), [Owner("user", "e@example.com")]),
+        Rule(Matcher("module", "foo.*"), [Owner("user", "f@example.com")]),
+    ]
+    data = {
+        "request": {"url": "https://www.example.com/foo"},
+        "tags": [["foo", "bar"]],
+        "stacktrace": {"frames": [{"filename": "src/foo.py", "module": "foo.bar"}]},
+    }
+
+    matching_rules = CompiledSchema(rules).matching_rules(data, Matcher.munge_if_needed(data))
+
+    assert matching_rules == rules
+    assert matching_rules == naive_matching_rules(rules, data)
+
+
+def test_matching_rules_codeowners_in_app() -> None:
+    codeowners_rule = Rule(Matcher(CODEOWNERS, "src/"), [Owner("team", "backend")])
+    path_rule = Rule(Matcher(PATH, "src/*"), [Owner("team", "backend")])
+    compiled_schema = CompiledSchema([codeowners_rule, path_rule])
+
+    data = make_data({"filename": "src/foo.py", "in_app": False})
+    assert compiled_schema.matching_rules(data, Matcher.munge_if_needed(data)) == [path_rule]
+
+    data = make_data({"filename": "src/foo.py", "in_app": False}, {"filename": "src/bar.py"})
+    assert compiled_schema.matching_rules(data, Matcher.munge_if_needed(data)) == [
+        codeowners_rule,
+        path_rule,
+    ]
+
+
+def test_frame_index_candidates() -> None:
+    index = FrameIndex(PATH)
+    for position, pattern in enumerate(["src/sentry/*", "*/models/*", "*.py", "*", "src\\*"]):
+        index.add(position, pattern)
+
+    assert sorted(index.candidates("src/sentry/api/foo.js")) == [0, 3, 4]
+    assert sorted(index.candidates("SRC\\models\\foo.py")) == [1, 2, 3, 4]
+    assert sorted(index.candidates("äpp/foo.js")) == [0, 1, 2, 3, 4]
+
+
+def test_compiled_schema_cache() -> None:
+    clear_compiled_schema_cache()
+    schema = dump_schema([Rule(Matcher(PATH, "src/*"), [Owner("team", "backend")])])
+
+    compiled_schema = get_compiled_schema(schema)
+    assert get_compiled_schema(dump_schema(compiled_schema.rules)) is compiled_schema
+
+    schema["rules"][0]["matcher"]["pattern"] = "tests/*"
+    assert get_compiled_schema(schema) is not compiled_schema
+
+    clear_compiled_schema_cache()
+    assert get_compiled_schema(dump_schema(compiled_schema.rules)) is not compiled_schema
@@ -0,0 +1,54 @@
+from unittest import mock
+
+import pytest
+
+from sentry.relay.config import get_performance_score_profiles
+from sentry.relay.config.fragments import clear_fragment_cache, get_fragment
+from sentry.testutils.helpers import Feature
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+
+@pytest.fixture(autouse=True)
+def fragment_cache():
+    clear_fragment_cache()
+    with override_options({"relay.config.fragment-cache.enable": True}):
+        yield
+    clear_fragment_cache()
+
+
+@django_db_all
+def test_get_fragment():
+    builder = mock.Mock(side_effect=lambda: [1, 2, 3])
+
+    first = get_fragment("section", ("a", 1), builder)
+    assert get_fragment("section", ("a", 1), builder) is first
+    assert builder.call_count == 1
+
+    # Different inputs or sections are built separately
+    assert get_fragment("section", ("a", 2), builder) == first
+    assert get_fragment("other-section", ("a", 1), builder) == first
+    assert builder.call_count == 3
+
+
+@django_db_all
+def test_get_fragment_disabled():
+    builder = mock.Mock(side_effect=lambda: [1, 2, 3])
+
+    with override_options({"relay.config.fragment-cache.enable": False}):
+        get_fragment("section", (), builder)
+        get_fragment("section", (), builder)
+
+    assert builder.call_count == 2
+
+
+@django_db_all
+def test_performance_score_profiles(default_organization):
+    profiles = get_performance_score_profiles(default_organization)
+    assert get_performance_score_profiles(default_organization) is profiles
+
+    with Feature({"organizations:performance-calculate-mobile-perf-score-relay": True}):
+        mobile_profiles = get_performance_score_profiles(default_organization)
+
+    assert len(mobile_profiles) > len(profiles)
+    assert [profile["name"] for profile in mobile_profiles if profile not in profiles] == ["Mobile"]
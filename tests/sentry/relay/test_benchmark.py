@@ -0,0 +1,48 @@
+import pytest
+
+from sentry.models.project import Project
+from sentry.models.projectkey import ProjectKey
+from sentry.relay import projectconfig_cache
+from sentry.tasks.relay import compute_configs
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_PROJECTS = 5000
+
+
+@pytest.fixture
+def large_organization(factories):
+    organization = factories.create_organization()
+
+    # Bulk creation skips the signals creating default keys and invalidating configs
+    projects = Project.objects.bulk_create(
+        Project(organization=organization, name=f"project-{i}", slug=f"project-{i}")
+        for i in range(NUM_PROJECTS)
+    )
+    keys = ProjectKey.objects.bulk_create(
+        ProjectKey(
+            project=project,
+            public_key=ProjectKey.generate_api_key(),
+            secret_key=ProjectKey.generate_api_key(),
+        )
+        for project in projects
+    )
+
+    # Only cached configs are recomputed
+    projectconfig_cache.backend.set_many({key.public_key: {} for key in keys})
+
+    return organization
+
+
+@requires_pytest_benchmark
+# Data needs to be committed for the worker threads' database connections to see it
+@django_db_all(transaction=True)
+@pytest.mark.parametrize("workers", [1, 4])
+def test_benchmark_compute_organization_configs(benchmark, large_organization, workers):
+    with override_options({"relay.invalidate-organization.compute-workers": workers}):
+        configs = benchmark.pedantic(
+            compute_configs, kwargs={"organization_id": large_organization.id}, rounds=3
+        )
+
+    assert len(configs) == NUM_PROJECTS
@@ -20,7 +20,11 @@ from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.models.projectkey import ProjectKey
 from sentry.models.projectteam import ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, get_project_config
+from sentry.relay.config import (
+    ProjectConfig,
+    get_project_config,
+    prefetch_organization_inputs,
+)
 from sentry.sentry_metrics.visibility import block_metric, block_tags_of_metric
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
@@ -224,6 +228,20 @@ def test_project_config_exposed_features(default_project):
     assert cfg_features == ["organizations:profiling"]
 
 
+@django_db_all
+@region_silo_test
+@mock.patch("sentry.relay.config.EXPOSABLE_FEATURES", ["organizations:profiling"])
+def test_project_config_prefetched_organization_inputs(default_project):
+    with Feature({"organizations:profiling": True}):
+        with prefetch_organization_inputs(default_project.organization):
+            # Only the values at the time of prefetching are used within the context
+            with Feature({"organizations:profiling": False}):
+                cfg = get_project_config(default_project).to_dict()
+
+    _validate_project_config(cfg["config"])
+    assert get_path(cfg, "config", "features") == ["organizations:profiling"]
+
+
 @django_db_all
 @region_silo_test
 @mock.patch("sentry.relay.config.EXPOSABLE_FEATURES", ["badprefix:custom-inbound-filters"])
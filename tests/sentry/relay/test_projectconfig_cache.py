@@ -34,3 +34,15 @@ def test_read_write():
 
     assert cache.get_rev(dsn1) == "my_rev_123"
     assert cache.get_rev(dsn2) is None
+
+
+@django_db_all
+def test_get_many():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"fake-dsn-1": {"my-value": "foo"}, "fake-dsn-2": {"my-value": "bar"}})
+
+    assert cache.get_many(["fake-dsn-1", "fake-dsn-2", "fake-dsn-3"]) == {
+        "fake-dsn-1": {"my-value": "foo"},
+        "fake-dsn-2": {"my-value": "bar"},
+        "fake-dsn-3": None,
+    }
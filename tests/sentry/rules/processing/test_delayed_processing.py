@@ -15,6 +15,7 @@ from sentry.models.project import Project
 from sentry.models.rule import Rule
 from sentry.models.rulefirehistory import RuleFireHistory
 from sentry.rules.conditions.event_frequency import (
+    BaseEventFrequencyCondition,
     ComparisonType,
     EventFrequencyCondition,
     EventFrequencyConditionData,
@@ -23,13 +24,16 @@ from sentry.rules.processing.delayed_processing import (
     DataAndGroups,
     UniqueConditionQuery,
     apply_delayed,
+    apply_delayed_for_organization,
     bucket_num_groups,
     bulk_fetch_events,
     cleanup_redis_buffer,
+    fire_delayed_rules_for_project,
     generate_unique_queries,
     get_condition_group_results,
     get_condition_query_groups,
     get_group_to_groupevent,
+    get_organization_condition_group_results,
     get_rules_to_fire,
     get_rules_to_groups,
     get_slow_conditions,
@@ -340,6 +344,33 @@ class GetConditionGroupResultsTest(CreateEventTestCase):
             offset_percent_query: {group_id: 1},
         }
 
+    def test_organization_condition_group_results(self):
+        condition_data = self.create_event_frequency_condition(interval=self.interval)
+        condition_groups, group_id, unique_queries = self.create_condition_groups([condition_data])
+
+        project_two = self.create_project(organization=self.organization)
+        event = self.create_event(project_two.id, FROZEN_TIME, "group-2", self.environment.name)
+        assert event.group
+        condition_groups_two = {
+            unique_queries[0]: DataAndGroups(data=condition_data, group_ids={event.group.id})
+        }
+
+        with patch.object(
+            BaseEventFrequencyCondition,
+            "get_rate_bulk",
+            autospec=True,
+            side_effect=BaseEventFrequencyCondition.get_rate_bulk,
+        ) as mock_get_rate_bulk:
+            results = get_organization_condition_group_results(
+                {self.project: condition_groups, project_two: condition_groups_two}
+            )
+
+        # The same query of both projects is made once for the groups of both
+        assert mock_get_rate_bulk.call_count == 1
+        expected_results = {unique_queries[0]: {group_id: 2, event.group.id: 1}}
+        assert results == {self.project.id: expected_results, project_two.id: expected_results}
+        assert condition_groups[unique_queries[0]].group_ids == {group_id}
+
     def test_count_percent_nonexistent_fast_conditions_together(self):
         """
         Test that a percent and count condition are processed as expected, and
@@ -852,6 +883,75 @@ class ProcessDelayedAlertConditionsTest(CreateEventTestCase, PerformanceIssueTes
         rule_group_data = buffer.backend.get_hash(Project, {"project_id": self.project_two.id})
         assert rule_group_data == {}
 
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_for_organization(self):
+        self._push_base_events()
+        with self.tasks():
+            apply_delayed_for_organization([self.project.id, self.project_two.id])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule1.id, self.group1.id),
+            (self.rule2.id, self.group2.id),
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    @patch("sentry.rules.processing.delayed_processing.fire_delayed_rules_for_project.delay")
+    def test_apply_delayed_for_organization_partial_failure(self, mock_fire_for_project):
+        """
+        Test that the rules of every project are fired in their own task, so a
+        project that fails to fire doesn't strand the other projects
+        """
+        self._push_base_events()
+        apply_delayed_for_organization([self.project.id, self.project_two.id])
+
+        tasks_by_project = {
+            call.args[0]: call.args for call in mock_fire_for_project.call_args_list
+        }
+        assert tasks_by_project.keys() == {self.project.id, self.project_two.id}
+
+        with (
+            patch(
+                "sentry.rules.processing.delayed_processing.fire_rules",
+                side_effect=Exception("failed to fire"),
+            ),
+            pytest.raises(Exception, match="failed to fire"),
+        ):
+            fire_delayed_rules_for_project(*tasks_by_project[self.project.id])
+        fire_delayed_rules_for_project(*tasks_by_project[self.project_two.id])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, self.rule2, self.rule3, self.rule4],
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        assert buffer.backend.get_hash(Project, {"project_id": self.project.id})
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    @override_options({"delayed_processing.merge_organization_queries": True})
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed_for_organization.delay")
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed.delay")
+    def test_merges_projects_of_organization(self, mock_apply_delayed, mock_apply_for_org):
+        self._push_base_events()
+        project_three = self.create_project(organization=self.create_organization())
+        buffer.backend.push_to_sorted_set(key=PROJECT_ID_BUFFER_LIST_KEY, value=project_three.id)
+
+        process_delayed_alert_conditions()
+
+        mock_apply_for_org.assert_called_once()
+        assert sorted(mock_apply_for_org.call_args[0][0]) == sorted(
+            [self.project.id, self.project_two.id]
+        )
+        mock_apply_delayed.assert_called_once_with(project_three.id)
+
     def test_apply_delayed_issue_platform_event(self):
         """
         Test that we fire rules triggered from issue platform events
@@ -2170,3 +2170,97 @@ def test_aggregation_options():
         assert get_aggregation_options("c:spans/count@none") == {
             AggregationOption.DISABLE_PERCENTILES: TimeWindow.NINETY_DAYS
         }
+
+
+def _run_batch_with_rollout(
+    caplog: Any, payloads: list[tuple[dict[str, Any], list[tuple[str, bytes]]]], rollout: float
+):
+    with override_options({"sentry-metrics.indexer.columnar-batch.rollout": rollout}):
+        batch = IndexerBatch(
+            _construct_outer_message(payloads),
+            True,
+            False,
+            tags_validator=ReleaseHealthTagsValidator().is_allowed,
+            schema_validator=MetricsSchemaValidator(
+                INGEST_CODEC, RELEASE_HEALTH_SCHEMA_VALIDATION_RULES_OPTION_NAME
+            ).validate,
+        )
+        assert (batch._columns is not None) == bool(rollout)
+
+        batch.filter_messages(list(batch.parsed_payloads_by_meta)[:3])
+        strings = batch.extract_strings()
+
+        mapping: dict[UseCaseID, dict[int, dict[str, int | None]]] = {}
+        meta: dict[UseCaseID, dict[int, dict[str, Metadata]]] = {}
+        next_id = 1
+        for use_case_id, org_strings in strings.items():
+            for org_id, org_string_set in org_strings.items():
+                org_mapping = mapping.setdefault(use_case_id, {}).setdefault(org_id, {})
+                org_meta = meta.setdefault(use_case_id, {}).setdefault(org_id, {})
+                for string in sorted(org_string_set):
+                    if org_id == 3 and string == "1.0.4":
+                        # missing from the mapping altogether
+                        continue
+                    if string == "1.0.3" or (org_id == 2 and string == "environment"):
+                        org_mapping[string] = None
+                        org_meta[string] = Metadata(
+                            id=None,
+                            fetch_type=FetchType.RATE_LIMITED,
+                            fetch_type_ext=FetchTypeExt(is_global=org_id == 2),
+                        )
+                    else:
+                        org_mapping[string] = next_id
+                        org_meta[string] = Metadata(id=next_id, fetch_type=FetchType.CACHE_HIT)
+                        next_id += 1
+
+        caplog.clear()
+        caplog.set_level(logging.ERROR)
+        output = batch.reconstruct_messages(mapping, meta).data
+
+    return (
+        strings,
+        batch.invalid_msg_meta,
+        _deconstruct_messages([m for m in output if isinstance(m.payload, KafkaPayload)]),
+        _get_string_indexer_log_records(caplog),
+    )
+
+
+@pytest.mark.django_db
+def test_columnar_batch_parity(caplog, settings):
+    """
+    The columnar representation of the batch has to produce exactly the same
+    strings and output messages as working on the parsed payloads directly.
+    """
+    settings.SENTRY_METRICS_INDEXER_DEBUG_LOG_SAMPLE_RATE = 1.0
+
+    payloads = []
+    for i in range(30):
+        payload, headers = [
+            (counter_payload, counter_headers),
+            (distribution_payload, distribution_headers),
+            (set_payload, set_headers),
+        ][i % 3]
+        payloads.append(
+            (
+                {
+                    **payload,
+                    "org_id": 1 + i % 4,
+                    "tags": {**payload["tags"], "release": f"1.0.{i % 5}"},
+                },
+                headers,
+            )
+        )
+    payloads.append(({**counter_payload, "type": "x"}, counter_headers))
+    payloads.append(({**set_payload, "tags": {}}, set_headers))
+
+    strings, invalid_msg_meta, output, logs = _run_batch_with_rollout(caplog, payloads, 0.0)
+    assert len(invalid_msg_meta) == 1
+    assert len(output) > 0
+    assert len(logs) > 0
+
+    assert _run_batch_with_rollout(caplog, payloads, 1.0) == (
+        strings,
+        invalid_msg_meta,
+        output,
+        logs,
+    )
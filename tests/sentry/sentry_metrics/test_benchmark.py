@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
+from django.conf import settings
+
+from sentry.sentry_metrics.configuration import GENERIC_METRICS_SCHEMA_VALIDATION_RULES_OPTION_NAME
+from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch
+from sentry.sentry_metrics.consumers.indexer.processing import INGEST_CODEC
+from sentry.sentry_metrics.consumers.indexer.schema_validator import MetricsSchemaValidator
+from sentry.sentry_metrics.consumers.indexer.tags_validator import GenericMetricsTagsValidator
+from sentry.sentry_metrics.indexer.cache import (
+    CachingIndexer,
+    LocalIndexerCache,
+    StringIndexerCache,
+)
+from sentry.sentry_metrics.indexer.mock import RawSimpleIndexer
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.cache import cache
+
+pytestmark = pytest.mark.sentry_metrics
+
+BROKER_TIMESTAMP = datetime.now(tz=timezone.utc)
+
+
+def _make_payload(i: int) -> dict:
+    # A small, stable set of metric names and tags shared by many orgs and transactions, which is
+    # what the indexer consumers see in production
+    return {
+        "name": f"d:transactions/measurements.{('fcp', 'lcp', 'ttfb', 'duration')[i % 4]}@millisecond",
+        "tags": {
+            "environment": ("production", "staging")[i % 2],
+            "transaction": f"/api/0/endpoint-{i % 25}/",
+            "transaction.status": ("ok", "cancelled", "internal_error")[i % 3],
+            "http.method": ("GET", "POST")[i % 2],
+        },
+        "timestamp": int(BROKER_TIMESTAMP.timestamp()),
+        "type": "d",
+        "value": [4, 5, 6],
+        "org_id": 1 + i % 10,
+        "retention_days": 90,
+        "project_id": 3,
+    }
+
+
+def _make_outer_message(num_messages: int) -> Message:
+    messages = [
+        Message(
+            BrokerValue(
+                KafkaPayload(
+                    None,
+                    json.dumps(_make_payload(i)).encode("utf-8"),
+                    [("namespace", b"transactions")],
+                ),
+                Partition(Topic("topic"), 0),
+                i,
+                BROKER_TIMESTAMP,
+            )
+        )
+        for i in range(num_messages)
+    ]
+    return Message(Value(messages, messages[-1].committable))
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("local_cache_size", [0, 10000])
+def test_benchmark_caching_indexer(local_cache_size, benchmark):
+    batch = IndexerBatch(
+        _make_outer_message(1000),
+        True,
+        False,
+        tags_validator=GenericMetricsTagsValidator().is_allowed,
+        schema_validator=MetricsSchemaValidator(
+            INGEST_CODEC, GENERIC_METRICS_SCHEMA_VALIDATION_RULES_OPTION_NAME
+        ).validate,
+    )
+    strings = batch.extract_strings()
+
+    cache.clear()
+    indexer = CachingIndexer(
+        StringIndexerCache(**settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key="test"),
+        RawSimpleIndexer(),
+        local_cache=(
+            LocalIndexerCache(max_size=local_cache_size, ttl=600) if local_cache_size else None
+        ),
+    )
+
+    with override_options({"sentry-metrics.indexer.local-cache.enabled": True}):
+        # The first batch is written to both cache tiers
+        indexer.bulk_record(strings)
+        benchmark(indexer.bulk_record, strings)
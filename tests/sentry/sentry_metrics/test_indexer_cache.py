@@ -4,7 +4,7 @@ import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalIndexerCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -219,6 +219,31 @@ def test_ttl_jitter() -> None:
     assert not ttl_1 == ttl_2
 
 
+def test_local_cache_ttl_jitter() -> None:
+    local_cache = LocalIndexerCache(max_size=10, ttl=600)
+
+    ttls = {local_cache.randomized_ttl for _ in range(10)}
+    assert all(600 <= ttl <= 750 for ttl in ttls)
+    assert len(ttls) > 1
+
+
+def test_local_cache() -> None:
+    local_cache = LocalIndexerCache(max_size=2, ttl=600)
+
+    local_cache.set_many({"sessions:1:a": 1, "sessions:1:b": 2})
+    assert local_cache.get_many(["sessions:1:a", "sessions:1:b", "sessions:1:c"]) == {
+        "sessions:1:a": 1,
+        "sessions:1:b": 2,
+    }
+    assert local_cache.get_many_strings("sessions", 1, [1, 2]) == {1: "a", 2: "b"}
+    assert local_cache.get_many_strings("sessions", 2, [1, 2]) == {}
+
+    # bounded to max_size entries in each direction
+    local_cache.set_many_strings("sessions", 1, {3: "c"})
+    assert local_cache.get_many(["sessions:1:c"]) == {"sessions:1:c": 3}
+    assert len(local_cache.get_many(["sessions:1:a", "sessions:1:b", "sessions:1:c"])) == 2
+
+
 def test_separate_namespacing() -> None:
     with override_options(
         {
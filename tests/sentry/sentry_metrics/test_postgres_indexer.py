@@ -1,11 +1,18 @@
 from collections.abc import Mapping
+from unittest.mock import patch
 
 from sentry.sentry_metrics.configuration import UseCaseKey
-from sentry.sentry_metrics.indexer.base import FetchType, Metadata, UseCaseKeyCollection
-from sentry.sentry_metrics.indexer.cache import CachingIndexer
+from sentry.sentry_metrics.indexer.base import (
+    FetchType,
+    FetchTypeExt,
+    Metadata,
+    UseCaseKeyCollection,
+)
+from sentry.sentry_metrics.indexer.cache import CachingIndexer, LocalIndexerCache
 from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2, indexer_cache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
 
 
@@ -41,3 +48,119 @@ class PostgresIndexerV2Test(TestCase):
         )
 
         assert indexer_cache.get("br", key) is None
+
+    @override_options({"sentry-metrics.indexer.local-cache.enabled": True})
+    def test_local_cache(self) -> None:
+        local_cache = LocalIndexerCache(max_size=100, ttl=600)
+        indexer = CachingIndexer(indexer_cache, PGStringIndexerV2(), local_cache=local_cache)
+        org_id = self.organization.id
+
+        results = indexer.bulk_record({self.use_case_id: {org_id: self.strings}})
+        ids = {string: results[self.use_case_id][org_id][string] for string in self.strings}
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[self.use_case_id][org_id],
+            FetchType.FIRST_SEEN,
+            self.strings,
+        )
+
+        # Everything is served from the local cache from now on
+        with (
+            patch.object(indexer_cache, "get_many") as get_many,
+            patch.object(indexer_cache, "get") as get,
+        ):
+            results = indexer.bulk_record({self.use_case_id: {org_id: self.strings}})
+            assert indexer.resolve(self.use_case_id, org_id, "hello") == ids["hello"]
+
+        assert get_many.call_count == 0
+        assert get.call_count == 0
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[self.use_case_id][org_id],
+            FetchType.CACHE_HIT,
+            self.strings,
+        )
+
+        with patch.object(indexer.indexer, "bulk_reverse_resolve") as bulk_reverse_resolve:
+            assert indexer.bulk_reverse_resolve(self.use_case_id, org_id, ids.values()) == {
+                id: string for string, id in ids.items()
+            }
+        assert bulk_reverse_resolve.call_count == 0
+
+    @override_options({"sentry-metrics.indexer.local-cache.enabled": True})
+    def test_local_cache_reverse_resolve(self) -> None:
+        local_cache = LocalIndexerCache(max_size=100, ttl=600)
+        indexer = CachingIndexer(indexer_cache, PGStringIndexerV2(), local_cache=local_cache)
+        org_id = self.organization.id
+
+        ids = {
+            string: PGStringIndexerV2().record(self.use_case_id, org_id, string)
+            for string in self.strings
+        }
+        assert indexer.bulk_reverse_resolve(self.use_case_id, org_id, ids.values()) == {
+            id: string for string, id in ids.items()
+        }
+
+        # reverse lookups populate the forward direction as well
+        with patch.object(indexer_cache, "get_many") as get_many:
+            results = indexer.bulk_record({self.use_case_id: {org_id: self.strings}})
+
+        assert get_many.call_count == 0
+        assert results.get_mapped_results() == {self.use_case_id: {org_id: ids}}
+
+    def test_negative_cache(self) -> None:
+        indexer = PGStringIndexerV2()
+        org_id = self.organization.id
+        strings = {self.use_case_id: {org_id: {"a", "b", "c"}}}
+
+        with override_options(
+            {
+                "sentry-metrics.writes-limiter.limits.releasehealth.per-org": [
+                    {"window_seconds": 10, "granularity_seconds": 10, "limit": 1}
+                ],
+                "sentry-metrics.indexer.negative-cache.ttl": 60,
+            }
+        ):
+            results = indexer.bulk_record(strings)
+            rate_limited = {s for s, id in results[self.use_case_id][org_id].items() if id is None}
+            assert len(rate_limited) == 2
+
+            with patch.object(
+                indexer, "_get_db_records", wraps=indexer._get_db_records
+            ) as get_db_records:
+                # Only the string which was written is looked up again
+                results = indexer.bulk_record(strings)
+                assert get_db_records.call_count == 1
+                assert get_db_records.call_args[0][0].as_strings() == [
+                    f"{self.use_case_id.value}:{org_id}:{s}" for s in {"a", "b", "c"} - rate_limited
+                ]
+
+                # Nothing to look up at all
+                results = indexer.bulk_record({self.use_case_id: {org_id: rate_limited}})
+                assert get_db_records.call_count == 1
+
+        assert results[self.use_case_id][org_id] == {s: None for s in rate_limited}
+        for string in rate_limited:
+            assert results.get_fetch_metadata()[self.use_case_id][org_id][string] == Metadata(
+                id=None,
+                fetch_type=FetchType.RATE_LIMITED,
+                fetch_type_ext=FetchTypeExt(is_global=False),
+            )
+
+    def test_negative_cache_disabled(self) -> None:
+        indexer = PGStringIndexerV2()
+        org_id = self.organization.id
+        strings = {self.use_case_id: {org_id: {"a", "b", "c"}}}
+
+        with override_options(
+            {
+                "sentry-metrics.writes-limiter.limits.releasehealth.per-org": [
+                    {"window_seconds": 10, "granularity_seconds": 10, "limit": 1}
+                ],
+            }
+        ):
+            indexer.bulk_record(strings)
+            with patch.object(
+                indexer, "_get_db_records", wraps=indexer._get_db_records
+            ) as get_db_records:
+                indexer.bulk_record(strings)
+
+        assert get_db_records.call_args_list[0][0][0] == UseCaseKeyCollection(strings)
@@ -0,0 +1,54 @@
+from sentry.spans.buffer.redis import RedisSpansBuffer, SegmentKey, get_unprocessed_segments_key
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_SEGMENTS = 100_000
+BATCH_SIZE = 1000
+PARTITION = 1
+FIRST_SEEN_TS = 1710280889
+
+
+def write_segments(buffer: RedisSpansBuffer, num_segments: int) -> None:
+    for start in range(0, num_segments, BATCH_SIZE):
+        keys = [
+            SegmentKey(f"segment_{i}", 1, PARTITION)
+            for i in range(start, min(start + BATCH_SIZE, num_segments))
+        ]
+        buffer.batch_write_and_check_processing(
+            spans_map={key: [b"span data"] for key in keys},
+            # Spread the segments over ten minutes
+            segment_first_seen_ts={key: FIRST_SEEN_TS + i % 600 for i, key in enumerate(keys)},
+            latest_ts_by_partition={PARTITION: FIRST_SEEN_TS},
+        )
+
+
+@requires_pytest_benchmark
+@django_db_all
+def test_benchmark_batch_write(benchmark):
+    buffer = RedisSpansBuffer()
+
+    def setup():
+        buffer.client.flushdb()
+        return (buffer, NUM_SEGMENTS), {}
+
+    benchmark.pedantic(write_segments, setup=setup, rounds=3)
+
+
+@requires_pytest_benchmark
+@django_db_all
+def test_benchmark_flush_segments(benchmark):
+    buffer = RedisSpansBuffer()
+
+    def setup():
+        buffer.client.flushdb()
+        write_segments(buffer, NUM_SEGMENTS)
+        return (), {}
+
+    def flush():
+        # Flush once a second, the way the consumer does
+        for now in range(FIRST_SEEN_TS, FIRST_SEEN_TS + 600):
+            buffer.get_unprocessed_segments_and_prune_bucket(now + 120, PARTITION)
+
+    benchmark.pedantic(flush, setup=setup, rounds=3)
+
+    assert buffer.client.zcard(get_unprocessed_segments_key(PARTITION)) == 0
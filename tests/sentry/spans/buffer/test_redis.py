@@ -1,4 +1,7 @@
+from unittest import mock
+
 from sentry.spans.buffer.redis import ProcessSegmentsContext, RedisSpansBuffer, SegmentKey
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 
 
@@ -26,13 +29,11 @@ class TestRedisSpansBuffer:
             ProcessSegmentsContext(timestamp=1710280889, partition=1, should_process_segments=True)
         ]
         assert buffer.client.ttl("segment:segment_1:1:process-segment") == 300
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1, withscores=True
         ) == [
-            b"1710280889",
-            b"segment:segment_1:1:process-segment",
-            b"1710280889",
-            b"segment:segment_2:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280889),
+            (b"segment:segment_2:1:process-segment", 1710280889),
         ]
 
         assert buffer.read_and_expire_many_segments(
@@ -89,13 +90,11 @@ class TestRedisSpansBuffer:
         ]
 
         assert buffer.client.ttl("segment:segment_1:1:process-segment") == 300
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1, withscores=True
         ) == [
-            b"1710280889",
-            b"segment:segment_1:1:process-segment",
-            b"1710280891",
-            b"segment:segment_3:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280889),
+            (b"segment:segment_3:1:process-segment", 1710280891),
         ]
         assert buffer.read_and_expire_many_segments(["segment:segment_1:1:process-segment"]) == [
             [b"span data", b"span data 2", b"span data 3", b"span data 4", b"span data 5"]
@@ -125,15 +124,12 @@ class TestRedisSpansBuffer:
             latest_ts_by_partition=last_seen_map,
         )
 
-        assert buffer.client.lrange(
-            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1, withscores=True
         ) == [
-            b"1710280890",
-            b"segment:segment_1:1:process-segment",
-            b"1710280891",
-            b"segment:segment_2:1:process-segment",
-            b"1710280892",
-            b"segment:segment_3:1:process-segment",
+            (b"segment:segment_1:1:process-segment", 1710280890),
+            (b"segment:segment_2:1:process-segment", 1710280891),
+            (b"segment:segment_3:1:process-segment", 1710280892),
         ]
 
         segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1)
@@ -142,9 +138,119 @@ class TestRedisSpansBuffer:
             "segment:segment_2:1:process-segment",
         ]
 
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1, withscores=True
+        ) == [
+            (b"segment:segment_3:1:process-segment", 1710280892),
+        ]
+
+    @django_db_all
+    def test_get_unprocessed_segments_out_of_order(self):
+        buffer = RedisSpansBuffer()
+        buffer.client.zadd(
+            "performance-issues:unprocessed-segments:partition-3:1",
+            {
+                "segment:segment_2:1:process-segment": 1710280950,
+                "segment:segment_1:1:process-segment": 1710280890,
+                "segment:segment_3:1:process-segment": 1710280891,
+            },
+        )
+
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1) == [
+            "segment:segment_1:1:process-segment",
+            "segment:segment_3:1:process-segment",
+        ]
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1
+        ) == [b"segment:segment_2:1:process-segment"]
+
+    @django_db_all
+    def test_get_unprocessed_segments_from_legacy_bucket(self):
+        buffer = RedisSpansBuffer()
+        buffer.client.rpush(
+            "performance-issues:unprocessed-segments:partition-2:1",
+            1710280889,
+            "segment:segment_1:1:process-segment",
+            1710280950,
+            "segment:segment_2:1:process-segment",
+        )
+        buffer.client.zadd(
+            "performance-issues:unprocessed-segments:partition-3:1",
+            {"segment:segment_3:1:process-segment": 1710280890},
+        )
+
+        assert buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1) == [
+            "segment:segment_1:1:process-segment",
+            "segment:segment_3:1:process-segment",
+        ]
         assert buffer.client.lrange(
             "performance-issues:unprocessed-segments:partition-2:1", 0, -1
-        ) == [
-            b"1710280892",
-            b"segment:segment_3:1:process-segment",
+        ) == [b"1710280950", b"segment:segment_2:1:process-segment"]
+
+        with override_options({"standalone-spans.buffer-drain-legacy-buckets.enable": False}):
+            assert buffer.get_unprocessed_segments_and_prune_bucket(1710281100, 1) == []
+        assert buffer.client.lrange(
+            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        ) == [b"1710280950", b"segment:segment_2:1:process-segment"]
+
+    @django_db_all
+    def test_compressed_batch_write(self):
+        buffer = RedisSpansBuffer()
+        spans = [b'{"span_id": "%d", "description": "SELECT * FROM users"}' % i for i in range(100)]
+
+        buffer.batch_write_and_check_processing(
+            spans_map={SegmentKey("segment_1", 1, 1): [b"span data"]},
+            segment_first_seen_ts={SegmentKey("segment_1", 1, 1): 1710280889},
+            latest_ts_by_partition={1: 1710280889},
+        )
+        with override_options({"standalone-spans.buffer-compression.enable": True}):
+            result = buffer.batch_write_and_check_processing(
+                spans_map={SegmentKey("segment_1", 1, 1): spans},
+                segment_first_seen_ts={SegmentKey("segment_1", 1, 1): 1710280890},
+                latest_ts_by_partition={1: 1710280890},
+            )
+
+        assert result == [
+            ProcessSegmentsContext(timestamp=1710280890, partition=1, should_process_segments=True)
+        ]
+        assert buffer.client.llen("segment:segment_1:1:process-segment") == 2
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1, withscores=True
+        ) == [(b"segment:segment_1:1:process-segment", 1710280889)]
+
+        assert buffer.read_and_expire_many_segments(["segment:segment_1:1:process-segment"]) == [
+            [b"span data", *spans]
+        ]
+
+    @django_db_all
+    @mock.patch("sentry.spans.buffer.redis.metrics.incr")
+    def test_max_segment_bytes(self, mock_metrics_incr):
+        buffer = RedisSpansBuffer()
+
+        with override_options(
+            {
+                "standalone-spans.buffer-compression.enable": True,
+                "standalone-spans.buffer-max-segment-bytes": 20,
+            }
+        ):
+            for spans in ([b"span data"], [b"span data 2", b"span data 3"], [b"span data 4"]):
+                buffer.batch_write_and_check_processing(
+                    spans_map={SegmentKey("segment_1", 1, 1): spans},
+                    segment_first_seen_ts={SegmentKey("segment_1", 1, 1): 1710280889},
+                    latest_ts_by_partition={1: 1710280889},
+                )
+
+        assert [
+            call.kwargs["amount"]
+            for call in mock_metrics_incr.call_args_list
+            if call.args[0] == "spans.buffer.segment_overflow"
+        ] == [2]
+        assert buffer.client.ttl("{segment:segment_1:1:process-segment}:size") == 300
+        assert buffer.client.zrange(
+            "performance-issues:unprocessed-segments:partition-3:1", 0, -1
+        ) == [b"segment:segment_1:1:process-segment"]
+
+        assert buffer.read_and_expire_many_segments(["segment:segment_1:1:process-segment"]) == [
+            [b"span data", b"span data 4"]
         ]
+        assert not buffer.client.exists("{segment:segment_1:1:process-segment}:size")
@@ -0,0 +1,44 @@
+from unittest import mock
+
+from rediscluster import RedisCluster
+
+from sentry.spans.buffer.redis import RedisSpansBuffer, SegmentKey
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.helpers.redis import use_redis_cluster
+
+
+@use_redis_cluster(cluster_id="cluster", with_settings={"SENTRY_SPAN_BUFFER_CLUSTER": "cluster"})
+def test_batch_write_max_segment_bytes() -> None:
+    buffer = RedisSpansBuffer()
+    assert isinstance(buffer.client, RedisCluster)
+
+    # Drop the script from every node, so the write has to load it
+    buffer.client.script_flush()
+
+    segment_keys = [SegmentKey(f"segment_{i}", 1, 1) for i in range(3)]
+    with (
+        override_options(
+            {
+                "standalone-spans.buffer-compression.enable": True,
+                "standalone-spans.buffer-max-segment-bytes": 20,
+            }
+        ),
+        mock.patch.object(
+            buffer.client, "script_load", wraps=buffer.client.script_load
+        ) as script_load,
+    ):
+        for spans in ([b"span data"], [b"span data 2", b"span data 3"], [b"span data 4"]):
+            buffer.batch_write_and_check_processing(
+                spans_map={key: spans for key in segment_keys},
+                segment_first_seen_ts={key: 1710280889 for key in segment_keys},
+                latest_ts_by_partition={1: 1710280889},
+            )
+
+    # The script is only loaded by the first write, which ran into NOSCRIPT
+    assert script_load.call_count == 1
+
+    keys = [f"segment:segment_{i}:1:process-segment" for i in range(3)]
+    assert buffer.read_and_expire_many_segments(keys) == [[b"span data", b"span data 4"]] * 3
+    for key in keys:
+        assert not buffer.client.exists(key)
+        assert not buffer.client.exists(f"{{{key}}}:size")
@@ -1,10 +1,12 @@
 from collections.abc import Mapping
+from unittest import mock
 
 import pytest
 
 from sentry.spans.grouping.strategy.base import (
     Span,
     SpanGroupingStrategy,
+    clear_span_group_cache,
     loose_normalized_db_span_in_condition_strategy,
     normalized_db_span_in_condition_strategy,
     parametrize_db_span_strategy,
@@ -18,6 +20,7 @@ from sentry.spans.grouping.strategy.config import (
     register_configuration,
 )
 from sentry.spans.grouping.utils import hash_values
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.performance_issues.span_builder import SpanBuilder
 
 
@@ -584,3 +587,101 @@ def test_default_2022_10_27_strategy(spans: list[Span], expected: Mapping[str, l
         key: hash_values(values)
         for key, values in {**expected, "a" * 16: ["transaction name"]}.items()
     }
+
+
+def make_event(transaction: str, spans: list[Span]) -> dict:
+    return {
+        "transaction": transaction,
+        "contexts": {"trace": {"span_id": "a" * 16}},
+        "spans": spans,
+    }
+
+
+def test_execute_strategy_many() -> None:
+    configuration = CONFIGURATIONS["default:2022-10-27"]
+    events = [
+        make_event(
+            "first transaction",
+            [
+                SpanBuilder()
+                .with_span_id("b" * 16)
+                .with_op("db")
+                .with_description("SELECT * FROM table WHERE id IN (1, 2)")
+                .build(),
+                SpanBuilder()
+                .with_span_id("c" * 16)
+                .with_description("hi")
+                .with_fingerprint(["a"])
+                .build(),
+            ],
+        ),
+        make_event(
+            "second transaction",
+            [
+                SpanBuilder()
+                .with_span_id("b" * 16)
+                .with_op("db")
+                .with_description("SELECT * FROM table WHERE id IN (1, 2)")
+                .build(),
+                SpanBuilder().with_span_id("c" * 16).with_description("hi").build(),
+            ],
+        ),
+        {
+            **make_event("third transaction", [SpanBuilder().with_span_id("b" * 16).build()]),
+            "span_grouping_config": {"id": configuration.id},
+        },
+    ]
+    events[2]["contexts"]["trace"]["hash"] = "a" * 16
+    events[2]["spans"][0]["hash"] = "b" * 16
+
+    results = configuration.execute_strategy_many(events)
+
+    assert results == [configuration.execute_strategy(event) for event in events]
+    assert [result.results for result in results] == [
+        {
+            "a" * 16: hash_values(["first transaction"]),
+            "b" * 16: hash_values(["SELECT * FROM table WHERE id IN (%s)"]),
+            "c" * 16: hash_values(["a"]),
+        },
+        {
+            "a" * 16: hash_values(["second transaction"]),
+            "b" * 16: hash_values(["SELECT * FROM table WHERE id IN (%s)"]),
+            "c" * 16: hash_values(["hi"]),
+        },
+        {"a" * 16: "a" * 16, "b" * 16: "b" * 16},
+    ]
+
+
+def test_span_group_cache() -> None:
+    clear_span_group_cache()
+    strategy = SpanGroupingStrategy(name="cached-strategy", strategies=[])
+
+    def execute(description: str) -> dict[str, str]:
+        span = SpanBuilder().with_span_id("b" * 16).with_description(description).build()
+        return strategy.execute(make_event("transaction name", [span]))
+
+    with override_options({"spans.grouping.cache.enabled": True}):
+        execute("hi")
+
+        with mock.patch.object(
+            SpanGroupingStrategy, "get_span_group", return_value="c" * 16
+        ) as mock_get_span_group:
+            assert execute("hi")["b" * 16] == hash_values(["hi"])
+            assert execute("bye")["b" * 16] == "c" * 16
+
+    assert mock_get_span_group.call_count == 1
+    clear_span_group_cache()
+
+
+def test_span_group_cache_disabled() -> None:
+    clear_span_group_cache()
+    strategy = SpanGroupingStrategy(name="uncached-strategy", strategies=[])
+    span = SpanBuilder().with_span_id("b" * 16).with_description("hi").build()
+    strategy.execute(make_event("transaction name", [span]))
+
+    with mock.patch.object(
+        SpanGroupingStrategy, "get_span_group", return_value="c" * 16
+    ) as mock_get_span_group:
+        assert strategy.execute(make_event("transaction name", [span]))["b" * 16] == "c" * 16
+
+    assert mock_get_span_group.call_count == 1
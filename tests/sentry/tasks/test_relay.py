@@ -14,10 +14,12 @@ from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDe
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_configs,
     invalidate_project_config,
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.task_runner import BurstTaskRunner
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -94,6 +96,7 @@ def redis_cache(monkeypatch):
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", cache.get_many)
 
     return cache
 
@@ -329,6 +332,58 @@ def test_projectkeys(
         assert not redis_cache.get(key.public_key)
 
 
+@django_db_all
+def test_compute_organization_configs(
+    factories,
+    default_organization,
+    default_project,
+    default_projectkey,
+    redis_cache,
+    django_cache,
+):
+    other_project = factories.create_project(organization=default_organization)
+    other_projectkey = factories.create_project_key(project=other_project)
+    redis_cache.set_many(
+        {default_projectkey.public_key: {"dummy-key": "val"}, other_projectkey.public_key: {}}
+    )
+
+    configs = compute_configs(organization_id=default_organization.id)
+
+    # Keys which aren't cached are left alone
+    assert configs.keys() == {default_projectkey.public_key, other_projectkey.public_key}
+    assert configs[default_projectkey.public_key]["projectId"] == default_project.id
+    assert configs[other_projectkey.public_key]["projectId"] == other_project.id
+    assert [key["publicKey"] for key in configs[other_projectkey.public_key]["publicKeys"]] == [
+        other_projectkey.public_key
+    ]
+
+
+@django_db_all
+@mock.patch(
+    "sentry.tasks.relay.compute_projectkey_config",
+    side_effect=lambda key: {"projectId": key.project_id},
+)
+def test_compute_organization_configs_workers(
+    mock_compute_projectkey_config,
+    factories,
+    default_organization,
+    redis_cache,
+):
+    projects = [factories.create_project(organization=default_organization) for _ in range(5)]
+    public_keys = {
+        project.id: factories.create_project_key(project=project).public_key for project in projects
+    }
+    redis_cache.set_many({public_key: {} for public_key in public_keys.values()})
+
+    with override_options({"relay.invalidate-organization.compute-workers": 2}):
+        configs = compute_configs(organization_id=default_organization.id)
+
+    assert configs == {
+        public_key: {"projectId": project_id} for project_id, public_key in public_keys.items()
+    }
+    assert mock_compute_projectkey_config.call_count == len(projects)
+
+
 @django_db_all(transaction=True)
 def test_db_transaction(
     default_project,
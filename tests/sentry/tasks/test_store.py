@@ -133,6 +133,65 @@ def test_move_to_save_event(
     assert mock_save_event.delay.call_count == 1
 
 
+@django_db_all
+@pytest.mark.parametrize(
+    ("max_bytes", "inline"), [(0, False), (100, False), (10_000, True)], ids=["off", "big", "small"]
+)
+def test_move_to_save_event_inline(
+    default_project,
+    mock_event_processing_store,
+    mock_process_event,
+    mock_save_event,
+    mock_symbolicate_event,
+    max_bytes,
+    inline,
+):
+    data = {
+        "project": default_project.id,
+        "platform": "NOTMATTLANG",
+        "logentry": {"formatted": "test" * 20},
+        "event_id": EVENT_ID,
+    }
+
+    with override_options({"store.inline-payload.max-bytes": max_bytes}):
+        preprocess_event(cache_key="e:1", data=data, data_is_stored=False)
+
+    ((_, kwargs),) = mock_save_event.delay.call_args_list
+    assert kwargs["cache_key"] == "e:1"
+    if inline:
+        assert kwargs["data"] == data
+        assert mock_event_processing_store.store.call_count == 0
+    else:
+        assert kwargs["data"] is None
+        mock_event_processing_store.store.assert_called_once_with(data)
+
+
+@django_db_all
+def test_move_to_process_event_stores_data(
+    default_project,
+    mock_event_processing_store,
+    mock_process_event,
+    mock_save_event,
+    mock_symbolicate_event,
+    register_plugin,
+):
+    register_plugin(globals(), BasicPreprocessorPlugin)
+    data = {
+        "project": default_project.id,
+        "platform": "mattlang",
+        "logentry": {"formatted": "test"},
+        "event_id": EVENT_ID,
+        "extra": {"foo": "bar"},
+    }
+
+    with override_options({"store.inline-payload.max-bytes": 10_000}):
+        preprocess_event(cache_key="e:1", data=data, data_is_stored=False)
+
+    mock_event_processing_store.store.assert_called_once_with(data)
+    assert mock_process_event.delay.call_count == 1
+    assert mock_save_event.delay.call_count == 0
+
+
 @django_db_all
 def test_process_event_mutate_and_save(
     default_project, mock_event_processing_store, mock_save_event, register_plugin
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
+from sentry.tsdb.redis import RedisTSDB
+from sentry.utils.dates import to_datetime
+
+NUM_KEYS = 1000
+NUM_BUCKETS = 24
+
+
+def get_range_per_field(db, model, keys, start, end, rollup=None):
+    """The previous read path of `RedisTSDB.get_range`, one HGET per key and bucket"""
+    rollup, series = db.get_optimal_rollup_series(start, end, rollup)
+    _series = [to_datetime(item) for item in series]
+
+    results = []
+    cluster, _ = db.get_cluster(None)
+    with cluster.map() as client:
+        for key in keys:
+            for timestamp in _series:
+                hash_key, hash_field = db.make_counter_key(model, rollup, timestamp, key, None)
+                results.append((int(timestamp.timestamp()), key, client.hget(hash_key, hash_field)))
+
+    results_by_key = defaultdict(dict)
+    for epoch, key, count in results:
+        results_by_key[key][epoch] = int(count.value or 0)
+
+    return {key: sorted(points.items()) for key, points in results_by_key.items()}
+
+
+@pytest.fixture
+def db():
+    with override_options(
+        {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
+    ):
+        db = RedisTSDB(
+            rollups=((10, 30), (ONE_MINUTE, 120), (ONE_HOUR, NUM_BUCKETS), (ONE_DAY, 30)),
+            vnodes=64,
+            cluster="tsdb",
+        )
+    yield db
+    with db.cluster.all() as client:
+        client.flushdb()
+
+
+@requires_pytest_benchmark
+@django_db_all
+@pytest.mark.parametrize("batched", [False, True])
+def test_benchmark_get_range(benchmark, db, batched):
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=NUM_BUCKETS - 1)
+    keys = list(range(1, NUM_KEYS + 1))
+    for hours in range(NUM_BUCKETS):
+        db.incr_multi(
+            [(TSDBModel.group, key) for key in keys[hours::NUM_BUCKETS]],
+            end - timedelta(hours=hours),
+            count=hours + 1,
+        )
+
+    def get_range():
+        if batched:
+            return db.get_range(TSDBModel.group, keys, start, end, ONE_HOUR)
+        return get_range_per_field(db, TSDBModel.group, keys, start, end, ONE_HOUR)
+
+    results = benchmark.pedantic(get_range, rounds=3)
+
+    assert len(results) == NUM_KEYS
+    assert all(len(series) == NUM_BUCKETS for series in results.values())
+    assert results == get_range_per_field(db, TSDBModel.group, keys, start, end, ONE_HOUR)
@@ -77,6 +77,38 @@ class RedisTSDBTest(TestCase):
         result = self.db.get_model_key("我爱啤酒")
         assert result == "26f980fbe1e8a9d3a0123d2049f95f28"
 
+    def test_get_range_arrays(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        keys = [1, 2, "foo", 1]
+
+        self.db.incr(TSDBModel.project, 1, dts[0])
+        self.db.incr(TSDBModel.project, 1, dts[2], count=2)
+        self.db.incr(TSDBModel.project, "foo", dts[3], count=5)
+        self.db.incr(TSDBModel.project, 2, dts[1], environment_id=1)
+
+        timestamps, counts = self.db.get_range_arrays(TSDBModel.project, keys, dts[0], dts[-1])
+        assert timestamps == [int(d.timestamp()) - int(d.timestamp()) % 3600 for d in dts]
+        assert list(counts) == [1, 2, "foo"]
+        assert counts[1].tolist() == [1, 0, 2, 0]
+        assert counts[2].tolist() == [0, 0, 0, 0]
+        assert counts["foo"].tolist() == [0, 0, 0, 5]
+
+        assert self.db.get_range(TSDBModel.project, keys, dts[0], dts[-1]) == {
+            key: list(zip(timestamps, key_counts)) for key, key_counts in counts.items()
+        }
+
+        _, counts = self.db.get_range_arrays(
+            TSDBModel.project, keys, dts[0], dts[-1], environment_id=1
+        )
+        assert {key: key_counts.tolist() for key, key_counts in counts.items()} == {
+            1: [0, 0, 0, 0],
+            2: [0, 1, 0, 0],
+            "foo": [0, 0, 0, 0],
+        }
+
+        assert self.db.get_range_arrays(TSDBModel.project, keys, dts[-1], dts[0]) == ([], {})
+
     def test_simple(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
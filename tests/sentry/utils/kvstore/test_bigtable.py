@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import functools
 import os
+from unittest import mock
 
 import pytest
+from google.rpc import code_pb2, status_pb2
 
-from sentry.utils.kvstore.bigtable import BigtableKVStorage
+from sentry.utils.kvstore.bigtable import BigtableError, BigtableKVStorage
 
 
 def create_store(request, compression: str | None = None) -> BigtableKVStorage:
@@ -80,3 +82,50 @@ def test_compression_compatibility(request, store_factory) -> None:
 
         for reader in stores.values():
             assert reader.get(key) == value
+
+
+def test_set_many_retries_failed_rows() -> None:
+    store = BigtableKVStorage(project="test", instance="test", table_name="test")
+    table = mock.Mock()
+    table.mutate_rows.side_effect = [
+        [
+            status_pb2.Status(code=code_pb2.OK),
+            status_pb2.Status(code=code_pb2.UNAVAILABLE, message="unavailable"),
+            status_pb2.Status(code=code_pb2.INVALID_ARGUMENT, message="invalid"),
+        ],
+        [status_pb2.Status(code=code_pb2.OK)],
+    ]
+    store._BigtableKVStorage__table = table  # type: ignore[attr-defined]
+
+    with (
+        mock.patch.object(store, "_get_table", return_value=table),
+        pytest.raises(BigtableError) as excinfo,
+    ):
+        store.set_many({"a": b"1", "b": b"2", "c": b"3"})
+
+    # Only the unavailable row is written again, and only the row which failed for good is raised
+    assert [call.args[0] for call in table.direct_row.call_args_list] == ["a", "b", "c", "b"]
+    assert excinfo.value.args == (code_pb2.INVALID_ARGUMENT, "invalid")
+    assert excinfo.value.__notes__ == ["Failed to write row 'c'"]
+
+
+def test_set_many_reports_all_failed_rows() -> None:
+    store = BigtableKVStorage(project="test", instance="test", table_name="test")
+    table = mock.Mock()
+    table.mutate_rows.return_value = [
+        status_pb2.Status(code=code_pb2.INVALID_ARGUMENT, message="invalid"),
+        status_pb2.Status(code=code_pb2.FAILED_PRECONDITION, message="failed"),
+    ]
+
+    with (
+        mock.patch.object(store, "_get_table", return_value=table),
+        pytest.raises(BigtableError) as excinfo,
+    ):
+        store.set_many({"a": b"1", "b": b"2"})
+
+    assert table.mutate_rows.call_count == 1
+    assert excinfo.value.args == (code_pb2.INVALID_ARGUMENT, "invalid")
+    assert excinfo.value.__notes__ == [
+        "Failed to write row 'a'",
+        f"Also failed to write row 'b': {BigtableError(code_pb2.FAILED_PRECONDITION, 'failed')}",
+    ]
@@ -0,0 +1,50 @@
+import pytest
+
+from sentry.testutils.performance_issues.event_generators import EVENTS, get_event
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils.performance_issues.performance_detection import (
+    DETECTOR_CLASSES,
+    get_detection_settings,
+    run_detector_on_data,
+)
+from sentry.utils.performance_issues.span_index import SpanIndex
+
+
+def test_get_spans_with_op_prefixes():
+    spans = [
+        {"span_id": "a", "op": "db"},
+        {"span_id": "b", "op": "http.client"},
+        {"span_id": "c"},
+        {"span_id": "d", "op": "db.redis"},
+        {"span_id": "e", "op": "http.server"},
+    ]
+    index = SpanIndex(spans)
+
+    assert [span["span_id"] for span in index.get_spans_with_op_prefixes(("db",))] == ["a", "d"]
+    assert [
+        span["span_id"] for span in index.get_spans_with_op_prefixes(("http.client", "db"))
+    ] == [
+        "a",
+        "b",
+        "d",
+    ]
+    assert index.get_spans_with_op_prefixes(("resource",)) == []
+
+
+@django_db_all
+@pytest.mark.parametrize("event_name", sorted(EVENTS))
+def test_span_index_detection_parity(event_name):
+    settings = get_detection_settings()
+
+    for detector_class in DETECTOR_CLASSES:
+        event = get_event(event_name)
+        detector = detector_class(settings, event)
+        run_detector_on_data(detector, event)
+
+        indexed_event = get_event(event_name)
+        indexed_detector = detector_class(settings, indexed_event)
+        run_detector_on_data(
+            indexed_detector, indexed_event, SpanIndex(indexed_event.get("spans", []))
+        )
+
+        assert indexed_detector.stored_problems == detector.stored_problems, detector_class